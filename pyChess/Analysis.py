@@ -0,0 +1,55 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, NamedTuple
+
+from pyChess import Color, GameState
+
+
+class PositionReport(NamedTuple):
+    fen: str
+    error: str  # empty if the position parsed and was analysed
+    in_check: bool
+    legal_moves: int
+    opponent_in_check: bool  # the side that just moved left its king attacked
+
+    @property
+    def valid(self) -> bool:
+        return not self.error and not self.opponent_in_check
+
+
+def analyzePosition(fen: str) -> PositionReport:
+    """Parses `fen` and reports whether the side to move is in check, how many legal
+    moves it has, and whether the position could have arisen at all.
+    """
+    try:
+        state = GameState.fromFEN(fen)
+        board = state.board
+        return PositionReport(
+            fen,
+            "",
+            board.inCheck(state.turn),
+            sum(1 for _ in state.legalMoves()),
+            board.inCheck(Color(-state.turn)),
+        )
+    except (SyntaxError, ValueError, LookupError) as err:
+        return PositionReport(fen, str(err), False, 0, False)
+
+
+def analyzePositions(
+    fens: Iterable[str], workers: int | None = None, chunksize: int = 256
+) -> Iterator[PositionReport]:
+    """Analyses many positions on a pool of `workers` processes (default: one per
+    CPU, 1 runs in this process). Reports are yielded in input order.
+
+    The input is consumed a few chunks per worker at a time, so arbitrarily long
+    streams of positions can be analysed without holding them all in memory.
+    """
+    if workers == 1:
+        yield from map(analyzePosition, fens)
+        return
+    workers = workers or os.cpu_count() or 1
+    fens = iter(fens)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while batch := list(itertools.islice(fens, 4 * workers * chunksize)):
+            yield from executor.map(analyzePosition, batch, chunksize=chunksize)
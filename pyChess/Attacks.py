@@ -0,0 +1,116 @@
+# Attack tables indexed by square (0 = a8 ... 63 = h1), built once at import.
+
+
+def _stepTable(offsets) -> list[int]:
+    table = []
+    for square in range(64):
+        row, col = divmod(square, 8)
+        mask = 0
+        for row_inc, col_inc in offsets:
+            i = row + row_inc
+            j = col + col_inc
+            if 0 <= i < 8 and 0 <= j < 8:
+                mask |= 1 << (i * 8 + j)
+        table.append(mask)
+    return table
+
+
+def _rayTable(row_inc: int, col_inc: int) -> list[int]:
+    table = []
+    for square in range(64):
+        row, col = divmod(square, 8)
+        mask = 0
+        i = row + row_inc
+        j = col + col_inc
+        while 0 <= i < 8 and 0 <= j < 8:
+            mask |= 1 << (i * 8 + j)
+            i += row_inc
+            j += col_inc
+        table.append(mask)
+    return table
+
+
+KNIGHT_ATTACKS = _stepTable(
+    ((-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1))
+)
+KING_ATTACKS = _stepTable(
+    ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+)
+# PAWN_ATTACKS[colorIndex][square]: squares a pawn of that color on `square` attacks.
+# White pawns move towards row 0.
+PAWN_ATTACKS = [_stepTable(((-1, -1), (-1, 1))), _stepTable(((1, -1), (1, 1)))]
+
+# Rays leading to higher square numbers are scanned for their lowest blocker, rays
+# leading to lower square numbers for their highest.
+EAST = _rayTable(0, 1)
+SOUTH = _rayTable(1, 0)
+SOUTHEAST = _rayTable(1, 1)
+SOUTHWEST = _rayTable(1, -1)
+WEST = _rayTable(0, -1)
+NORTH = _rayTable(-1, 0)
+NORTHWEST = _rayTable(-1, -1)
+NORTHEAST = _rayTable(-1, 1)
+
+ROOK_RAYS = [EAST[sq] | SOUTH[sq] | WEST[sq] | NORTH[sq] for sq in range(64)]
+BISHOP_RAYS = [
+    SOUTHEAST[sq] | SOUTHWEST[sq] | NORTHWEST[sq] | NORTHEAST[sq] for sq in range(64)
+]
+
+# BETWEEN[a][b]: squares strictly between `a` and `b` if they share a line, else 0.
+# LINE[a][b]: the whole line through `a` and `b` if they share one, else 0.
+BETWEEN = [[0] * 64 for _ in range(64)]
+LINE = [[0] * 64 for _ in range(64)]
+for _a in range(64):
+    for _forward, _backward in (
+        (EAST, WEST),
+        (SOUTH, NORTH),
+        (SOUTHEAST, NORTHWEST),
+        (SOUTHWEST, NORTHEAST),
+    ):
+        _line = _forward[_a] | _backward[_a] | 1 << _a
+        for _ray, _opposite in ((_forward, _backward), (_backward, _forward)):
+            _mask = _ray[_a]
+            while _mask:
+                _bit = _mask & -_mask
+                _b = _bit.bit_length() - 1
+                BETWEEN[_a][_b] = _ray[_a] & _opposite[_b]
+                LINE[_a][_b] = _line
+                _mask ^= _bit
+
+
+def _positive(ray: list[int], square: int, occupied: int) -> int:
+    attacks = ray[square]
+    blockers = attacks & occupied
+    if blockers:
+        attacks ^= ray[(blockers & -blockers).bit_length() - 1]
+    return attacks
+
+
+def _negative(ray: list[int], square: int, occupied: int) -> int:
+    attacks = ray[square]
+    blockers = attacks & occupied
+    if blockers:
+        attacks ^= ray[blockers.bit_length() - 1]
+    return attacks
+
+
+def rookAttacks(square: int, occupied: int) -> int:
+    return (
+        _positive(EAST, square, occupied)
+        | _positive(SOUTH, square, occupied)
+        | _negative(WEST, square, occupied)
+        | _negative(NORTH, square, occupied)
+    )
+
+
+def bishopAttacks(square: int, occupied: int) -> int:
+    return (
+        _positive(SOUTHEAST, square, occupied)
+        | _positive(SOUTHWEST, square, occupied)
+        | _negative(NORTHWEST, square, occupied)
+        | _negative(NORTHEAST, square, occupied)
+    )
+
+
+def queenAttacks(square: int, occupied: int) -> int:
+    return rookAttacks(square, occupied) | bishopAttacks(square, occupied)
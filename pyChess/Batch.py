@@ -0,0 +1,217 @@
+"""Vectorized check and legality tests over many independent positions at once.
+
+Positions are given as an ``(N, 64)`` int8 array of the piece codes used by `Board`
+(see `Board.codes`), one row per position, a8 first. Sides are given as `Color`
+values, either one per position or a single value for all of them. Every function
+returns a boolean array of length N.
+
+This module requires numpy, which the rest of pyChess does not.
+"""
+from typing import Iterable
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+from pyChess import Board, Color
+from pyChess.Attacks import (
+    BETWEEN,
+    BISHOP_RAYS,
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    PAWN_ATTACKS,
+    ROOK_RAYS,
+)
+from pyChess.Board import BISHOP, BLACK, KING, KNIGHT, PAWN, QUEEN, ROOK
+
+# Code used to pad rays that end at the edge of the board: it stops a ray scan but
+# is not a piece of either side.
+_WALL = 7
+# Directions scanned for sliding attackers; the first four are rook directions.
+_DIRECTIONS = ((0, 1), (1, 0), (0, -1), (-1, 0), (1, 1), (1, -1), (-1, -1), (-1, 1))
+
+
+def _maskArray(table: list[int]):
+    """Converts a list of 64 bitboards to a (64, 64) boolean array."""
+    return np.array([[mask >> bit & 1 for bit in range(64)] for mask in table], bool)
+
+
+def _rayArray():
+    """RAYS[square, direction] lists the squares leaving `square` in that direction,
+    nearest first, padded with 64.
+    """
+    rays = np.full((64, 8, 7), 64, np.intp)
+    for square in range(64):
+        row, col = divmod(square, 8)
+        for d, (row_inc, col_inc) in enumerate(_DIRECTIONS):
+            i, j, n = row + row_inc, col + col_inc, 0
+            while 0 <= i < 8 and 0 <= j < 8:
+                rays[square, d, n] = i * 8 + j
+                i, j, n = i + row_inc, j + col_inc, n + 1
+    return rays
+
+
+if np is not None:
+    _KNIGHT = _maskArray(KNIGHT_ATTACKS)
+    _KING = _maskArray(KING_ATTACKS)
+    # _PAWN[c, a, b]: a pawn of color index c on `a` attacks `b`
+    _PAWN = np.stack([_maskArray(PAWN_ATTACKS[0]), _maskArray(PAWN_ATTACKS[1])])
+    _ROOK_LINE = _maskArray(ROOK_RAYS)
+    _BISHOP_LINE = _maskArray(BISHOP_RAYS)
+    _BETWEEN = np.stack([_maskArray(row) for row in BETWEEN])
+    _RAYS = _rayArray()
+
+
+def _requireNumpy() -> None:
+    if np is None:
+        raise ImportError("pyChess.Batch requires numpy, which is not installed.")
+
+
+def _blackMask(colors, n: int):
+    return np.broadcast_to(np.asarray(colors) == Color.black, (n,))
+
+
+def encodeBoards(boards: Iterable[Board]):
+    """Stacks the piece codes of `boards` into an (N, 64) int8 array."""
+    _requireNumpy()
+    data = b"".join(board.codes() for board in boards)
+    return np.frombuffer(data, np.int8).reshape(-1, 64).copy()
+
+
+def encodeStates(states) -> tuple:
+    """Returns the `(codes, colors, enpassant, castleavail)` arrays describing a
+    sequence of `GameState`, in the form `isLegal` takes them.
+    """
+    _requireNumpy()
+    states = list(states)
+    return (
+        encodeBoards(state.board for state in states),
+        np.array([state.turn for state in states], np.int8),
+        np.array([state.enpassant for state in states], np.intp),
+        np.array([state.castleavail for state in states], np.intp),
+    )
+
+
+def isAttacked(codes, squares, colors):
+    """For each position, whether `squares[i]` is attacked by a piece of color
+    `colors[i]`. The vectorized counterpart of `Board.is_attacked`.
+    """
+    _requireNumpy()
+    codes = np.asarray(codes, np.int8)
+    n = len(codes)
+    rows = np.arange(n)
+    squares = np.broadcast_to(np.asarray(squares, np.intp), (n,))
+    black = _blackMask(colors, n)
+    side = np.where(black, BLACK, 0).astype(np.int8)[:, None]
+
+    attacked = ((codes == side | KNIGHT) & _KNIGHT[squares]).any(axis=1)
+    attacked |= ((codes == side | KING) & _KING[squares]).any(axis=1)
+    # a pawn attacks `square` from wherever a pawn of the other color on `square`
+    # would attack
+    pawn_sources = _PAWN[np.where(black, 0, 1), squares]
+    attacked |= ((codes == side | PAWN) & pawn_sources).any(axis=1)
+
+    # the first non-empty square along each ray, or the wall past the edge
+    padded = np.concatenate([codes, np.full((n, 1), _WALL, np.int8)], axis=1)
+    rays = padded[rows[:, None, None], _RAYS[squares]]
+    first = (rays != 0).argmax(axis=2)
+    blockers = np.take_along_axis(rays, first[..., None], axis=2)[..., 0]
+    lateral, diagonal = blockers[:, :4], blockers[:, 4:]
+    queen = side | QUEEN
+    attacked |= ((lateral == side | ROOK) | (lateral == queen)).any(axis=1)
+    attacked |= ((diagonal == side | BISHOP) | (diagonal == queen)).any(axis=1)
+    return attacked
+
+
+def _kingSquares(codes, black):
+    kings = codes == (np.where(black, BLACK, 0) | KING).astype(np.int8)[:, None]
+    found = kings.any(axis=1)
+    if not found.all():
+        raise LookupError(f"Could not find a king in position {found.argmin()}.")
+    return kings.argmax(axis=1)
+
+
+def inCheck(codes, colors):
+    """For each position, whether the king of `colors[i]` is in check. The vectorized
+    counterpart of `Board.inCheck`.
+    """
+    _requireNumpy()
+    codes = np.asarray(codes, np.int8)
+    black = _blackMask(colors, len(codes))
+    return isAttacked(codes, _kingSquares(codes, black), np.where(black, -1, 1))
+
+
+def isLegal(codes, colors, from_sq, to_sq, enpassant=-1, castleavail=0):
+    """For each position, whether moving from `from_sq[i]` to `to_sq[i]` is legal for
+    `colors[i]`, the side to move. `enpassant` and `castleavail` are the
+    `GameState` fields of the same names, per position or shared. Castling is
+    written as the king moving two squares. The promotion piece is not checked.
+    """
+    _requireNumpy()
+    codes = np.asarray(codes, np.int8)
+    n = len(codes)
+    rows = np.arange(n)
+    black = _blackMask(colors, n)
+    from_sq = np.broadcast_to(np.asarray(from_sq, np.intp), (n,))
+    to_sq = np.broadcast_to(np.asarray(to_sq, np.intp), (n,))
+    enpassant = np.broadcast_to(np.asarray(enpassant, np.intp), (n,))
+    castleavail = np.broadcast_to(np.asarray(castleavail, np.intp), (n,))
+    own = np.where(black, BLACK, 0)
+    enemy_colors = np.where(black, -1, 1)
+
+    piece = codes[rows, from_sq]
+    target = codes[rows, to_sq]
+    rank = piece & 7
+    legal = (piece != 0) & (piece & BLACK == own) & (from_sq != to_sq)
+    legal &= (target == 0) | (target & BLACK != own)
+
+    # piece geometry
+    clear = ~((codes != 0) & _BETWEEN[from_sq, to_sq]).any(axis=1)
+    lateral = _ROOK_LINE[from_sq, to_sq] & clear
+    diagonal = _BISHOP_LINE[from_sq, to_sq] & clear
+    moves = (rank == KNIGHT) & _KNIGHT[from_sq, to_sq]
+    moves |= (rank == BISHOP) & diagonal
+    moves |= (rank == ROOK) & lateral
+    moves |= (rank == QUEEN) & (lateral | diagonal)
+    moves |= (rank == KING) & _KING[from_sq, to_sq]
+
+    # pawns
+    step = np.where(black, 8, -8)
+    ahead = np.clip(from_sq + step, 0, 63)
+    captures = _PAWN[black.astype(np.intp), from_sq, to_sq]
+    en_passant = (rank == PAWN) & captures & (to_sq == enpassant) & (target == 0)
+    pawn_moves = captures & (target != 0) | en_passant
+    pawn_moves |= (to_sq == from_sq + step) & (target == 0)
+    pawn_moves |= (
+        (to_sq == from_sq + 2 * step)
+        & (from_sq >> 3 == np.where(black, 1, 6))
+        & (target == 0)
+        & (codes[rows, ahead] == 0)
+    )
+    moves |= (rank == PAWN) & pawn_moves
+
+    # castling: the king may not start on, pass or land on an attacked square
+    home = np.where(black, 4, 60)
+    kingside = to_sq > from_sq
+    castles = (rank == KING) & (from_sq == home) & (np.abs(to_sq - from_sq) == 2)
+    if castles.any():
+        right = np.where(kingside, 1, 2) << np.where(black, 2, 0)
+        rook_sq = np.where(kingside, home + 3, home - 4)
+        castles &= castleavail & right != 0
+        castles &= codes[rows, rook_sq] == own | ROOK
+        castles &= ~((codes != 0) & _BETWEEN[home, rook_sq]).any(axis=1)
+        castles &= ~isAttacked(codes, home, enemy_colors)
+        castles &= ~isAttacked(codes, (from_sq + to_sq) // 2, enemy_colors)
+        moves |= castles
+    legal &= moves
+
+    # play the moves and look for a check on the mover's king
+    after = codes.copy()
+    after[rows, from_sq] = 0
+    after[rows, to_sq] = piece
+    captured_ep = rows[en_passant]
+    after[captured_ep, (from_sq & ~7 | to_sq & 7)[en_passant]] = 0
+    kings = np.where(rank == KING, to_sq, _kingSquares(codes, black))
+    legal &= ~isAttacked(after, kings, enemy_colors)
+    return legal
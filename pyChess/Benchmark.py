@@ -0,0 +1,81 @@
+import timeit
+
+from pyChess import Board, Color, Piece, Rank
+from pyChess.Perft import PERFT_SUITE
+
+
+POSITIONS = {position.name: position.fen for position in PERFT_SUITE}
+
+
+def scanInCheck(board: Board, playerColor: Color) -> bool:
+    """Reference check test that walks the eight rays and the knight and pawn
+    squares around the king one square at a time, the way `Board.inCheck` did before
+    it used the attack tables.
+    """
+    opposite_color = Color(-playerColor)
+    king_row, king_col = board.findKing(playerColor)
+    for directions, sliders in (
+        (((0, 1), (0, -1), (1, 0), (-1, 0)), (Rank.rook, Rank.queen)),
+        (((1, 1), (1, -1), (-1, 1), (-1, -1)), (Rank.bishop, Rank.queen)),
+    ):
+        attackers = {Piece(rank, opposite_color) for rank in sliders}
+        for row_inc, col_inc in directions:
+            i = king_row + row_inc
+            j = king_col + col_inc
+            while 0 <= i < 8 and 0 <= j < 8:
+                piece = board[i, j]
+                if piece is not None:
+                    if piece in attackers:
+                        return True
+                    break
+                i += row_inc
+                j += col_inc
+    knight_offsets = [(i, j) for i in (-2, -1, 1, 2) for j in (-2, -1, 1, 2)]
+    knight_offsets = [(i, j) for i, j in knight_offsets if abs(i) != abs(j)]
+    king_offsets = [(i, j) for i in (-1, 0, 1) for j in (-1, 0, 1) if i or j]
+    for offsets, rank in (
+        (knight_offsets, Rank.knight),
+        (((playerColor, -1), (playerColor, 1)), Rank.pawn),
+        (king_offsets, Rank.king),
+    ):
+        for row_inc, col_inc in offsets:
+            i = king_row + row_inc
+            j = king_col + col_inc
+            if (
+                0 <= i < 8
+                and 0 <= j < 8
+                and board[i, j] == Piece(rank, opposite_color)
+            ):
+                return True
+    return False
+
+
+def benchInCheck(number: int = 20000) -> dict[str, tuple[float, float]]:
+    """Times `Board.inCheck` against the square-by-square `scanInCheck` for both
+    colors on each of `POSITIONS`. Returns microseconds per call for each.
+    """
+    results = {}
+    for name, fen in POSITIONS.items():
+        board = Board(fen)
+        for color in Color:
+            assert board.inCheck(color) == scanInCheck(board, color), name
+        scan = timeit.timeit(
+            lambda: (scanInCheck(board, Color.white), scanInCheck(board, Color.black)),
+            number=number,
+        )
+        table = timeit.timeit(
+            lambda: (board.inCheck(Color.white), board.inCheck(Color.black)),
+            number=number,
+        )
+        results[name] = (scan * 1e6 / (2 * number), table * 1e6 / (2 * number))
+    return results
+
+
+def main():
+    print(f"{'position':<12}{'scan (us)':>12}{'tables (us)':>14}{'speedup':>10}")
+    for name, (scan, table) in benchInCheck().items():
+        print(f"{name:<12}{scan:>12.2f}{table:>14.2f}{scan / table:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
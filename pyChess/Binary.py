@@ -0,0 +1,79 @@
+import struct
+from typing import Iterator, Sequence
+
+from pyChess import Color, Piece
+from pyChess.Board import PIECE_INDEX
+from pyChess.FEN import FENFields, checkEnPassant, checkPlacement, enpassant2square
+
+# A position is stored in POSITION_BYTES bytes:
+#   32 bytes  one nibble per square, a8 first, low nibble first; 0 is an empty square
+#             and 1-12 are the piece indexes of `Board.PIECE_INDEX` plus one
+#    1 byte   bit 0 set if black is to move, bits 1-4 the castling rights
+#    1 byte   en passant target square, or -1
+#    2 bytes  half-turn clock
+#    2 bytes  full-turn number
+# All fields are little-endian, so records can be read straight out of a
+# memory-mapped file or a shared buffer.
+_record = struct.Struct("<32sBbHH")
+POSITION_BYTES = _record.size
+
+_code2piece: list[Piece | None] = [None] * 16
+for _piece, _index in PIECE_INDEX.items():
+    _code2piece[_index + 1] = _piece
+_piece2code = {piece: code for code, piece in enumerate(_code2piece) if piece}
+_piece2code[None] = 0
+_valid_enpassant = set(enpassant2square.values())
+
+
+def encodePosition(
+    pieces: Sequence[Piece | None],
+    turn: Color,
+    castleavail: int,
+    enpassant: int,
+    halfturn: int,
+    fullturn: int,
+) -> bytes:
+    """Packs a position, with `pieces` indexed by square, into POSITION_BYTES bytes."""
+    codes = [_piece2code[piece] for piece in pieces]
+    squares = bytes(codes[i] | codes[i + 1] << 4 for i in range(0, 64, 2))
+    flags = (turn == Color.black) | castleavail << 1
+    try:
+        return _record.pack(squares, flags, enpassant, halfturn, fullturn)
+    except struct.error as err:
+        raise ValueError(f"Position can't be encoded: {err}.") from None
+
+
+def decodePosition(buffer, offset: int = 0) -> FENFields:
+    """Unpacks the position stored at `offset` in `buffer`, which may be any object
+    supporting the buffer protocol (`bytes`, `memoryview`, `mmap`, ...). Nothing is
+    copied out of the buffer beyond the record itself.
+    """
+    squares, flags, enpassant, halfturn, fullturn = _record.unpack_from(buffer, offset)
+    placement = []
+    for i, byte in enumerate(squares):
+        if byte & 15:
+            placement.append((2 * i, _code2piece[byte & 15]))
+        if byte >> 4:
+            placement.append((2 * i + 1, _code2piece[byte >> 4]))
+    if None in (piece for _, piece in placement) or flags >> 5:
+        raise ValueError(f"Invalid position record at offset {offset}.")
+    if enpassant not in _valid_enpassant:
+        raise ValueError(f"Invalid en passant square {enpassant} at offset {offset}.")
+    turn = Color.black if flags & 1 else Color.white
+    try:
+        checkPlacement(placement)
+        checkEnPassant(placement, turn, enpassant)
+    except ValueError as err:
+        raise ValueError(f"Invalid position record at offset {offset}: {err}") from None
+    return FENFields(placement, turn, flags >> 1, enpassant, halfturn, fullturn)
+
+
+def iterPositions(buffer) -> Iterator[FENFields]:
+    """Decodes every record of a buffer holding consecutive encoded positions."""
+    view = memoryview(buffer)
+    if view.nbytes % POSITION_BYTES:
+        raise ValueError(
+            f"Buffer size {view.nbytes} is not a multiple of {POSITION_BYTES}."
+        )
+    for offset in range(0, view.nbytes, POSITION_BYTES):
+        yield decodePosition(view, offset)
@@ -1,13 +1,83 @@
-import re
+from typing import Iterable
 
 from pyChess import Piece, Color, Rank
+from pyChess.Attacks import (
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    PAWN_ATTACKS,
+    bishopAttacks,
+    rookAttacks,
+)
+from pyChess.Evaluation import ENDGAME_VALUES, MIDGAME_VALUES, PHASE_WEIGHTS, blend
+from pyChess.FEN import parseFEN, placementToFEN
+from pyChess.Zobrist import PIECE_KEYS
+
+
+# Squares are numbered ``row * 8 + col`` with row 0 holding the eighth rank, matching
+# the order of a FEN string. Bit ``n`` of a bitboard corresponds to square ``n``.
+PIECE_INDEX = {
+    Piece(rank, color): (color == Color.black) * 6 + rank.value - 1
+    for color in Color
+    for rank in Rank
+}
+
+
+# Internally a piece is a small int code, ``colorIndex(color) << 3 | rank.value``:
+# 1 to 6 for the white pawn to king, 9 to 14 for black, and EMPTY for no piece.
+# ``code & 7`` is the rank value and ``code & BLACK`` the color. `Piece` objects are
+# only handed out at the public interface.
+EMPTY = 0
+PAWN = Rank.pawn.value
+KNIGHT = Rank.knight.value
+BISHOP = Rank.bishop.value
+ROOK = Rank.rook.value
+QUEEN = Rank.queen.value
+KING = Rank.king.value
+BLACK = 8
+PIECE_CODE = {
+    piece: (piece.color == Color.black) * BLACK | piece.rank.value
+    for piece in PIECE_INDEX
+}
+CODE_PIECE: list[Piece | None] = [None] * 16
+for _piece, _code in PIECE_CODE.items():
+    CODE_PIECE[_code] = _piece
+
+# Zobrist keys and evaluation terms per piece code and square, see `pyChess.Zobrist`
+# and `pyChess.Evaluation`.
+_KEYS = [[0] * 64 for _ in range(16)]
+_MIDGAME = [[0] * 64 for _ in range(16)]
+_ENDGAME = [[0] * 64 for _ in range(16)]
+_PHASE = [0] * 16
+for _piece, _code in PIECE_CODE.items():
+    _KEYS[_code] = PIECE_KEYS[PIECE_INDEX[_piece]]
+    _MIDGAME[_code] = MIDGAME_VALUES[_piece]
+    _ENDGAME[_code] = ENDGAME_VALUES[_piece]
+    _PHASE[_code] = PHASE_WEIGHTS[_piece.rank]
+
+
+def colorIndex(color: Color) -> int:
+    """Maps `Color.white` to 0 and `Color.black` to 1."""
+    return (color + 1) >> 1
+
+
+def squaresOf(bitboard: int):
+    """Yields the index of each set bit in `bitboard`, lowest first."""
+    while bitboard:
+        low = bitboard & -bitboard
+        yield low.bit_length() - 1
+        bitboard ^= low
 
 
 class Board:
     def __init__(self, fenstring: str = "") -> None:
-        self.__pieces: list[list[Piece | None]] = [
-            [None for _ in range(8)] for _ in range(8)
-        ]
+        self.__codes: list[int] = [EMPTY] * 64
+        self.__bitboards: list[int] = [0] * 16  # indexed by piece code
+        self.__occupied: list[int] = [0, 0]
+        self.__kings: list[int] = [-1, -1]  # king square by color index, -1 if none
+        self.__zobrist: int = 0
+        self.__midgame: int = 0
+        self.__endgame: int = 0
+        self.__phase: int = 0
         if fenstring != "":
             self.initializeFromFEN(fenstring)
 
@@ -21,103 +91,97 @@ class Board:
             raise TypeError(
                 f"Invalid argument type. Expected tuple of ints or str, found {type(pos)}."
             )
-        try:
-            return self.__pieces[row][col]
-        except IndexError:
+        if not (0 <= row < 8 and 0 <= col < 8):
             raise ValueError(f"Invalid board position: {pos}, row {row}, column {col}.")
+        return CODE_PIECE[self.__codes[row * 8 + col]]
+
+    def pieceAt(self, square: int) -> Piece | None:
+        """Returns the piece on `square`, numbered 0 (a8) to 63 (h1)."""
+        return CODE_PIECE[self.__codes[square]]
+
+    def codeAt(self, square: int) -> int:
+        """Returns the piece code on `square`, or `EMPTY`."""
+        return self.__codes[square]
+
+    def codes(self) -> bytes:
+        """Returns the piece code of every square, a8 first, as 64 bytes."""
+        return bytes(self.__codes)
+
+    def bitboard(self, rank: Rank, color: Color) -> int:
+        """Returns the 64-bit mask of squares holding a piece of `rank` and `color`."""
+        return self.__bitboards[(color == Color.black) * BLACK | rank.value]
+
+    def pieceSquares(self, rank: Rank, color: Color) -> list[int]:
+        """Returns the squares holding a piece of `rank` and `color`, lowest first."""
+        return list(squaresOf(self.bitboard(rank, color)))
+
+    def pieceCount(self, rank: Rank, color: Color) -> int:
+        """Returns the number of pieces of `rank` and `color` on the board."""
+        return self.bitboard(rank, color).bit_count()
+
+    def occupancy(self, color: Color | None = None) -> int:
+        """Returns the mask of squares occupied by `color`, or by either side if
+        `color` is `None`.
+        """
+        if color is None:
+            return self.__occupied[0] | self.__occupied[1]
+        return self.__occupied[colorIndex(color)]
+
+    @property
+    def zobrist(self) -> int:
+        """64-bit Zobrist key of the piece placement, kept up to date by `place` and
+        `remove`.
+        """
+        return self.__zobrist
+
+    @property
+    def evaluation(self) -> int:
+        """Material and piece-square score in centipawns from white's point of view,
+        blended between midgame and endgame by the material left. Kept up to date by
+        `place` and `remove`.
+        """
+        return blend(self.__midgame, self.__endgame, self.__phase)
+
+    def clear(self) -> None:
+        self.__codes = [EMPTY] * 64
+        self.__bitboards = [0] * 16
+        self.__occupied = [0, 0]
+        self.__kings = [-1, -1]
+        self.__zobrist = 0
+        self.__midgame = 0
+        self.__endgame = 0
+        self.__phase = 0
 
     def initializeFromFEN(self, fenstring: str) -> None:
-        char2rank = {
-            "P": Rank.pawn,
-            "N": Rank.knight,
-            "B": Rank.bishop,
-            "R": Rank.rook,
-            "Q": Rank.queen,
-            "K": Rank.king,
-        }
-        splitstring = fenstring.split()
-        if len(splitstring) != 1 and len(splitstring) != 6:
-            raise SyntaxError(
-                f"Invalid number of fields in FEN string: {len(splitstring)}. Should be 1 or 6."
-            )
-        boardonly = len(splitstring) == 1
-        if boardonly:
-            boardstring = splitstring[0]
-            turncolor = castle = enpassant = halfturn = fullturn = None
-        else:
-            boardstring, turncolor, castle, enpassant, halfturn, fullturn = splitstring
+        """Sets up the pieces of `fenstring`, after checking that every field of it
+        is valid.
+        """
+        self.setPlacement(parseFEN(fenstring).placement)
 
-        rows = boardstring.split("/")
-        if len(rows) != 8:
-            raise SyntaxError(
-                f"Invalid number of rows in FEN string: {len(rows)}. Should be 8."
-            )
-        numblackkings = 0
-        numwhitekings = 0
-        for i, row in enumerate(rows):
-            col = 0
-            for d in row:
-                if d.upper() in "PNBQRK":
-                    color = Color.white if d.isupper() else Color.black
-                    rank = char2rank[d.upper()]
-
-                    self.__pieces[i][col] = Piece(rank, color)
-                    col += 1
-                    if d == "k":
-                        numblackkings += 1
-                    elif d == "K":
-                        numwhitekings += 1
-                elif d in "12345678":
-                    col += int(d)
-                else:
-                    raise SyntaxError(f"Invalid character in FEN string: `{d}`")
-
-            if col != 8:
-                raise SyntaxError(
-                    f"Invalid number of columns in row: {row}."
-                    f" Should be 8, found {col}."
-                )
-        if numblackkings != 1 or numwhitekings != 1:
-            raise ValueError(
-                "Wrong number of kings found in FEN string. Should be 1 black and 1 white,"
-                f" found {numblackkings} black and {numwhitekings} white."
-            )
+    def setPlacement(self, placement: Iterable[tuple[int, Piece]]) -> None:
+        """Clears the board and places each `(square, piece)` of `placement`."""
+        self.clear()
+        for square, piece in placement:
+            self.put(square, PIECE_CODE[piece])
 
-        if not boardonly:
-            if turncolor not in "wb" or len(turncolor) != 1:
-                raise SyntaxError(
-                    "Invalid turn color character, should be 'w' or 'b',"
-                    f" found '{turncolor}'."
-                )
-            if not re.fullmatch(r"(K?Q?k?q?|-)", castle):
-                raise SyntaxError(
-                    "Invalid castle availablity in FEN string. Should be subset of"
-                    f" 'KQkq' or '-', found '{castle}'."
-                )
-            if not re.fullmatch(r"([a-h][36]|-)", enpassant):
-                raise SyntaxError(
-                    "Invalid en passant target in FEN string. Should be a square on the"
-                    f" 3rd or 6th rank, or '-', found '{enpassant}'."
-                )
-            if not re.fullmatch(r"[0-9]+", halfturn):
-                raise SyntaxError(
-                    f"Invalid half-turn clock. Should be an integer, found '{halfturn}'."
-                )
-            if not re.fullmatch(r"[1-9][0-9]*", fullturn):
-                raise SyntaxError(
-                    f"Invalid full-turn clock. Should be an integer, found '{fullturn}'."
-                )
+    def toFEN(self) -> str:
+        """Returns the piece placement field of a FEN string for this board."""
+        return placementToFEN([CODE_PIECE[code] for code in self.__codes])
 
     def checkValidBoard(self) -> None:
         pass
 
+    def kingSquare(self, color: Color) -> int:
+        """Returns the square of the king of `color`, kept up to date by `place` and
+        `remove`.
+        """
+        square = self.__kings[color == Color.black]
+        if square < 0:
+            raise LookupError(f"Could not find {color.name} king.")
+        return square
+
     def findKing(self, color: Color) -> tuple[int, int]:
-        """Can likely be sped up using `index` list method."""
-        for row in range(8):
-            for col in range(8):
-                if self.__pieces[row][col] == Piece(Rank.king, color):
-                    return row, col
-        raise LookupError(f"Could not find {color.name} king.")
+        return divmod(self.kingSquare(color), 8)
 
     def checkDirection(
         self,
@@ -129,145 +193,101 @@ class Board:
     ) -> bool:
         i = king_row + row_inc
         j = king_col + col_inc
-        piece = self.__pieces[i][j]
-        while piece is None and 0 <= i < 8 and 0 <= j < 8:
+        while 0 <= i < 8 and 0 <= j < 8:
+            code = self.__codes[i * 8 + j]
+            if code:
+                return CODE_PIECE[code] in attackingPieces
             i += row_inc
             j += col_inc
-            piece = self.__pieces[i][j]
-        if piece is None:
-            return False
-        return piece in attackingPieces
-
-    def inCheck(self, playerColor: Color) -> bool:
-        """Given the arrangement of `pieces`, returns `True` if the player with color
-        `playerColor` is in check.
-        """
-        opposite_color = Color.white if playerColor == Color.black else Color.black
-        king_row, king_col = self.findKing(playerColor)
-
-        lat_pieces = {
-            Piece(Rank.queen, opposite_color),
-            Piece(Rank.rook, opposite_color),
-        }
-        if king_col != 7 and self.checkDirection(0, 1, king_row, king_col, lat_pieces):
-            return True
+        return False
 
-        if king_col != 0 and self.checkDirection(0, -1, king_row, king_col, lat_pieces):
-            return True
+    def attackers_of(self, square: int, color: Color) -> int:
+        """Returns the mask of pieces of `color` that attack `square`."""
+        offset = 0 if color == Color.white else BLACK
+        bitboards = self.__bitboards
+        occupied = self.__occupied[0] | self.__occupied[1]
+        # a pawn of `color` attacks `square` from wherever a pawn of the other color
+        # on `square` would attack
+        pawns = bitboards[offset | PAWN]
+        attackers = PAWN_ATTACKS[1 - colorIndex(color)][square] & pawns
+        attackers |= KNIGHT_ATTACKS[square] & bitboards[offset | KNIGHT]
+        attackers |= KING_ATTACKS[square] & bitboards[offset | KING]
+        queens = bitboards[offset | QUEEN]
+        diagonal = bitboards[offset | BISHOP] | queens
+        lateral = bitboards[offset | ROOK] | queens
+        attackers |= bishopAttacks(square, occupied) & diagonal
+        attackers |= rookAttacks(square, occupied) & lateral
+        return attackers
 
-        if king_row != 7 and self.checkDirection(1, 0, king_row, king_col, lat_pieces):
+    def is_attacked(self, square: int, color: Color) -> bool:
+        """Returns `True` if any piece of `color` attacks `square`. Cheaper than
+        `attackers_of` because it stops at the first kind of attacker found.
+        """
+        offset = 0 if color == Color.white else BLACK
+        bitboards = self.__bitboards
+        if KNIGHT_ATTACKS[square] & bitboards[offset | KNIGHT]:
             return True
-
-        if king_row != 0 and self.checkDirection(-1, 0, king_row, king_col, lat_pieces):
+        if PAWN_ATTACKS[1 - colorIndex(color)][square] & bitboards[offset | PAWN]:
             return True
-
-        diagonal_pieces = {
-            Piece(Rank.queen, opposite_color),
-            Piece(Rank.bishop, opposite_color),
-        }
-        if playerColor == Color.black:
-            diagonal_pieces.add(Piece(Rank.pawn, opposite_color))
-        if (
-            king_col != 7
-            and king_row != 7
-            and self.checkDirection(
-                1,
-                1,
-                king_row,
-                king_col,
-                diagonal_pieces
-                if playerColor == Color.black
-                else diagonal_pieces.union({Piece(Rank.pawn, opposite_color)}),
-            )
-        ):
+        if KING_ATTACKS[square] & bitboards[offset | KING]:
             return True
-
-        if (
-            king_col != 0
-            and king_row != 7
-            and self.checkDirection(
-                1,
-                -1,
-                king_row,
-                king_col,
-                diagonal_pieces
-                if playerColor == Color.black
-                else diagonal_pieces.union({Piece(Rank.pawn, opposite_color)}),
-            )
-        ):
+        occupied = self.__occupied[0] | self.__occupied[1]
+        queens = bitboards[offset | QUEEN]
+        diagonal = bitboards[offset | BISHOP] | queens
+        if diagonal and bishopAttacks(square, occupied) & diagonal:
             return True
+        lateral = bitboards[offset | ROOK] | queens
+        return bool(lateral and rookAttacks(square, occupied) & lateral)
 
-        diagonal_pieces = {
-            Piece(Rank.queen, opposite_color),
-            Piece(Rank.bishop, opposite_color),
-        }
-        if playerColor == Color.white:
-            diagonal_pieces.add(Piece(Rank.pawn, opposite_color))
-        if (
-            king_col != 7
-            and king_row != 0
-            and self.checkDirection(
-                -1,
-                1,
-                king_row,
-                king_col,
-                diagonal_pieces
-                if playerColor == Color.white
-                else diagonal_pieces.union({Piece(Rank.pawn, opposite_color)}),
-            )
-        ):
-            return True
-
-        if (
-            king_col != 0
-            and king_row != 0
-            and self.checkDirection(
-                -1,
-                -1,
-                king_row,
-                king_col,
-                diagonal_pieces
-                if playerColor == Color.white
-                else diagonal_pieces.union({Piece(Rank.pawn, opposite_color)}),
-            )
-        ):
-            return True
-
-        # knights
-        if all(Piece(Rank.knight, opposite_color) not in row for row in self.__pieces):
-            return False
-        offsets = [
-            (-2, -1),
-            (-2, 1),
-            (-1, -2),
-            (-1, 2),
-            (1, -2),
-            (1, 2),
-            (2, -1),
-            (2, 1),
-        ]
-        col_ranges = [(1, 7), (0, 6), (2, 7), (0, 5), (2, 7), (0, 5), (1, 7), (0, 6)]
-        row_ranges = [(2, 7), (2, 7), (1, 7), (1, 7), (0, 6), (0, 6), (0, 5), (0, 5)]
-        for offset, col_range, row_range in zip(offsets, col_ranges, row_ranges):
-            if (
-                col_range[0] <= king_col <= col_range[1]
-                and row_range[0] <= king_row <= row_range[1]
-                and self.__pieces[king_row + offset[0]][king_col + offset[1]]
-                and self.__pieces[king_row + offset[0]][king_col + offset[1]]
-                == Piece(Rank.knight, opposite_color)
-            ):
-                return True
-
-        return False
+    def inCheck(self, playerColor: Color) -> bool:
+        """Given the arrangement of `pieces`, returns `True` if the player with color
+        `playerColor` is in check.
+        """
+        return self.is_attacked(self.kingSquare(playerColor), Color(-playerColor))
 
     def place(self, piece: Piece, row: int, col: int) -> None:
-        try:
-            self.__pieces[row][col] = piece
-        except IndexError:
+        if not (0 <= row < 8 and 0 <= col < 8):
             raise IndexError(f"Invalid row ({row}) or column ({col}).")
+        self.put(row * 8 + col, PIECE_CODE[piece])
 
     def remove(self, row: int, col: int) -> None:
-        try:
-            self.__pieces[row][col] = None
-        except IndexError:
+        if not (0 <= row < 8 and 0 <= col < 8):
             raise IndexError(f"Invalid row ({row}) or column ({col}).")
+        self.take(row * 8 + col)
+
+    def put(self, square: int, code: int) -> None:
+        """`place` for move making: puts the piece `code` on `square`, replacing
+        whatever was there, without checking its arguments.
+        """
+        if self.__codes[square]:
+            self.take(square)
+        bit = 1 << square
+        self.__codes[square] = code
+        self.__bitboards[code] |= bit
+        self.__occupied[code >> 3] |= bit
+        self.__zobrist ^= _KEYS[code][square]
+        self.__midgame += _MIDGAME[code][square]
+        self.__endgame += _ENDGAME[code][square]
+        self.__phase += _PHASE[code]
+        if code & 7 == KING:
+            self.__kings[code >> 3] = square
+
+    def take(self, square: int) -> int:
+        """`remove` for move making: empties `square` and returns the code of the
+        piece that was on it, or `EMPTY`.
+        """
+        code = self.__codes[square]
+        if code:
+            bit = 1 << square
+            self.__codes[square] = EMPTY
+            self.__bitboards[code] ^= bit
+            self.__occupied[code >> 3] ^= bit
+            self.__zobrist ^= _KEYS[code][square]
+            self.__midgame -= _MIDGAME[code][square]
+            self.__endgame -= _ENDGAME[code][square]
+            self.__phase -= _PHASE[code]
+            if code & 7 == KING:
+                # another king of the same color, if there is one, or -1
+                kings = self.__bitboards[code]
+                self.__kings[code >> 3] = (kings & -kings).bit_length() - 1
+        return code
@@ -0,0 +1,312 @@
+import multiprocessing
+import struct
+from array import array
+from collections import OrderedDict
+from multiprocessing import shared_memory
+from typing import Any, Hashable, NamedTuple, Sequence
+
+from pyChess import (
+    GameState,
+    Move,
+    Outcome,
+    Termination,
+    moveToUCI,
+    packMove,
+    unpackMove,
+)
+from pyChess.Piece import Color
+
+# Most legal moves any chess position has.
+MAX_MOVES = 218
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LRUCache:
+    """Mapping that holds at most `maxsize` entries, dropping the least recently used
+    one when full.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        if maxsize < 1:
+            raise ValueError(f"Cache size must be positive, found {maxsize}.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.__data: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.__data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.__data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        try:
+            value = self.__data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.__data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self.__data[key] = value
+        self.__data.move_to_end(key)
+        if len(self.__data) > self.maxsize:
+            self.__data.popitem(last=False)
+
+    def clear(self) -> None:
+        self.__data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self.hits, self.misses, len(self.__data), self.maxsize)
+
+
+class SharedLRUCache:
+    """Cache of byte strings keyed by 64-bit ints, kept in a shared memory block so
+    that every process of a worker pool reads and fills the same entries.
+
+    Entries live in buckets of `WAYS` slots picked by the key, and a full bucket
+    drops its least recently used slot, which approximates LRU over the whole cache.
+    Values may be at most `valuesize` bytes. Access is serialized by `lock`, a
+    `multiprocessing.Lock` by default.
+
+    The creating process owns the block and should `unlink` it when done (leaving a
+    ``with`` block does both). Other processes get the cache by pickling it, e.g. as
+    an ``initargs`` of a process pool, or by name with `attach`.
+    """
+
+    WAYS = 4
+    # capacity, value size, use clock, hits, misses
+    _HEADER = struct.Struct("<QQQQQ")
+    # key, last use (0 for an empty slot), value length
+    _SLOT = struct.Struct("<QQH")
+
+    def __init__(
+        self, maxsize: int = 4096, valuesize: int = 512, lock: Any = None
+    ) -> None:
+        if maxsize < 1 or valuesize < 1:
+            raise ValueError(
+                f"Cache and value sizes must be positive, found {maxsize}, {valuesize}."
+            )
+        buckets = max(1, maxsize // self.WAYS)
+        size = self._HEADER.size + buckets * self.WAYS * (self._SLOT.size + valuesize)
+        self.__memory = shared_memory.SharedMemory(create=True, size=size)
+        self.__owner = True
+        capacity = buckets * self.WAYS
+        self._HEADER.pack_into(self.__memory.buf, 0, capacity, valuesize, 0, 0, 0)
+        self.lock = lock if lock is not None else multiprocessing.Lock()
+        self.__setup()
+
+    @classmethod
+    def attach(cls, name: str, lock: Any) -> "SharedLRUCache":
+        """Opens the cache created by another process under `name`, sharing its
+        `lock`.
+        """
+        cache = cls.__new__(cls)
+        cache.__setstate__({"name": name, "lock": lock})
+        return cache
+
+    def __setup(self) -> None:
+        self.maxsize, self.valuesize = self._HEADER.unpack_from(self.__memory.buf)[:2]
+        self.__stride = self._SLOT.size + self.valuesize
+        self.__end = self._HEADER.size + self.maxsize * self.__stride
+
+    def __getstate__(self) -> dict:
+        return {"name": self.name, "lock": self.lock}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__memory = shared_memory.SharedMemory(name=state["name"])
+        self.__owner = False
+        self.lock = state["lock"]
+        self.__setup()
+
+    def __enter__(self) -> "SharedLRUCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+        if self.__owner:
+            self.unlink()
+
+    @property
+    def name(self) -> str:
+        return self.__memory.name
+
+    def close(self) -> None:
+        """Detaches this process from the block."""
+        self.__memory.close()
+
+    def unlink(self) -> None:
+        """Frees the block once every process has closed it."""
+        self.__memory.unlink()
+
+    def __counters(self) -> list[int]:
+        return list(self._HEADER.unpack_from(self.__memory.buf))
+
+    def __bucket(self, key: int) -> range:
+        """Offsets of the slots that may hold `key`."""
+        size = self.WAYS * self.__stride
+        start = self._HEADER.size + key % (self.maxsize // self.WAYS) * size
+        return range(start, start + size, self.__stride)
+
+    def get(self, key: int, default: Any = None) -> bytes | Any:
+        buf = self.__memory.buf
+        with self.lock:
+            header = self.__counters()
+            for offset in self.__bucket(key):
+                found, used, length = self._SLOT.unpack_from(buf, offset)
+                if used and found == key:
+                    header[2] += 1
+                    header[3] += 1
+                    self._SLOT.pack_into(buf, offset, key, header[2], length)
+                    self._HEADER.pack_into(buf, 0, *header)
+                    start = offset + self._SLOT.size
+                    return bytes(buf[start : start + length])
+            header[4] += 1
+            self._HEADER.pack_into(buf, 0, *header)
+        return default
+
+    def put(self, key: int, value: bytes) -> None:
+        if len(value) > self.valuesize:
+            raise ValueError(
+                f"Values can be at most {self.valuesize} bytes, found {len(value)}."
+            )
+        buf = self.__memory.buf
+        with self.lock:
+            header = self.__counters()
+            target, oldest = -1, None
+            for offset in self.__bucket(key):
+                found, used, _ = self._SLOT.unpack_from(buf, offset)
+                if used and found == key:
+                    target = offset
+                    break
+                if oldest is None or used < oldest:
+                    target, oldest = offset, used
+            header[2] += 1
+            self._SLOT.pack_into(buf, target, key, header[2], len(value))
+            start = target + self._SLOT.size
+            buf[start : start + len(value)] = value
+            self._HEADER.pack_into(buf, 0, *header)
+
+    def __len__(self) -> int:
+        buf = self.__memory.buf
+        stride = self.__stride
+        with self.lock:
+            return sum(
+                1
+                for offset in range(self._HEADER.size, self.__end, stride)
+                if self._SLOT.unpack_from(buf, offset)[1]
+            )
+
+    @property
+    def hits(self) -> int:
+        return self.__counters()[3]
+
+    @property
+    def misses(self) -> int:
+        return self.__counters()[4]
+
+    def clear(self) -> None:
+        buf = self.__memory.buf
+        with self.lock:
+            buf[self._HEADER.size : self.__end] = bytes(self.__end - self._HEADER.size)
+            self._HEADER.pack_into(buf, 0, self.maxsize, self.valuesize, 0, 0, 0)
+
+    def stats(self) -> CacheStats:
+        hits, misses = self.__counters()[3:]
+        return CacheStats(hits, misses, len(self), self.maxsize)
+
+
+class PositionEntry(NamedTuple):
+    moves: tuple[Move, ...]
+    check: bool  # whether the side to move is in check
+
+
+def _encodeEntry(entry: PositionEntry) -> bytes:
+    return bytes([entry.check]) + array("H", map(packMove, entry.moves)).tobytes()
+
+
+def _decodeEntry(data: bytes) -> PositionEntry:
+    packed = array("H")
+    packed.frombytes(data[1:])
+    return PositionEntry(tuple(map(unpackMove, packed)), bool(data[0]))
+
+
+class MoveCache:
+    """Legal moves and check status of positions, keyed by `GameState.zobrist`, so
+    that a position asked about again is answered without generating its moves.
+
+    Entries are kept in an `LRUCache` of `maxsize` positions, or in `shared`, a
+    `SharedLRUCache` with values of at least `ENTRY_BYTES`, to share them between
+    processes.
+    """
+
+    ENTRY_BYTES = 1 + 2 * MAX_MOVES
+
+    def __init__(
+        self, maxsize: int = 4096, shared: SharedLRUCache | None = None
+    ) -> None:
+        if shared is not None and shared.valuesize < self.ENTRY_BYTES:
+            raise ValueError(
+                f"Shared cache values must hold {self.ENTRY_BYTES} bytes,"
+                f" found {shared.valuesize}."
+            )
+        self.shared = shared
+        self.cache = shared if shared is not None else LRUCache(maxsize)
+
+    def entry(self, state: GameState) -> PositionEntry:
+        key = state.zobrist
+        if self.shared is not None:
+            data = self.shared.get(key)
+            if data is not None:
+                return _decodeEntry(data)
+        else:
+            entry = self.cache.get(key)
+            if entry is not None:
+                return entry
+        entry = PositionEntry(
+            tuple(state.legalMoves()), state.board.inCheck(state.turn)
+        )
+        self.cache.put(key, _encodeEntry(entry) if self.shared is not None else entry)
+        return entry
+
+    def legalMoves(self, state: GameState) -> tuple[Move, ...]:
+        return self.entry(state).moves
+
+    def getLegalMoves(self, state: GameState) -> set[str]:
+        """Cached `pyChess.getLegalMoves`: the legal moves in UCI notation."""
+        return {moveToUCI(move) for move in self.entry(state).moves}
+
+    def outcome(
+        self,
+        state: GameState,
+        claim_draw: bool = False,
+        keys: Sequence[int] | None = None,
+    ) -> Outcome | None:
+        """Cached `GameState.outcome`. Only mate and stalemate come from the cache;
+        the draw rules depend on the clocks and history, and are cheap anyway.
+        """
+        entry = self.entry(state)
+        if not entry.moves:
+            if entry.check:
+                return Outcome(Termination.checkmate, Color(-state.turn))
+            return Outcome(Termination.stalemate, None)
+        return state.drawOutcome(claim_draw, keys)
+
+    def stats(self) -> CacheStats:
+        return self.cache.stats()
@@ -0,0 +1,143 @@
+from pyChess import Color, Piece, Rank
+
+PIECE_VALUES = {
+    Rank.pawn: 100,
+    Rank.knight: 320,
+    Rank.bishop: 330,
+    Rank.rook: 500,
+    Rank.queen: 900,
+    Rank.king: 0,
+}
+
+# Piece-square bonuses from white's point of view, listed from a8 to h1 like a FEN
+# string. Black uses the same tables mirrored top to bottom.
+_PAWN = [
+    0, 0, 0, 0, 0, 0, 0, 0,
+    50, 50, 50, 50, 50, 50, 50, 50,
+    10, 10, 20, 30, 30, 20, 10, 10,
+    5, 5, 10, 25, 25, 10, 5, 5,
+    0, 0, 0, 20, 20, 0, 0, 0,
+    5, -5, -10, 0, 0, -10, -5, 5,
+    5, 10, 10, -20, -20, 10, 10, 5,
+    0, 0, 0, 0, 0, 0, 0, 0,
+]  # fmt: skip
+_KNIGHT = [
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20, 0, 0, 0, 0, -20, -40,
+    -30, 0, 10, 15, 15, 10, 0, -30,
+    -30, 5, 15, 20, 20, 15, 5, -30,
+    -30, 0, 15, 20, 20, 15, 0, -30,
+    -30, 5, 10, 15, 15, 10, 5, -30,
+    -40, -20, 0, 5, 5, 0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50,
+]  # fmt: skip
+_BISHOP = [
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 10, 10, 5, 0, -10,
+    -10, 5, 5, 10, 10, 5, 5, -10,
+    -10, 0, 10, 10, 10, 10, 0, -10,
+    -10, 10, 10, 10, 10, 10, 10, -10,
+    -10, 5, 0, 0, 0, 0, 5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20,
+]  # fmt: skip
+_ROOK = [
+    0, 0, 0, 0, 0, 0, 0, 0,
+    5, 10, 10, 10, 10, 10, 10, 5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    0, 0, 0, 5, 5, 0, 0, 0,
+]  # fmt: skip
+_QUEEN = [
+    -20, -10, -10, -5, -5, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 5, 5, 5, 0, -10,
+    -5, 0, 5, 5, 5, 5, 0, -5,
+    0, 0, 5, 5, 5, 5, 0, -5,
+    -10, 5, 5, 5, 5, 5, 0, -10,
+    -10, 0, 5, 0, 0, 0, 0, -10,
+    -20, -10, -10, -5, -5, -10, -10, -20,
+]  # fmt: skip
+_KING_MIDGAME = [
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+    20, 20, 0, 0, 0, 0, 20, 20,
+    20, 30, 10, 0, 0, 10, 30, 20,
+]  # fmt: skip
+_KING_ENDGAME = [
+    -50, -40, -30, -20, -20, -30, -40, -50,
+    -30, -20, -10, 0, 0, -10, -20, -30,
+    -30, -10, 20, 30, 30, 20, -10, -30,
+    -30, -10, 30, 40, 40, 30, -10, -30,
+    -30, -10, 30, 40, 40, 30, -10, -30,
+    -30, -10, 20, 30, 30, 20, -10, -30,
+    -30, -30, 0, 0, 0, 0, -30, -30,
+    -50, -30, -30, -30, -30, -30, -30, -50,
+]  # fmt: skip
+
+_MIDGAME_TABLES = {
+    Rank.pawn: _PAWN,
+    Rank.knight: _KNIGHT,
+    Rank.bishop: _BISHOP,
+    Rank.rook: _ROOK,
+    Rank.queen: _QUEEN,
+    Rank.king: _KING_MIDGAME,
+}
+_ENDGAME_TABLES = {**_MIDGAME_TABLES, Rank.king: _KING_ENDGAME}
+
+# Game phase runs from MAX_PHASE with all minor and major pieces on the board down
+# to 0 with none, and blends the midgame and endgame scores.
+PHASE_WEIGHTS = {
+    Rank.pawn: 0,
+    Rank.knight: 1,
+    Rank.bishop: 1,
+    Rank.rook: 2,
+    Rank.queen: 4,
+    Rank.king: 0,
+}
+MAX_PHASE = 24
+
+
+def _squareValues(tables: dict, piece: Piece) -> list[int]:
+    """Material plus placement bonus of `piece` on every square, signed so that
+    white pieces count positive and black pieces negative.
+    """
+    table = tables[piece.rank]
+    value = PIECE_VALUES[piece.rank]
+    if piece.color == Color.white:
+        return [value + bonus for bonus in table]
+    return [-(value + table[square ^ 56]) for square in range(64)]
+
+
+MIDGAME_VALUES = {
+    Piece(rank, color): _squareValues(_MIDGAME_TABLES, Piece(rank, color))
+    for color in Color
+    for rank in Rank
+}
+ENDGAME_VALUES = {
+    Piece(rank, color): _squareValues(_ENDGAME_TABLES, Piece(rank, color))
+    for color in Color
+    for rank in Rank
+}
+
+
+def blend(midgame: int, endgame: int, phase: int) -> int:
+    phase = min(phase, MAX_PHASE)
+    return (midgame * phase + endgame * (MAX_PHASE - phase)) // MAX_PHASE
+
+
+def evaluate(state) -> int:
+    """Static evaluation in centipawns from the point of view of the side to move.
+
+    The material and piece-square totals are maintained by `Board.place` and
+    `Board.remove`, so this never looks at the squares themselves.
+    """
+    score = state.board.evaluation
+    return -score if state.turn == Color.black else score
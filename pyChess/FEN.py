@@ -0,0 +1,174 @@
+from typing import NamedTuple, Sequence
+
+from pyChess import Color, Piece, Rank
+
+# Lookup tables for every field of a FEN string. Each field is validated by a single
+# dictionary lookup instead of a regular expression.
+char2piece = {
+    char if color == Color.black else char.upper(): Piece(rank, color)
+    for color in Color
+    for rank, char in zip(Rank, "pnbrqk")
+}
+piece2char = {piece: char for char, piece in char2piece.items()}
+_empty_runs = {str(n): n for n in range(1, 9)}
+_empty_chars = [None, "1", "2", "3", "4", "5", "6", "7", "8"]
+
+char2color = {"w": Color.white, "b": Color.black}
+color2char = {color: char for char, color in char2color.items()}
+
+# Every legal castling field, mapped to its `GameState.castleavail` bits: "K" is 1,
+# "Q" is 2, "k" is 4 and "q" is 8.
+castle2bits = {
+    "".join(c for i, c in enumerate("KQkq") if bits >> i & 1) or "-": bits
+    for bits in range(16)
+}
+bits2castle = {bits: field for field, bits in castle2bits.items()}
+
+# En passant targets can only be on the third or sixth rank.
+enpassant2square = {"-": -1}
+for _col, _file in enumerate("abcdefgh"):
+    enpassant2square[_file + "6"] = 16 + _col
+    enpassant2square[_file + "3"] = 40 + _col
+square2enpassant = {square: name for name, square in enpassant2square.items()}
+
+
+class FENFields(NamedTuple):
+    placement: list[tuple[int, Piece]]  # (square, piece) for every occupied square
+    turn: Color
+    castleavail: int
+    enpassant: int
+    halfturn: int
+    fullturn: int
+
+
+def parsePlacement(boardstring: str) -> list[tuple[int, Piece]]:
+    """Parses the piece placement field of a FEN string."""
+    rows = boardstring.split("/")
+    if len(rows) != 8:
+        raise SyntaxError(
+            f"Invalid number of rows in FEN string: {len(rows)}. Should be 8."
+        )
+    placement = []
+    for i, row in enumerate(rows):
+        col = 0
+        for d in row:
+            piece = char2piece.get(d)
+            if piece is not None:
+                if col < 8:
+                    placement.append((i * 8 + col, piece))
+                col += 1
+            elif d in _empty_runs:
+                col += _empty_runs[d]
+            else:
+                raise SyntaxError(f"Invalid character in FEN string: `{d}`")
+        if col != 8:
+            raise SyntaxError(
+                f"Invalid number of columns in row: {row}. Should be 8, found {col}."
+            )
+    checkPlacement(placement)
+    return placement
+
+
+def checkPlacement(placement: list[tuple[int, Piece]]) -> None:
+    """Raises ValueError unless there is exactly one king per side and no pawn on
+    the first or last rank. Move generation relies on both.
+    """
+    kings = {Color.white: 0, Color.black: 0}
+    for square, piece in placement:
+        if piece.rank == Rank.king:
+            kings[piece.color] += 1
+        elif piece.rank == Rank.pawn and not 8 <= square < 56:
+            raise ValueError(f"Pawn on the first or last rank, at square {square}.")
+    if kings[Color.white] != 1 or kings[Color.black] != 1:
+        raise ValueError(
+            "Wrong number of kings. Should be 1 black and 1 white,"
+            f" found {kings[Color.black]} black and {kings[Color.white]} white."
+        )
+
+
+def checkEnPassant(
+    placement: list[tuple[int, Piece]], turn: Color, enpassant: int
+) -> None:
+    """Raises ValueError unless `enpassant`, if set, is a target square that the
+    opponent's last move, a double pawn push, could have left.
+    """
+    if enpassant < 0:
+        return
+    # the pawn that just moved two squares stands in front of the target
+    if (
+        enpassant >> 3 != (2 if turn == Color.white else 5)
+        or (enpassant - 8 * turn, Piece(Rank.pawn, Color(-turn))) not in placement
+    ):
+        raise ValueError(
+            f"Invalid en passant target '{square2enpassant.get(enpassant, enpassant)}':"
+            f" no {Color(-turn).name} pawn can have just moved two squares past it."
+        )
+
+
+def parseFEN(fenstring: str) -> FENFields:
+    """Parses and validates all six fields of a FEN string. A string holding only
+    the piece placement gets white to move, full castling rights, no en passant
+    target and fresh clocks.
+    """
+    fields = fenstring.split()
+    if len(fields) == 1:
+        return FENFields(parsePlacement(fields[0]), Color.white, 15, -1, 0, 1)
+    if len(fields) != 6:
+        raise SyntaxError(
+            f"Invalid number of fields in FEN string: {len(fields)}. Should be 1 or 6."
+        )
+    boardstring, turncolor, castle, enpassant, halfturn, fullturn = fields
+    placement = parsePlacement(boardstring)
+    if turncolor not in char2color:
+        raise SyntaxError(
+            f"Invalid turn color character, should be 'w' or 'b', found '{turncolor}'."
+        )
+    if castle not in castle2bits:
+        raise SyntaxError(
+            "Invalid castle availablity in FEN string. Should be subset of"
+            f" 'KQkq' or '-', found '{castle}'."
+        )
+    if enpassant not in enpassant2square:
+        raise SyntaxError(
+            "Invalid en passant target in FEN string. Should be a square on the"
+            f" 3rd or 6th rank, or '-', found '{enpassant}'."
+        )
+    turn = char2color[turncolor]
+    target = enpassant2square[enpassant]
+    checkEnPassant(placement, turn, target)
+    if not (halfturn.isascii() and halfturn.isdigit()):
+        raise SyntaxError(
+            f"Invalid half-turn clock. Should be an integer, found '{halfturn}'."
+        )
+    if not (fullturn.isascii() and fullturn.isdigit()) or fullturn[0] == "0":
+        raise SyntaxError(
+            f"Invalid full-turn clock. Should be an integer, found '{fullturn}'."
+        )
+    return FENFields(
+        placement,
+        turn,
+        castle2bits[castle],
+        target,
+        int(halfturn),
+        int(fullturn),
+    )
+
+
+def placementToFEN(pieces: Sequence[Piece | None]) -> str:
+    """Writes the piece placement field for `pieces`, indexed by square."""
+    rows = []
+    for start in range(0, 64, 8):
+        row = []
+        empty = 0
+        for piece in pieces[start : start + 8]:
+            if piece is None:
+                empty += 1
+            else:
+                if empty:
+                    row.append(_empty_chars[empty])
+                    empty = 0
+                row.append(piece2char[piece])
+        if empty:
+            row.append(_empty_chars[empty])
+        rows.append("".join(row))
+    return "/".join(rows)
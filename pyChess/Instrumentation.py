@@ -0,0 +1,263 @@
+"""Opt-in call counters and timers for the hot paths of Board, Logic and Search.
+
+`enable` swaps the functions listed in `TARGETS` for wrappers that count calls and
+accumulate time, and `disable` puts the originals back. Nothing is checked per call,
+so while disabled the instrumented code runs exactly as if this module didn't
+exist. Setting the environment variable ``PYCHESS_PROFILE=1`` enables it when
+pyChess is imported.
+
+Times are inclusive: `generateLegalMoves` includes the `generatePseudoLegalMoves`
+it drives. Generators are timed over their whole iteration, not just the call that
+creates them, and count the moves they yield; `generateLegalMovesInto`, which
+search and perft use, counts the moves it writes. Cache hit rates come from
+wrapping the lookups of `LRUCache` and `TranspositionTable`.
+"""
+import functools
+import importlib
+import inspect
+import json
+import os
+import sys
+import time
+from typing import Any, Callable
+
+ENV_VAR = "PYCHESS_PROFILE"
+
+# (module, class or None for a module function, function)
+TARGETS = [
+    ("pyChess.Board", "Board", "inCheck"),
+    ("pyChess.Board", "Board", "checkDirection"),
+    ("pyChess.Board", "Board", "findKing"),
+    ("pyChess.Board", "Board", "kingSquare"),
+    ("pyChess.Board", "Board", "attackers_of"),
+    ("pyChess.Board", "Board", "is_attacked"),
+    ("pyChess.Logic", None, "isaMove"),
+    ("pyChess.Logic", None, "generateLegalMoves"),
+    ("pyChess.Logic", None, "generateLegalMovesInto"),
+    ("pyChess.Logic", None, "generatePseudoLegalMoves"),
+    ("pyChess.Search", "Searcher", "search"),
+]
+# Items counted from the result of plain functions, for `Stat.items`.
+_ITEMS: dict[str, Callable[[Any], int]] = {
+    "Logic.generateLegalMovesInto": lambda count: count,
+    "Searcher.search": lambda result: result.nodes,
+}
+# (module, class, lookup method) of caches that count their `hits`
+CACHES = [
+    ("pyChess.Cache", "LRUCache", "get"),
+    ("pyChess.TranspositionTable", "TranspositionTable", "probe"),
+]
+
+
+class Stat:
+    """Counters for one instrumented function. `items` is the number of moves
+    yielded by a generator or written by `generateLegalMovesInto`, or of nodes
+    searched by `Searcher.search`.
+    """
+
+    __slots__ = ("calls", "seconds", "items")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0
+        self.items = 0
+
+
+class CacheStat:
+    __slots__ = ("hits", "lookups")
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.lookups = 0
+
+
+stats: dict[str, Stat] = {}
+cache_stats: dict[str, CacheStat] = {}
+# (namespace, attribute, original value) for everything `enable` replaced
+_patches: list[tuple[Any, str, Any]] = []
+
+
+def _timed(name: str, func: Callable) -> Callable:
+    stat = stats.setdefault(name, Stat())
+    clock = time.perf_counter
+
+    if inspect.isgeneratorfunction(func):
+
+        @functools.wraps(func)
+        def generator(*args, **kwargs):
+            stat.calls += 1
+            iterator = func(*args, **kwargs)
+            while True:
+                start = clock()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    stat.seconds += clock() - start
+                    return
+                stat.seconds += clock() - start
+                stat.items += 1
+                yield item
+
+        return generator
+
+    items = _ITEMS.get(name)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        stat.calls += 1
+        start = clock()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            stat.seconds += clock() - start
+        if items is not None:
+            stat.items += items(result)
+        return result
+
+    return wrapper
+
+
+def _counted(name: str, lookup: Callable) -> Callable:
+    stat = cache_stats.setdefault(name, CacheStat())
+
+    @functools.wraps(lookup)
+    def wrapper(self, *args, **kwargs):
+        hits = self.hits
+        result = lookup(self, *args, **kwargs)
+        stat.lookups += 1
+        stat.hits += self.hits - hits
+        return result
+
+    return wrapper
+
+
+def _patch(namespace: Any, attribute: str, value: Any) -> None:
+    _patches.append((namespace, attribute, getattr(namespace, attribute)))
+    setattr(namespace, attribute, value)
+
+
+def enabled() -> bool:
+    return bool(_patches)
+
+
+def enable() -> None:
+    """Installs the wrappers. Module functions are also replaced wherever another
+    pyChess module imported them by name, such as the `pyChess` package itself.
+    """
+    if _patches:
+        return
+    for module_name, class_name, func_name in TARGETS:
+        module = importlib.import_module(module_name)
+        if class_name is not None:
+            owner = getattr(module, class_name)
+            name = f"{class_name}.{func_name}"
+            _patch(owner, func_name, _timed(name, owner.__dict__[func_name]))
+            continue
+        original = getattr(module, func_name)
+        wrapper = _timed(f"{module_name.rpartition('.')[2]}.{func_name}", original)
+        for other_name, other in list(sys.modules.items()):
+            if other_name.split(".")[0] == "pyChess" and other is not None:
+                if getattr(other, func_name, None) is original:
+                    _patch(other, func_name, wrapper)
+    for module_name, class_name, func_name in CACHES:
+        owner = getattr(importlib.import_module(module_name), class_name)
+        _patch(owner, func_name, _counted(class_name, owner.__dict__[func_name]))
+
+
+def disable() -> None:
+    """Restores the original functions. The counters are kept until `reset`."""
+    while _patches:
+        namespace, attribute, original = _patches.pop()
+        setattr(namespace, attribute, original)
+
+
+def reset() -> None:
+    """Zeroes every counter, including the cache statistics."""
+    for stat in stats.values():
+        stat.calls = stat.items = 0
+        stat.seconds = 0.0
+    for stat in cache_stats.values():
+        stat.hits = stat.lookups = 0
+
+
+def snapshot() -> dict:
+    """Returns the counters as plain data: per function calls, seconds and items,
+    search nodes per second, and hits and hit rate per kind of cache.
+    """
+    functions = {
+        name: {"calls": stat.calls, "seconds": stat.seconds, "items": stat.items}
+        for name, stat in stats.items()
+    }
+    search = stats.get("Searcher.search", Stat())
+    caches = {
+        name: {
+            "hits": stat.hits,
+            "lookups": stat.lookups,
+            "hit_rate": stat.hits / stat.lookups if stat.lookups else 0.0,
+        }
+        for name, stat in cache_stats.items()
+    }
+    return {
+        "enabled": enabled(),
+        "functions": functions,
+        "search": {
+            "nodes": search.items,
+            "seconds": search.seconds,
+            "nps": search.items / search.seconds if search.seconds else 0.0,
+        },
+        "caches": caches,
+    }
+
+
+def toJSON(indent: int | None = None) -> str:
+    return json.dumps(snapshot(), indent=indent)
+
+
+def toPrometheus(prefix: str = "pychess") -> str:
+    """Formats the counters in the Prometheus text exposition format."""
+    data = snapshot()
+    lines = []
+
+    def metric(name: str, kind: str, help: str, samples: list[tuple[str, Any]]):
+        lines.append(f"# HELP {prefix}_{name} {help}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+        for labels, value in samples:
+            lines.append(f"{prefix}_{name}{labels} {value}")
+
+    functions = data["functions"]
+    for field, name, help in (
+        ("calls", "calls_total", "Calls of the instrumented function."),
+        ("seconds", "seconds_total", "Time spent in the instrumented function."),
+        ("items", "items_total", "Moves generated or nodes searched."),
+    ):
+        samples = [
+            (f'{{function="{function}"}}', values[field])
+            for function, values in functions.items()
+        ]
+        metric(name, "counter", help, samples)
+    nps = data["search"]["nps"]
+    metric("search_nps", "gauge", "Search nodes per second.", [("", nps)])
+    caches = data["caches"]
+    for field, name, kind, help in (
+        ("hits", "cache_hits_total", "counter", "Cache lookups that hit."),
+        ("lookups", "cache_lookups_total", "counter", "Cache lookups."),
+        ("hit_rate", "cache_hit_rate", "gauge", "Fraction of lookups that hit."),
+    ):
+        samples = [
+            (f'{{cache="{cache}"}}', values[field]) for cache, values in caches.items()
+        ]
+        metric(name, kind, help, samples)
+    return "\n".join(lines) + "\n"
+
+
+def write(path: str) -> None:
+    """Writes the counters to `path`: Prometheus text for a ``.prom`` file, JSON
+    otherwise.
+    """
+    text = toPrometheus() if path.endswith(".prom") else toJSON(indent=2)
+    with open(path, "w") as outfile:
+        outfile.write(text)
+
+
+if os.environ.get(ENV_VAR, "") not in ("", "0"):
+    enable()
@@ -1,6 +1,170 @@
 from pyChess import Piece, Rank, Color, Board
+from pyChess.Attacks import (
+    BETWEEN,
+    BISHOP_RAYS,
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    LINE,
+    PAWN_ATTACKS,
+    ROOK_RAYS,
+    bishopAttacks,
+    queenAttacks,
+    rookAttacks,
+)
+from pyChess.Binary import decodePosition, encodePosition, iterPositions
+from pyChess.Board import (
+    BISHOP,
+    BLACK,
+    KING,
+    KNIGHT,
+    PAWN,
+    QUEEN,
+    ROOK,
+    colorIndex,
+    squaresOf,
+)
+from pyChess.FEN import (
+    FENFields,
+    bits2castle,
+    color2char,
+    parseFEN,
+    square2enpassant,
+)
+from pyChess.Zobrist import BLACK_TO_MOVE_KEY, CASTLE_KEYS, ENPASSANT_KEYS
+from array import array
+from collections import namedtuple
 from dataclasses import dataclass, field
-from typing import Optional
+from enum import Enum, auto
+from typing import IO, Generator, Iterable, Iterator, NamedTuple, Optional, Sequence
+
+
+Move = namedtuple("Move", ["from_sq", "to_sq", "promotion"], defaults=[None])
+
+# Everything `GameState.pop` needs to take back a move that the move itself doesn't
+# record. `captured` is a piece code from `pyChess.Board`, `EMPTY` if nothing was.
+# `key` is the Zobrist key of the position before the move, for repetition checks.
+Undo = namedtuple(
+    "Undo", ["move", "captured", "castleavail", "enpassant", "halfturn", "key"]
+)
+
+
+class Termination(Enum):
+    checkmate = auto()
+    stalemate = auto()
+    insufficient_material = auto()
+    seventyfive_moves = auto()
+    fivefold_repetition = auto()
+    fifty_moves = auto()  # only if claimed
+    threefold_repetition = auto()  # only if claimed
+
+
+class Outcome(NamedTuple):
+    termination: Termination
+    winner: Color | None  # None for a draw
+
+    @property
+    def result(self) -> str:
+        """The result as written in PGN: "1-0", "0-1" or "1/2-1/2"."""
+        if self.winner is None:
+            return "1/2-1/2"
+        return "1-0" if self.winner == Color.white else "0-1"
+
+
+# Bits of `GameState.castleavail`, in FEN order "KQkq".
+CASTLE_WHITE_KING = 1
+CASTLE_WHITE_QUEEN = 2
+CASTLE_BLACK_KING = 4
+CASTLE_BLACK_QUEEN = 8
+char2castle = {
+    "K": CASTLE_WHITE_KING,
+    "Q": CASTLE_WHITE_QUEEN,
+    "k": CASTLE_BLACK_KING,
+    "q": CASTLE_BLACK_QUEEN,
+}
+# Castling rights that survive a move touching each square; moving a king or rook, or
+# capturing on a rook's home square, clears the matching bits.
+CASTLE_MASK = [15] * 64
+CASTLE_MASK[0] = 15 & ~CASTLE_BLACK_QUEEN
+CASTLE_MASK[4] = 15 & ~(CASTLE_BLACK_KING | CASTLE_BLACK_QUEEN)
+CASTLE_MASK[7] = 15 & ~CASTLE_BLACK_KING
+CASTLE_MASK[56] = 15 & ~CASTLE_WHITE_QUEEN
+CASTLE_MASK[60] = 15 & ~(CASTLE_WHITE_KING | CASTLE_WHITE_QUEEN)
+CASTLE_MASK[63] = 15 & ~CASTLE_WHITE_KING
+ALL_SQUARES = (1 << 64) - 1
+# Squares of the same color as a1.
+DARK_SQUARES = sum(1 << sq for sq in range(64) if (sq >> 3) % 2 != sq % 2)
+
+# The rook's (from, to) squares when castling, keyed by the king's destination.
+CASTLE_ROOK_MOVES = {62: (63, 61), 58: (56, 59), 6: (7, 5), 2: (0, 3)}
+
+STARTING_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+PROMOTION_RANKS = (Rank.queen, Rank.rook, Rank.bishop, Rank.knight)
+rank2char = {
+    Rank.pawn: "p",
+    Rank.knight: "n",
+    Rank.bishop: "b",
+    Rank.rook: "r",
+    Rank.queen: "q",
+    Rank.king: "k",
+}
+char2rank = {c: rank for rank, c in rank2char.items()}
+
+def squareName(square: int) -> str:
+    """Returns the algebraic name of `square`, e.g. 0 -> 'a8', 63 -> 'h1'."""
+    return "abcdefgh"[square & 7] + str(8 - (square >> 3))
+
+
+def squareIndex(name: str) -> int:
+    """Inverse of `squareName`."""
+    col = ord(name[0]) - 97
+    row = 8 - int(name[1])
+    if not (0 <= row < 8 and 0 <= col < 8) or len(name) != 2:
+        raise ValueError(f"Invalid square name: '{name}'.")
+    return row * 8 + col
+
+
+def moveToUCI(move: Move) -> str:
+    uci = squareName(move.from_sq) + squareName(move.to_sq)
+    if move.promotion is not None:
+        uci += rank2char[move.promotion]
+    return uci
+
+
+def moveFromUCI(uci: str) -> Move:
+    if len(uci) not in (4, 5):
+        raise ValueError(f"Invalid UCI move: '{uci}'.")
+    promotion = None
+    if len(uci) == 5:
+        if uci[4] not in "nbrq":
+            raise ValueError(f"Invalid promotion piece in UCI move: '{uci}'.")
+        promotion = char2rank[uci[4]]
+    return Move(squareIndex(uci[:2]), squareIndex(uci[2:4]), promotion)
+
+
+_promotion_codes = {
+    None: 0,
+    Rank.knight: 1,
+    Rank.bishop: 2,
+    Rank.rook: 3,
+    Rank.queen: 4,
+}
+_promotion_ranks = {code: rank for rank, code in _promotion_codes.items()}
+# promotion bits of a packed move, in the order of PROMOTION_RANKS
+_PROMOTION_FLAGS = tuple(_promotion_codes[rank] << 12 for rank in PROMOTION_RANKS)
+
+
+def packMove(move: Move | None) -> int:
+    """Packs `move` into 16 bits: from square, to square, promotion code."""
+    if move is None:
+        return 0
+    return move.from_sq | move.to_sq << 6 | _promotion_codes[move.promotion] << 12
+
+
+def unpackMove(packed: int) -> Move | None:
+    if not packed:
+        return None
+    return Move(packed & 63, packed >> 6 & 63, _promotion_ranks[packed >> 12])
 
 
 @dataclass(order=True)
@@ -11,11 +175,521 @@ class GameState:
     castleavail: int = field(compare=False, default=15)
     enpassant: int = field(compare=False, default=-1)
     halfturn: int = field(compare=False, default=0)
+    history: list[Undo] = field(compare=False, default_factory=list, repr=False)
+
+    @classmethod
+    def fromFEN(cls, fenstring: str) -> "GameState":
+        return cls._fromFields(parseFEN(fenstring))
+
+    @classmethod
+    def from_bytes(cls, buffer, offset: int = 0) -> "GameState":
+        """Decodes a position written by `to_bytes` from `offset` in `buffer`, which
+        may be `bytes`, a `memoryview`, an `mmap` or any other buffer.
+        """
+        return cls._fromFields(decodePosition(buffer, offset))
+
+    @classmethod
+    def _fromFields(cls, fields: FENFields) -> "GameState":
+        board = Board()
+        board.setPlacement(fields.placement)
+        return cls(
+            fullturn=fields.fullturn,
+            turn=fields.turn,
+            board=board,
+            castleavail=fields.castleavail,
+            enpassant=fields.enpassant,
+            halfturn=fields.halfturn,
+        )
+
+    def to_bytes(self) -> bytes:
+        """Encodes the position (not the move history) in `POSITION_BYTES` bytes."""
+        return encodePosition(
+            [self.board.pieceAt(square) for square in range(64)],
+            self.turn,
+            self.castleavail,
+            self.enpassant,
+            self.halfturn,
+            self.fullturn,
+        )
+
+    def to_fen(self) -> str:
+        """Inverse of `fromFEN`."""
+        return " ".join(
+            (
+                self.board.toFEN(),
+                color2char[self.turn],
+                bits2castle[self.castleavail],
+                square2enpassant[self.enpassant],
+                str(self.halfturn),
+                str(self.fullturn),
+            )
+        )
+
+    @property
+    def zobrist(self) -> int:
+        """64-bit Zobrist key of the position: piece placement, side to move, castling
+        rights and en passant file. The placement part is maintained incrementally by
+        the board, so this is O(1).
+
+        The en passant file only contributes when a pawn of the side to move could
+        actually capture, so positions that differ only by an unusable target hash
+        the same, as they should for repetition detection.
+        """
+        key = self.board.zobrist ^ CASTLE_KEYS[self.castleavail]
+        if self.turn == Color.black:
+            key ^= BLACK_TO_MOVE_KEY
+        if self.enpassant >= 0:
+            col = self.enpassant & 7
+            capture_sq = self.enpassant - 8 * self.turn
+            capturers = 0
+            if col != 0:
+                capturers |= 1 << capture_sq - 1
+            if col != 7:
+                capturers |= 1 << capture_sq + 1
+            if capturers & self.board.bitboard(Rank.pawn, self.turn):
+                key ^= ENPASSANT_KEYS[col]
+        return key
+
+    def push(self, move: Move) -> None:
+        """Plays `move`, which must be legal, and records how to undo it. Updates the
+        castling rights, en passant target, clocks and side to move.
+        """
+        board = self.board
+        from_sq, to_sq = move.from_sq, move.to_sq
+        key = self.zobrist
+        code = board.take(from_sq)
+        captured = board.take(to_sq)
+        self.history.append(
+            Undo(move, captured, self.castleavail, self.enpassant, self.halfturn, key)
+        )
+
+        enpassant = -1
+        if code & 7 == PAWN:
+            self.halfturn = 0
+            if to_sq == self.enpassant:
+                board.take((from_sq & ~7) | (to_sq & 7))
+            elif abs(to_sq - from_sq) == 16:
+                enpassant = (from_sq + to_sq) // 2
+            if move.promotion is not None:
+                code = code & BLACK | move.promotion.value
+        else:
+            self.halfturn = 0 if captured else self.halfturn + 1
+            if code & 7 == KING and abs(to_sq - from_sq) == 2:
+                rook_from, rook_to = CASTLE_ROOK_MOVES[to_sq]
+                board.put(rook_to, board.take(rook_from))
+        board.put(to_sq, code)
+
+        self.castleavail &= CASTLE_MASK[from_sq] & CASTLE_MASK[to_sq]
+        self.enpassant = enpassant
+        if self.turn == Color.black:
+            self.fullturn += 1
+        self.turn = Color(-self.turn)
+
+    def pop(self) -> Move:
+        """Takes back the last move played with `push` and returns it."""
+        move, captured, castleavail, enpassant, halfturn, _ = self.history.pop()
+        board = self.board
+        self.turn = Color(-self.turn)
+        if self.turn == Color.black:
+            self.fullturn -= 1
+        self.castleavail = castleavail
+        self.enpassant = enpassant
+        self.halfturn = halfturn
+
+        from_sq, to_sq = move.from_sq, move.to_sq
+        code = board.take(to_sq)
+        if move.promotion is not None:
+            code = code & BLACK | PAWN
+        board.put(from_sq, code)
+        if captured:
+            board.put(to_sq, captured)
+        elif code & 7 == PAWN and to_sq == enpassant:
+            board.put((from_sq & ~7) | (to_sq & 7), code ^ BLACK)
+        elif code & 7 == KING and abs(to_sq - from_sq) == 2:
+            rook_from, rook_to = CASTLE_ROOK_MOVES[to_sq]
+            board.put(rook_from, board.take(rook_to))
+        return move
+
+    def repetitions(self, keys: Sequence[int] | None = None) -> int:
+        """Returns how many times the current position has occurred, counting this
+        one. Only positions since the last capture or pawn move can repeat.
+
+        `keys` are the Zobrist keys of the earlier positions of the game, oldest
+        first. They default to those recorded by `push`.
+        """
+        if keys is None:
+            keys = [undo.key for undo in self.history]
+        key = self.zobrist
+        count = 1
+        # the same side is to move every second ply
+        for i in range(len(keys) - 2, max(len(keys) - self.halfturn, 0) - 1, -2):
+            if keys[i] == key:
+                count += 1
+        return count
+
+    def hasInsufficientMaterial(self) -> bool:
+        """Whether neither side can possibly checkmate: only kings and a single
+        minor piece, or only kings and bishops all on squares of one color.
+        """
+        board = self.board
+        for rank in (Rank.pawn, Rank.rook, Rank.queen):
+            if board.bitboard(rank, Color.white) | board.bitboard(rank, Color.black):
+                return False
+        knights = board.bitboard(Rank.knight, Color.white)
+        knights |= board.bitboard(Rank.knight, Color.black)
+        bishops = board.bitboard(Rank.bishop, Color.white)
+        bishops |= board.bitboard(Rank.bishop, Color.black)
+        minors = knights | bishops
+        if not minors & (minors - 1):
+            return True  # at most one minor piece
+        return not knights and (
+            not bishops & DARK_SQUARES or not bishops & ~DARK_SQUARES
+        )
 
+    def outcome(
+        self, claim_draw: bool = False, keys: Sequence[int] | None = None
+    ) -> Outcome | None:
+        """Returns how the game has ended, or `None` if it hasn't.
+
+        Checkmate, stalemate, insufficient material, the 75-move rule and fivefold
+        repetition end the game by themselves. The 50-move rule and threefold
+        repetition only do if `claim_draw` is set. `keys` are passed on to
+        `repetitions`. Only one legal move is generated to tell whether the side
+        to move is mated or stalemated.
+        """
+        if next(self.legalMoves(), None) is None:
+            if self.board.inCheck(self.turn):
+                return Outcome(Termination.checkmate, Color(-self.turn))
+            return Outcome(Termination.stalemate, None)
+        return self.drawOutcome(claim_draw, keys)
+
+    def drawOutcome(
+        self, claim_draw: bool = False, keys: Sequence[int] | None = None
+    ) -> Outcome | None:
+        """`outcome` for a position known to have a legal move: the draw rules."""
+        if self.hasInsufficientMaterial():
+            return Outcome(Termination.insufficient_material, None)
+        if self.halfturn >= 150:
+            return Outcome(Termination.seventyfive_moves, None)
+        if self.halfturn < 8:
+            return None  # too few reversible moves for any repetition rule
+        repetitions = self.repetitions(keys)
+        if repetitions >= 5:
+            return Outcome(Termination.fivefold_repetition, None)
+        if claim_draw:
+            if self.halfturn >= 100:
+                return Outcome(Termination.fifty_moves, None)
+            if repetitions >= 3:
+                return Outcome(Termination.threefold_repetition, None)
+        return None
+
+    def pseudoLegalMoves(self) -> Iterator[Move]:
+        return generatePseudoLegalMoves(self)
+
+    def legalMoves(self) -> Iterator[Move]:
+        return generateLegalMoves(self)
+
+
+def _castlingMoves(state: GameState, king_sq: int) -> Iterator[Move]:
+    board = state.board
+    color = state.turn
+    if color == Color.white:
+        home, kingside, queenside = 60, CASTLE_WHITE_KING, CASTLE_WHITE_QUEEN
+    else:
+        home, kingside, queenside = 4, CASTLE_BLACK_KING, CASTLE_BLACK_QUEEN
+    if king_sq != home or not state.castleavail & (kingside | queenside):
+        return
+    occupied = board.occupancy()
+    enemy = Color(-color)
+    rook = (color == Color.black) * BLACK | ROOK
+    if (
+        state.castleavail & kingside
+        and not occupied & (0b11 << home + 1)
+        and board.codeAt(home + 3) == rook
+        and not board.is_attacked(home, enemy)
+        and not board.is_attacked(home + 1, enemy)
+    ):
+        yield Move(home, home + 2)
+    if (
+        state.castleavail & queenside
+        and not occupied & (0b111 << home - 3)
+        and board.codeAt(home - 4) == rook
+        and not board.is_attacked(home, enemy)
+        and not board.is_attacked(home - 1, enemy)
+    ):
+        yield Move(home, home - 2)
+
+
+def _pieceTargets(state: GameState) -> Iterator[tuple[int, int, int]]:
+    """Yields `(square, rank value, targets)` for each piece of the side to move,
+    where `targets` is the mask of squares it can move to by the movement rules of
+    its piece. Castling is left out.
+    """
+    board = state.board
+    color = state.turn
+    own = board.occupancy(color)
+    enemy = board.occupancy(Color(-color))
+    occupied = own | enemy
+    not_own = ~own
+    pawn_captures = PAWN_ATTACKS[colorIndex(color)]
+    if state.enpassant >= 0:
+        enemy |= 1 << state.enpassant
+    for square in squaresOf(own):
+        rank = board.codeAt(square) & 7
+        if rank == PAWN:
+            ahead = square + 8 * color
+            targets = pawn_captures[square] & enemy
+            if not occupied >> ahead & 1:
+                targets |= 1 << ahead
+                if square >> 3 == (6 if color == Color.white else 1):
+                    double = ahead + 8 * color
+                    if not occupied >> double & 1:
+                        targets |= 1 << double
+        elif rank == KNIGHT:
+            targets = KNIGHT_ATTACKS[square] & not_own
+        elif rank == BISHOP:
+            targets = bishopAttacks(square, occupied) & not_own
+        elif rank == ROOK:
+            targets = rookAttacks(square, occupied) & not_own
+        elif rank == QUEEN:
+            targets = queenAttacks(square, occupied) & not_own
+        else:
+            targets = KING_ATTACKS[square] & not_own
+        yield square, rank, targets
 
-def getLegalMoves(pieces: Board, playerColor: Color, p=-1) -> set[str]:
-    legalMoves = set()
-    return legalMoves
+
+def _promotes(square: int, color: Color) -> bool:
+    """Whether a pawn of `color` on `square` promotes when it moves."""
+    return square >> 3 == (1 if color == Color.white else 6)
+
+
+def generatePseudoLegalMoves(state: GameState) -> Iterator[Move]:
+    """Yields every move of the side to move that obeys the movement rules of its
+    piece, without checking whether it leaves the player's own king in check.
+    Castling is the exception: it is only generated when the king is not in check and
+    does not pass through an attacked square, leaving just the destination to test.
+    """
+    color = state.turn
+    for square, rank, targets in _pieceTargets(state):
+        if rank == PAWN and _promotes(square, color):
+            for target in squaresOf(targets):
+                for promotion in PROMOTION_RANKS:
+                    yield Move(square, target, promotion)
+            continue
+        for target in squaresOf(targets):
+            yield Move(square, target)
+    kings = state.board.bitboard(Rank.king, color)
+    if kings:
+        yield from _castlingMoves(state, (kings & -kings).bit_length() - 1)
+
+
+class LegalityMasks(NamedTuple):
+    """What decides the legality of most moves of one side, see `legalityMasks`."""
+
+    king_sq: int
+    checkers: int  # enemy pieces giving check
+    # squares a move other than the king's must end on: all of them when not in
+    # check, the checker or a square blocking it in single check, none in double check
+    evasions: int
+    pinned: int  # own pieces that may only move along the line to their king
+
+
+def legalityMasks(board: Board, color: Color) -> LegalityMasks:
+    """Finds the checks on and the absolute pins against the king of `color`, once
+    per position, so that moves can be tested against them without playing them.
+    """
+    king_sq = board.kingSquare(color)
+    enemy = Color(-color)
+    checkers = board.attackers_of(king_sq, enemy)
+    if not checkers:
+        evasions = ALL_SQUARES
+    elif checkers & (checkers - 1):
+        evasions = 0
+    else:
+        evasions = checkers | BETWEEN[king_sq][checkers.bit_length() - 1]
+
+    queens = board.bitboard(Rank.queen, enemy)
+    snipers = ROOK_RAYS[king_sq] & (board.bitboard(Rank.rook, enemy) | queens)
+    snipers |= BISHOP_RAYS[king_sq] & (board.bitboard(Rank.bishop, enemy) | queens)
+    occupied = board.occupancy()
+    own = board.occupancy(color)
+    pinned = 0
+    for sniper in squaresOf(snipers):
+        blockers = BETWEEN[king_sq][sniper] & occupied
+        # exactly one piece in between, and it is ours
+        if blockers and not blockers & (blockers - 1) and blockers & own:
+            pinned |= blockers
+    return LegalityMasks(king_sq, checkers, evasions, pinned)
+
+
+def _isSafe(
+    board: Board,
+    color: Color,
+    masks: LegalityMasks,
+    from_sq: int,
+    to_sq: int,
+    enpassant: int,
+) -> bool:
+    """Whether moving the piece of `color` on `from_sq` to `to_sq` keeps its king out
+    of check. Only king moves and en passant captures touch the board.
+    """
+    king_sq = masks.king_sq
+    if from_sq == king_sq:
+        # lift the king, so that it doesn't hide the squares behind it from sliders
+        king = board.take(king_sq)
+        try:
+            return not board.is_attacked(to_sq, Color(-color))
+        finally:
+            board.put(king_sq, king)
+    if (
+        to_sq == enpassant
+        and board.codeAt(from_sq) & 7 == PAWN
+        and PAWN_ATTACKS[colorIndex(color)][from_sq] >> to_sq & 1
+    ):
+        # two pawns leave the same rank at once, which no pin mask describes
+        ep_sq = (from_sq & ~7) | (to_sq & 7)
+        pawn = board.take(from_sq)
+        captured = board.take(ep_sq)
+        board.put(to_sq, pawn)
+        try:
+            return not board.inCheck(color)
+        finally:
+            board.take(to_sq)
+            board.put(from_sq, pawn)
+            if captured:
+                board.put(ep_sq, captured)
+    return bool(
+        masks.evasions >> to_sq & 1
+        and (not masks.pinned >> from_sq & 1 or LINE[king_sq][from_sq] >> to_sq & 1)
+    )
+
+
+def isLegal(
+    state: GameState, move: Move, masks: LegalityMasks | None = None
+) -> bool:
+    """Whether the pseudo-legal `move` keeps the mover's king out of check. Pass the
+    `legalityMasks` of the side to move when testing many moves of one position.
+    """
+    if masks is None:
+        masks = legalityMasks(state.board, state.turn)
+    return _isSafe(
+        state.board, state.turn, masks, move.from_sq, move.to_sq, state.enpassant
+    )
+
+
+def generateLegalMoves(state: GameState) -> Iterator[Move]:
+    """Lazily yields the legal moves of the side to move.
+
+    The checks and pins of the position are found once with `legalityMasks`, after
+    which a pseudo-legal move is accepted or rejected with a mask test. Only king
+    moves and en passant captures are played out on the board.
+    """
+    board = state.board
+    color = state.turn
+    enpassant = state.enpassant
+    masks = legalityMasks(board, color)
+    king_sq, _, evasions, pinned = masks
+    for move in generatePseudoLegalMoves(state):
+        from_sq, to_sq = move.from_sq, move.to_sq
+        if from_sq == king_sq or to_sq == enpassant:
+            if _isSafe(board, color, masks, from_sq, to_sq, enpassant):
+                yield move
+        elif evasions >> to_sq & 1 and (
+            not pinned >> from_sq & 1 or LINE[king_sq][from_sq] >> to_sq & 1
+        ):
+            yield move
+
+
+def isPseudoLegal(state: GameState, move: Move) -> bool:
+    """Whether `move` is one `generatePseudoLegalMoves` would yield, found from the
+    moving piece alone rather than by generating every move.
+    """
+    board = state.board
+    from_sq, to_sq, promotion = move
+    color = state.turn
+    code = board.codeAt(from_sq)
+    target = board.codeAt(to_sq)
+    own = (color == Color.black) * BLACK
+    if not code or code & BLACK != own or target and target & BLACK == own:
+        return False
+    rank = code & 7
+    if rank == PAWN:
+        if (promotion is not None) != (to_sq < 8 or to_sq >= 56):
+            return False
+        ahead = from_sq + 8 * color
+        if to_sq == ahead:
+            return not target
+        if to_sq == ahead + 8 * color:
+            return (
+                not target
+                and not board.codeAt(ahead)
+                and from_sq >> 3 == (6 if color == Color.white else 1)
+            )
+        return bool(
+            PAWN_ATTACKS[colorIndex(color)][from_sq] >> to_sq & 1
+            and (target or to_sq == state.enpassant)
+        )
+    if promotion is not None:
+        return False
+    if rank == KNIGHT:
+        targets = KNIGHT_ATTACKS[from_sq]
+    elif rank == BISHOP:
+        targets = bishopAttacks(from_sq, board.occupancy())
+    elif rank == ROOK:
+        targets = rookAttacks(from_sq, board.occupancy())
+    elif rank == QUEEN:
+        targets = queenAttacks(from_sq, board.occupancy())
+    elif abs(to_sq - from_sq) == 2 and from_sq >> 3 == to_sq >> 3:
+        return move in _castlingMoves(state, from_sq)
+    else:
+        targets = KING_ATTACKS[from_sq]
+    return bool(targets >> to_sq & 1)
+
+
+def generateLegalMovesInto(state: GameState, buffer: array) -> int:
+    """Replaces the contents of `buffer`, an ``array("H")``, with the legal moves of
+    the side to move packed by `packMove`, and returns how many there are.
+
+    This is `generateLegalMoves` without a `Move` per move: reusing one buffer per
+    ply of a tree walk keeps move generation from allocating anything per node.
+    """
+    board = state.board
+    color = state.turn
+    enpassant = state.enpassant
+    masks = legalityMasks(board, color)
+    king_sq, _, evasions, pinned = masks
+    ep_bit = 1 << enpassant if enpassant >= 0 else 0
+    del buffer[:]
+    append = buffer.append
+    for square, rank, targets in _pieceTargets(state):
+        if square == king_sq:
+            for target in squaresOf(targets):
+                if _isSafe(board, color, masks, square, target, enpassant):
+                    append(square | target << 6)
+            continue
+        if rank == PAWN and targets & ep_bit:
+            targets ^= ep_bit
+            if _isSafe(board, color, masks, square, enpassant, enpassant):
+                append(square | enpassant << 6)
+        targets &= evasions
+        if pinned >> square & 1:
+            targets &= LINE[king_sq][square]
+        if rank == PAWN and _promotes(square, color):
+            for target in squaresOf(targets):
+                for code in _PROMOTION_FLAGS:
+                    append(square | target << 6 | code)
+            continue
+        for target in squaresOf(targets):
+            append(square | target << 6)
+    for move in _castlingMoves(state, king_sq):
+        if _isSafe(board, color, masks, move.from_sq, move.to_sq, enpassant):
+            append(packMove(move))
+    return len(buffer)
+
+
+def getLegalMoves(state: GameState) -> set[str]:
+    """Returns the legal moves of the side to move in UCI notation."""
+    return {moveToUCI(move) for move in generateLegalMoves(state)}
 
 
 def isaMove(
@@ -26,8 +700,8 @@ def isaMove(
     to_row: int,
     to_col: int,
     enpassanttarget: tuple[int, int] | None,
-    castleavail: int,
-):
+    castleavail: int | str,
+) -> bool:
     """Performs multiple checks to ensure that the desired move is valid and legal.
     This starts with preliminary checks for any piece:
     * Both squares are in the bounds of the board
@@ -40,146 +714,77 @@ def isaMove(
       in the other
     * For rooks, bishops, and queens, we check that the move is in a valid direction
       and doesn't jump over any pieces
-    * For the king, we check against castling availability, rows and columns moved is
-      <=1, and that the 'to' square doesn't neighbor a king (which isn't covered under
-       `inCheck`)
+    * For the king, we check against castling availability and attacked squares, and
+      that rows and columns moved is <=1. A 'to' square neighboring the other king is
+      caught by `inCheck`, which counts king attacks.
     * For pawns, the only legal moves are forward in the valid direction, based on
       color, then 1 forward if there is no piece there, 1 diagonally if there is a
       piece there, and two forward if there are no pieces in either square and the
       'from' square is either the 2nd or 7th rank.
+
+    `castleavail` is either the bitmask used by `GameState` or a FEN-style string.
     """
-    piece = board[from_row][from_col]
+    if not all(0 <= i < 8 for i in (from_row, from_col, to_row, to_col)):
+        return False
+    piece = board[from_row, from_col]
     if piece is None:
         return False
     if piece.color != playerColor:
         return False
-    to_square = board[to_row][to_col]
+    to_square = board[to_row, to_col]
     if to_square and to_square.color == playerColor:
         return False
+    if isinstance(castleavail, str):
+        castleavail = sum(char2castle.get(c, 0) for c in castleavail)
+    from_sq = from_row * 8 + from_col
+    to_sq = to_row * 8 + to_col
 
     # Check if move puts king in check
-    board.place(piece, to_row, to_col)
-    board.remove(from_row, from_col)
-    is_bad = board.inCheck(playerColor)
-    board.place(piece, from_row, from_col)
-    board.remove(to_row, to_col)
-    if is_bad:
+    enpassant = enpassanttarget[0] * 8 + enpassanttarget[1] if enpassanttarget else -1
+    masks = legalityMasks(board, playerColor)
+    if not _isSafe(board, playerColor, masks, from_sq, to_sq, enpassant):
         return False
 
     if piece.rank == Rank.knight:
-        return (abs(to_row - from_row), abs(to_col - from_col)) in [(1, 2), (2, 1)]
+        return bool(KNIGHT_ATTACKS[from_sq] >> to_sq & 1)
     elif piece.rank == Rank.king:
-        # check for neighboring King
-        enemy_king_row, enemy_king_col = board.findKing(
-            Color.black if playerColor == Color.white else Color.white
-        )
-        if abs(to_row - enemy_king_row) <= 1 and abs(to_col - enemy_king_col) <= 1:
-            return False
-        # check for castling
-        if playerColor == Color.white and from_row == to_row == 7 and from_col == 4 and (to_col == 2 or to_col == 6):
-            if "Q" in castleavail and to_col == 2 and board[7][3] is None and board[7][2] is None and board[7][1] is None:
-                board.place(piece, 7, 3)
-                board.remove(7, 4)
-                is_bad = board.inCheck(playerColor)
-                board.place(piece, 7, 4)
-                board.remove(7, 3)
-                return (not is_bad)
-            elif "K" in castleavail and to_col == 6 and board[7][5] is None and board[7][6] is None:
-                board.place(piece, 7, 5)
-                board.remove(7, 4)
-                is_bad = board.inCheck(playerColor)
-                board.place(piece, 7, 4)
-                board.remove(7, 5)
-                return (not is_bad)
-            else:
-                return False
-        elif playerColor == Color.black and from_row == to_row == 1 and from_col == 4 and (to_col == 2 or to_col == 6):
-            if "q" in castleavail and to_col == 2 and board[7][3] is None and board[7][2] is None and board[7][1] is None:
-                board.place(piece, 7, 3)
-                board.remove(7, 4)
-                is_bad = board.inCheck(playerColor)
-                board.place(piece, 7, 4)
-                board.remove(7, 3)
-                return (not is_bad)
-            elif "k" in castleavail and to_col == 6 and board[7][5] is None and board[7][6] is None:
-                board.place(piece, 7, 5)
-                board.remove(7, 4)
-                is_bad = board.inCheck(playerColor)
-                board.place(piece, 7, 4)
-                board.remove(7, 5)
-                return (not is_bad)
+        home = 60 if playerColor == Color.white else 4
+        if from_sq == home and to_row == from_row and abs(to_col - from_col) == 2:
+            kingside = to_col == 6
+            if playerColor == Color.white:
+                right = CASTLE_WHITE_KING if kingside else CASTLE_WHITE_QUEEN
             else:
-                return False
-        # check for moving 1 square in each direction
-        if abs(from_row - to_row) > 1 or abs(from_col - to_col) > 1:
-            return False
-    elif piece.rank == Rank.rook:
-        if from_row != to_row and from_col != to_col:
-            return False
-        if (
-            (
-                from_row == to_row
-                and from_col < to_col
-                and any(board[from_row][from_col + 1 : to_col - 1])
-            )
-            or (from_row == to_row and any(board[from_row][to_col + 1 : from_col - 1]))
-            or (
-                from_row < to_row
-                and any(row[from_col] for row in board[from_row + 1 : to_row - 1])
+                right = CASTLE_BLACK_KING if kingside else CASTLE_BLACK_QUEEN
+            path = 0b11 << home + 1 if kingside else 0b111 << home - 3
+            passing = home + 1 if kingside else home - 1
+            enemy = Color(-playerColor)
+            return bool(
+                castleavail & right
+                and not board.occupancy() & path
+                and board[from_row, 7 if kingside else 0] == Piece(Rank.rook, playerColor)
+                and not board.is_attacked(home, enemy)
+                and not board.is_attacked(passing, enemy)
             )
-            or (any(row[from_col] for row in board[to_row + 1 : from_row - 1]))
-        ):
-            return False
+        return bool(KING_ATTACKS[from_sq] >> to_sq & 1)
+    elif piece.rank == Rank.rook:
+        return bool(rookAttacks(from_sq, board.occupancy()) >> to_sq & 1)
     elif piece.rank == Rank.bishop:
-        nsquares = abs(to_row - from_row)
-        if nsquares != abs(to_col - from_col):
-            return False
-        row_inc = (to_row - from_row) / nsquares
-        col_inc = (to_col - from_col) / nsquares
-        if any(
-            board[from_row + row_inc * i][from_col + col_inc * i]
-            for i in range(1, nsquares)
-        ):
-            return False
+        return bool(bishopAttacks(from_sq, board.occupancy()) >> to_sq & 1)
     elif piece.rank == Rank.queen:
-        if abs(to_row - from_row) == abs(to_col - from_col):  # diagonal movement
-            nsquares = abs(to_row - from_row)
-            row_inc = (to_row - from_row) / nsquares
-            col_inc = (to_col - from_col) / nsquares
-            if any(
-                board[from_row + row_inc * i][from_col + col_inc * i]
-                for i in range(1, nsquares)
-            ):
-                return False
-        elif (from_row == to_row) == (from_col == to_col):  # non-lateral movement
-            return False
-        if (  # lateral movement
-            (
-                from_row == to_row
-                and from_col < to_col
-                and any(board[from_row][from_col + 1 : to_col - 1])
-            )
-            or (from_row == to_row and any(board[from_row][to_col + 1 : from_col - 1]))
-            or (
-                from_row < to_row
-                and any(row[from_col] for row in board[from_row + 1 : to_row - 1])
-            )
-            or (any(row[from_col] for row in board[to_row + 1 : from_row - 1]))
-        ):
-            return False
+        return bool(queenAttacks(from_sq, board.occupancy()) >> to_sq & 1)
     else:  # pawn, most complicated...
         if (
             playerColor == Color.white
             and from_col == to_col
             and from_row - 1 == to_row
-            and board[to_row][to_col] is None
+            and board[to_row, to_col] is None
         ):
             return True
         if (
             playerColor == Color.black
             and from_col == to_col
             and from_row + 1 == to_row
-            and board[to_row][to_col] is None
+            and board[to_row, to_col] is None
         ):
             return True
         if (
@@ -187,7 +792,7 @@ def isaMove(
             and abs(from_col - to_col) == 1
             and from_row - 1 == to_row
             and (
-                board[to_row][to_col]
+                board[to_row, to_col]
                 or (enpassanttarget and enpassanttarget == (to_row, to_col))
             )
         ):
@@ -197,7 +802,7 @@ def isaMove(
             and abs(from_col - to_col) == 1
             and from_row + 1 == to_row
             and (
-                board[to_row][to_col]
+                board[to_row, to_col]
                 or (enpassanttarget and enpassanttarget == (to_row, to_col))
             )
         ):
@@ -207,8 +812,8 @@ def isaMove(
             and from_row == 6
             and to_row == 4
             and from_col == to_col
-            and board[5][from_col] is None
-            and board[4][from_col] is None
+            and board[5, from_col] is None
+            and board[4, from_col] is None
         ):
             return True
         if (
@@ -216,35 +821,120 @@ def isaMove(
             and from_row == 1
             and to_row == 3
             and from_col == to_col
-            and board[2][from_col] is None
-            and board[3][from_col] is None
+            and board[2, from_col] is None
+            and board[3, from_col] is None
         ):
             return True
         return False
 
-    return True
-
 
 def makeMove(
-    board: Board,
+    state: GameState,
     from_row: int,
     from_col: int,
     to_row: int,
     to_col: int,
-    enpassanttarget: tuple[int, int] | None,
-):
-    if not isaMove(board, from_row, from_col, to_row, to_col, enpassanttarget):
-        return (board, enpassanttarget)
-    piece = board[from_row][from_col]
-    board[to_row][to_col] = piece
-    board[from_row][from_col] = None
-    if piece.rank == Rank.pawn and abs(to_row - from_row) == 2:
-        enpassanttarget = (to_row + from_row) // 2
-    else:
-        enpassanttarget = None
-    return (board, enpassanttarget)
+    promotion: Rank | None = None,
+) -> bool:
+    """Plays the move on `state` if it is legal. Returns whether the move was made."""
+    move = Move(from_row * 8 + from_col, to_row * 8 + to_col, promotion)
+    if move not in generateLegalMoves(state):
+        return False
+    state.push(move)
+    return True
+
+
+def setup() -> GameState:
+    return GameState.fromFEN(STARTING_FEN)
+
+
+def parse_many(lines: Iterable[str]) -> Iterator[GameState]:
+    """Yields a `GameState` for each FEN string in `lines`, skipping blank lines.
+    Works on an open file without reading it all into memory.
+    """
+    for line in lines:
+        fenstring = line.strip()
+        if fenstring:
+            yield GameState.fromFEN(fenstring)
 
 
-def setup():
-    classicFEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
-    board = Board(classicFEN)
+def dump_many(states: Iterable[GameState], outfile: IO[str] | None = None) -> str:
+    """Writes the FEN string of each of `states` on its own line, to `outfile` if
+    given (returning an empty string), or else to the returned string.
+    """
+    lines = (state.to_fen() + "\n" for state in states)
+    if outfile is None:
+        return "".join(lines)
+    outfile.writelines(lines)
+    return ""
+
+
+def unpack_many(buffer) -> Iterator[GameState]:
+    """Yields a `GameState` for each record of a buffer written by `pack_many`, for
+    example a memory-mapped position database.
+    """
+    for fields in iterPositions(buffer):
+        yield GameState._fromFields(fields)
+
+
+def pack_many(states: Iterable[GameState]) -> bytes:
+    """Concatenates the `GameState.to_bytes` encodings of `states`."""
+    return b"".join(state.to_bytes() for state in states)
+
+
+class GameValidation(NamedTuple):
+    illegal: int  # index of the first illegal move, or -1 if every move was legal
+    state: GameState  # the position after the last legal move
+
+    @property
+    def valid(self) -> bool:
+        return self.illegal < 0
+
+
+def _decodeMove(move: str | int | Move) -> Move | None:
+    """Reads a UCI string, a move packed by `packMove` or a `Move`; `None` if it
+    is malformed.
+    """
+    if isinstance(move, Move):
+        return move
+    try:
+        if isinstance(move, str):
+            return moveFromUCI(move)
+        return unpackMove(int(move) & 0xFFFF)
+    except (KeyError, ValueError):
+        return None
+
+
+def iter_game(
+    start_fen: str = STARTING_FEN, moves: Iterable[str | int | Move] = ()
+) -> Generator[GameState, None, GameValidation]:
+    """Replays `moves` from `start_fen`, yielding the position after each legal one
+    and stopping at the first illegal one. The moves are UCI strings or 16-bit
+    `packMove` codes, such as an ``array("H")`` or an int16 numpy array.
+
+    Every position is the same `GameState`, updated in place; use `to_bytes` or
+    `to_fen` to keep one. The generator returns what `validate_game` does, which
+    ``yield from`` passes on.
+    """
+    state = GameState.fromFEN(start_fen)
+    for index, item in enumerate(moves):
+        move = _decodeMove(item)
+        if move is None or not (isPseudoLegal(state, move) and isLegal(state, move)):
+            return GameValidation(index, state)
+        state.push(move)
+        yield state
+    return GameValidation(-1, state)
+
+
+def validate_game(
+    start_fen: str = STARTING_FEN, moves: Iterable[str | int | Move] = ()
+) -> GameValidation:
+    """Replays `moves` from `start_fen` on one `GameState`, see `iter_game`. Returns
+    the index of the first illegal move, or -1, and the position reached.
+    """
+    replay = iter_game(start_fen, moves)
+    try:
+        while True:
+            next(replay)
+    except StopIteration as done:
+        return done.value
@@ -0,0 +1,182 @@
+import bz2
+import gzip
+import mmap
+import re
+from typing import IO, Iterable, Iterator, NamedTuple
+
+from pyChess import GameState, Move, Rank, setup
+from pyChess.Logic import char2rank, squareIndex
+
+_header_re = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+_token_re = re.compile(r"[{}();]|[^\s{}();]+")
+_move_number_re = re.compile(r"\d+\.+")
+_san_re = re.compile(r"([NBRQK])?([a-h])?([1-8])?x?([a-h][1-8])(?:=?([NBRQ]))?")
+RESULTS = ("1-0", "0-1", "1/2-1/2", "*")
+
+
+class Game(NamedTuple):
+    number: int  # 1-based position of the game in its archive
+    headers: dict[str, str]
+    moves: list[str]  # SAN, mainline only
+    result: str
+
+
+class GameReport(NamedTuple):
+    number: int
+    headers: dict[str, str]
+    plies: int  # number of moves that were legal
+    error: str  # empty if every move was legal
+    san: str  # the first illegal move, if any
+
+    @property
+    def valid(self) -> bool:
+        return not self.error
+
+    @property
+    def ply(self) -> int:
+        """1-based ply of the first illegal move, or 0 if there was none."""
+        return self.plies + 1 if self.error else 0
+
+
+def _mappedLines(path: str) -> Iterator[str]:
+    with open(path, "rb") as infile:
+        try:
+            mapped = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty files can't be mapped
+            return
+        with mapped:
+            for line in iter(mapped.readline, b""):
+                yield line.decode("utf-8", errors="replace")
+
+
+def openArchive(source: str | IO[str]) -> Iterator[str]:
+    """Yields the lines of a PGN archive. `source` is an open text file, or a path:
+    ``.gz`` and ``.bz2`` files are decompressed on the fly and anything else is
+    memory-mapped, so memory use doesn't grow with the archive.
+    """
+    if not isinstance(source, str):
+        yield from source
+    elif source.endswith(".gz"):
+        with gzip.open(source, "rt", encoding="utf-8", errors="replace") as infile:
+            yield from infile
+    elif source.endswith(".bz2"):
+        with bz2.open(source, "rt", encoding="utf-8", errors="replace") as infile:
+            yield from infile
+    else:
+        yield from _mappedLines(source)
+
+
+def readGames(source: str | IO[str] | Iterable[str]) -> Iterator[Game]:
+    """Parses PGN text one game at a time. Comments, variations and numeric
+    annotation glyphs are skipped; only the mainline SAN moves are kept.
+    """
+    lines = openArchive(source) if isinstance(source, str) else iter(source)
+    number = 0
+    headers: dict[str, str] = {}
+    moves: list[str] = []
+    in_movetext = False
+    comment = False  # inside a {...} comment, which may span lines
+    variation = 0  # depth of (...) variations
+    for line in lines:
+        if not comment and not variation and line.startswith("["):
+            if in_movetext:
+                number += 1
+                yield Game(number, headers, moves, "*")
+                headers, moves, in_movetext = {}, [], False
+            for tag, value in _header_re.findall(line):
+                headers[tag] = value.replace('\\"', '"').replace("\\\\", "\\")
+            continue
+        if line.startswith("%"):
+            continue  # escape mechanism, ignored
+        for token in _token_re.findall(line):
+            if comment:
+                comment = token != "}"
+                continue
+            if token == "{":
+                comment = True
+            elif token == ";":
+                break
+            elif token == "(":
+                variation += 1
+            elif token == ")":
+                variation = max(0, variation - 1)
+            elif variation:
+                continue
+            elif token in RESULTS:
+                number += 1
+                yield Game(number, headers, moves, token)
+                headers, moves, in_movetext = {}, [], False
+            else:
+                in_movetext = True
+                token = _move_number_re.sub("", token, count=1)
+                if token and not token.startswith("$"):
+                    moves.append(token)
+    if in_movetext or headers:
+        number += 1
+        yield Game(number, headers, moves, "*")
+
+
+def parseSAN(state: GameState, san: str) -> Move:
+    """Resolves a move in standard algebraic notation against the legal moves of
+    `state`. Raises `ValueError` if it matches none or more than one.
+    """
+    token = san.rstrip("+#!?")
+    board = state.board
+    if token in ("O-O", "0-0", "O-O-O", "0-0-0"):
+        kingside = len(token) == 3
+        for move in state.legalMoves():
+            if (
+                board.pieceAt(move.from_sq).rank == Rank.king
+                and move.to_sq - move.from_sq == (2 if kingside else -2)
+            ):
+                return move
+        raise ValueError(f"Illegal move: '{san}'.")
+
+    match = _san_re.fullmatch(token)
+    if match is None:
+        raise ValueError(f"Invalid SAN move: '{san}'.")
+    piece, file, rank, destination, promotion = match.groups()
+    piece_rank = char2rank[piece.lower()] if piece else Rank.pawn
+    promotion_rank = char2rank[promotion.lower()] if promotion else None
+    to_sq = squareIndex(destination)
+    candidates = [
+        move
+        for move in state.legalMoves()
+        if move.to_sq == to_sq
+        and move.promotion == promotion_rank
+        and board.pieceAt(move.from_sq).rank == piece_rank
+        and (file is None or move.from_sq & 7 == ord(file) - 97)
+        and (rank is None or move.from_sq >> 3 == 8 - int(rank))
+        # castling is only ever written as O-O or O-O-O
+        and not (piece_rank == Rank.king and abs(move.to_sq - move.from_sq) == 2)
+    ]
+    if len(candidates) != 1:
+        reason = "Illegal" if not candidates else "Ambiguous"
+        raise ValueError(f"{reason} move: '{san}'.")
+    return candidates[0]
+
+
+def validateGame(game: Game) -> GameReport:
+    """Replays `game` from its FEN header (or the standard start) and reports the
+    first illegal move.
+    """
+    try:
+        if "FEN" in game.headers:
+            state = GameState.fromFEN(game.headers["FEN"])
+        else:
+            state = setup()
+    except (SyntaxError, ValueError, LookupError) as err:
+        error = f"Invalid FEN header: {err}"
+        return GameReport(game.number, game.headers, 0, error, "")
+    for plies, san in enumerate(game.moves):
+        try:
+            state.push(parseSAN(state, san))
+        except ValueError as err:
+            return GameReport(game.number, game.headers, plies, str(err), san)
+    return GameReport(game.number, game.headers, len(game.moves), "", "")
+
+
+def validateGames(source: str | IO[str] | Iterable[str]) -> Iterator[GameReport]:
+    """Streams every game of `source` through `validateGame`."""
+    for game in readGames(source):
+        yield validateGame(game)
@@ -0,0 +1,173 @@
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+from pyChess import GameState, moveFromUCI, moveToUCI, unpackMove
+from pyChess.Logic import generateLegalMovesInto
+from pyChess.TranspositionTable import EXACT, TranspositionTable
+
+
+class PerftPosition(NamedTuple):
+    name: str
+    fen: str
+    counts: tuple[int, ...]  # counts[d - 1] is the number of leaves at depth d
+
+
+# Reference leaf counts from the Chess Programming Wiki perft results page.
+PERFT_SUITE = [
+    PerftPosition(
+        "startpos",
+        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+        (20, 400, 8902, 197281, 4865609, 119060324),
+    ),
+    PerftPosition(
+        "kiwipete",
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        (48, 2039, 97862, 4085603, 193690690),
+    ),
+    PerftPosition(
+        "endgame",
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        (14, 191, 2812, 43238, 674624, 11030083),
+    ),
+    PerftPosition(
+        "promotions",
+        "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+        (6, 264, 9467, 422333, 15833292),
+    ),
+    PerftPosition(
+        "discovered",
+        "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+        (44, 1486, 62379, 2103487, 89941194),
+    ),
+    PerftPosition(
+        "middlegame",
+        "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+        (46, 2079, 89890, 3894594, 164075551),
+    ),
+]
+
+
+def perft(
+    state: GameState, depth: int, table: TranspositionTable | None = None
+) -> int:
+    """Counts the leaf nodes of the legal move tree `depth` plies below `state`.
+
+    With a transposition `table`, subtree counts are cached by position and depth so
+    that transpositions are only counted once.
+    """
+    if depth < 0:
+        raise ValueError(f"Perft depth must not be negative, found {depth}.")
+    return _perft(state, depth, table, [array("H") for _ in range(depth)])
+
+
+def _perft(
+    state: GameState,
+    depth: int,
+    table: TranspositionTable | None,
+    buffers: list[array],
+) -> int:
+    # the moves of each ply are packed into buffers[depth - 1], reused across nodes
+    if depth == 0:
+        return 1
+    if table is not None and depth > 1:
+        entry = table.probe(state.zobrist)
+        if entry is not None and entry.depth == depth:
+            return entry.score
+    moves = buffers[depth - 1]
+    count = generateLegalMovesInto(state, moves)
+    if depth == 1:
+        return count
+    nodes = 0
+    for packed in moves:
+        state.push(unpackMove(packed))
+        nodes += _perft(state, depth - 1, table, buffers)
+        state.pop()
+    if table is not None:
+        table.store(state.zobrist, depth, EXACT, nodes)
+    return nodes
+
+
+def divide(
+    state: GameState, depth: int, table: TranspositionTable | None = None
+) -> dict[str, int]:
+    """Returns the perft count below each root move, keyed by its UCI string. At
+    depth 0 there are no root moves to split by, so the result is empty.
+    """
+    counts: dict[str, int] = {}
+    if depth < 1:
+        return counts
+    for move in list(state.legalMoves()):
+        state.push(move)
+        counts[moveToUCI(move)] = perft(state, depth - 1, table)
+        state.pop()
+    return counts
+
+
+def _perftBelow(fen: str, uci: str, depth: int, megabytes: float) -> int:
+    state = GameState.fromFEN(fen)
+    state.push(moveFromUCI(uci))
+    return perft(state, depth - 1, TranspositionTable(megabytes) if megabytes else None)
+
+
+def parallelDivide(
+    fen: str, depth: int, workers: int | None = None, megabytes: float = 0
+) -> dict[str, int]:
+    """`divide` with the root moves spread over a process pool of `workers`
+    processes (default: one per CPU). The result is ordered by UCI string, so it is
+    the same however the work was scheduled. If `megabytes` is set, each task gets a
+    transposition table of that size.
+    """
+    if depth < 1:
+        return {}
+    roots = sorted(moveToUCI(move) for move in GameState.fromFEN(fen).legalMoves())
+    if depth == 1:
+        return {uci: 1 for uci in roots}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        n = len(roots)
+        counts = executor.map(
+            _perftBelow, [fen] * n, roots, [depth] * n, [megabytes] * n
+        )
+        return dict(zip(roots, counts))
+
+
+def parallelPerft(
+    fen: str, depth: int, workers: int | None = None, megabytes: float = 0
+) -> int:
+    if depth == 0:
+        return 1
+    return sum(parallelDivide(fen, depth, workers, megabytes).values())
+
+
+class SuiteResult(NamedTuple):
+    name: str
+    depth: int
+    nodes: int
+    expected: int
+    seconds: float
+
+    @property
+    def passed(self) -> bool:
+        return self.nodes == self.expected
+
+    @property
+    def nps(self) -> float:
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+
+def runSuite(depth: int, positions=PERFT_SUITE) -> list[SuiteResult]:
+    """Runs perft to `depth` (capped at each position's deepest known count) on every
+    position and checks the result against the reference counts.
+    """
+    results = []
+    for position in positions:
+        d = min(depth, len(position.counts))
+        state = GameState.fromFEN(position.fen)
+        start = time.perf_counter()
+        nodes = perft(state, d)
+        seconds = time.perf_counter() - start
+        results.append(
+            SuiteResult(position.name, d, nodes, position.counts[d - 1], seconds)
+        )
+    return results
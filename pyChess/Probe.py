@@ -0,0 +1,292 @@
+import mmap
+import random
+import struct
+from typing import Iterable, NamedTuple, Sequence
+
+from pyChess import Color, GameState, Move, Rank, packMove, unpackMove
+from pyChess.Board import BLACK, KING, PAWN, ROOK
+from pyChess.Cache import LRUCache
+
+# Polyglot book entries: 64-bit key, 16-bit move, 16-bit weight, 32-bit learn value,
+# big-endian and sorted by key.
+BOOK_ENTRY = struct.Struct(">QHHI")
+# Endgame table entries: 64-bit key, 32-bit score in centipawns for the side to move
+# (mate scores as in `pyChess.Search`) and 16-bit move from `packMove`, sorted by key.
+TABLE_ENTRY = struct.Struct(">QiH")
+RANDOM_COUNT = 781  # number of keys in a Polyglot Random64 table
+
+_MISSING = object()
+
+_promotion_ranks = [None, Rank.knight, Rank.bishop, Rank.rook, Rank.queen]
+_promotion_codes = {rank: code for code, rank in enumerate(_promotion_ranks)}
+
+
+def _flip(square: int) -> int:
+    """Converts between our square numbers (a8 = 0) and Polyglot's (a1 = 0)."""
+    return square ^ 56
+
+
+def loadRandoms(path: str) -> list[int]:
+    """Reads a Polyglot Random64 table stored as 781 big-endian 64-bit integers."""
+    with open(path, "rb") as infile:
+        data = infile.read()
+    if len(data) != 8 * RANDOM_COUNT:
+        raise ValueError(
+            f"Expected {8 * RANDOM_COUNT} bytes in {path}, found {len(data)}."
+        )
+    return list(struct.unpack(f">{RANDOM_COUNT}Q", data))
+
+
+def polyglotKey(state: GameState, randoms: Sequence[int]) -> int:
+    """Hashes `state` the way Polyglot books do, using the 781 keys of `randoms`."""
+    board = state.board
+    key = 0
+    for square in range(64):
+        code = board.codeAt(square)
+        if code:
+            kind = 2 * ((code & 7) - 1) + (not code & BLACK)
+            key ^= randoms[64 * kind + _flip(square)]
+    for bit in range(4):
+        if state.castleavail >> bit & 1:
+            key ^= randoms[768 + bit]
+    if state.enpassant >= 0:
+        col = state.enpassant & 7
+        capture_sq = state.enpassant - 8 * state.turn
+        pawn = (state.turn == Color.black) * BLACK | PAWN
+        if (col != 0 and board.codeAt(capture_sq - 1) == pawn) or (
+            col != 7 and board.codeAt(capture_sq + 1) == pawn
+        ):
+            key ^= randoms[772 + col]
+    if state.turn == Color.white:
+        key ^= randoms[780]
+    return key
+
+
+def decodeBookMove(state: GameState, raw: int) -> Move:
+    """Converts a Polyglot move to a `Move`. Polyglot writes castling as the king
+    capturing its own rook.
+    """
+    to_sq = _flip(raw & 63)
+    from_sq = _flip(raw >> 6 & 63)
+    promotion = _promotion_ranks[raw >> 12 & 7]
+    code = state.board.codeAt(from_sq)
+    if code & 7 == KING and state.board.codeAt(to_sq) == code & BLACK | ROOK:
+        to_sq = from_sq + 2 if to_sq > from_sq else from_sq - 2
+    return Move(from_sq, to_sq, promotion)
+
+
+def encodeBookMove(state: GameState, move: Move) -> int:
+    from_sq, to_sq = move.from_sq, move.to_sq
+    if state.board.codeAt(from_sq) & 7 == KING and abs(to_sq - from_sq) == 2:
+        to_sq = from_sq + 3 if to_sq > from_sq else from_sq - 4
+    return _flip(to_sq) | _flip(from_sq) << 6 | _promotion_codes[move.promotion] << 12
+
+
+class _SortedRecords:
+    """Read-only view of a memory-mapped file of fixed-size records sorted by a
+    leading 64-bit key.
+    """
+
+    def __init__(self, path: str, record: struct.Struct) -> None:
+        self.record = record
+        with open(path, "rb") as infile:
+            try:
+                self.data = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty files can't be mapped
+                self.data = b""
+        if len(self.data) % record.size:
+            raise ValueError(
+                f"{path} is not a whole number of {record.size}-byte entries."
+            )
+        self.count = len(self.data) // record.size
+
+    def find(self, key: int) -> list[tuple]:
+        """Returns every record with `key`, by binary search."""
+        record, data = self.record, self.data
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if record.unpack_from(data, middle * record.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        found = []
+        while low < self.count:
+            entry = record.unpack_from(data, low * record.size)
+            if entry[0] != key:
+                break
+            found.append(entry)
+            low += 1
+        return found
+
+    def close(self) -> None:
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+
+class BookEntry(NamedTuple):
+    move: Move
+    weight: int
+    learn: int
+
+
+class OpeningBook:
+    """Polyglot-format opening book, memory-mapped and searched in place.
+
+    Polyglot books are keyed with the Random64 table published with Polyglot; pass it
+    as `randoms` (see `loadRandoms`) to read books made by other tools. Without it,
+    positions are keyed by `GameState.zobrist`, which is what `writeBook` uses by
+    default.
+    """
+
+    def __init__(self, path: str, randoms: Sequence[int] | None = None) -> None:
+        if randoms is not None and len(randoms) != RANDOM_COUNT:
+            raise ValueError(
+                f"Expected {RANDOM_COUNT} random keys, found {len(randoms)}."
+            )
+        self.randoms = randoms
+        self.__records = _SortedRecords(path, BOOK_ENTRY)
+
+    def __len__(self) -> int:
+        return self.__records.count
+
+    def __enter__(self) -> "OpeningBook":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.__records.close()
+
+    def key(self, state: GameState) -> int:
+        if self.randoms is None:
+            return state.zobrist
+        return polyglotKey(state, self.randoms)
+
+    def entries(self, state: GameState) -> list[BookEntry]:
+        """Returns the legal book moves for `state`, highest weight first."""
+        legal = set(state.legalMoves())
+        entries = []
+        for _, raw, weight, learn in self.__records.find(self.key(state)):
+            move = decodeBookMove(state, raw)
+            if move in legal:
+                entries.append(BookEntry(move, weight, learn))
+        entries.sort(key=lambda entry: entry.weight, reverse=True)
+        return entries
+
+    def choose(
+        self, state: GameState, rng: random.Random | None = None
+    ) -> Move | None:
+        """Returns a book move for `state`: the highest weighted one, or one picked
+        at random in proportion to the weights if `rng` is given.
+        """
+        entries = self.entries(state)
+        if not entries:
+            return None
+        if rng is None or not any(entry.weight for entry in entries):
+            return entries[0].move
+        weights = [entry.weight for entry in entries]
+        return rng.choices(entries, weights)[0].move
+
+
+def writeBook(
+    path: str,
+    lines: Iterable[tuple[GameState, Move, int]],
+    randoms: Sequence[int] | None = None,
+) -> None:
+    """Writes `(state, move, weight)` entries to a Polyglot-format book."""
+    records = []
+    for state, move, weight in lines:
+        key = state.zobrist if randoms is None else polyglotKey(state, randoms)
+        records.append((key, encodeBookMove(state, move), weight, 0))
+    records.sort(key=lambda record: (record[0], -record[2]))
+    with open(path, "wb") as outfile:
+        for record in records:
+            outfile.write(BOOK_ENTRY.pack(*record))
+
+
+class TableEntry(NamedTuple):
+    score: int
+    move: Move | None
+
+
+class Tablebase:
+    """Endgame table of precomputed scores and best moves keyed by
+    `GameState.zobrist`, memory-mapped and searched in place.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.__records = _SortedRecords(path, TABLE_ENTRY)
+
+    def __len__(self) -> int:
+        return self.__records.count
+
+    def __enter__(self) -> "Tablebase":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.__records.close()
+
+    def probe(self, state: GameState) -> TableEntry | None:
+        found = self.__records.find(state.zobrist)
+        if not found:
+            return None
+        _, score, packed = found[0]
+        return TableEntry(score, unpackMove(packed))
+
+
+def writeTablebase(
+    path: str, entries: Iterable[tuple[GameState, int, Move | None]]
+) -> None:
+    """Writes `(state, score, move)` entries to a table file for `Tablebase`."""
+    records = sorted(
+        (state.zobrist, score, packMove(move)) for state, score, move in entries
+    )
+    with open(path, "wb") as outfile:
+        for record in records:
+            outfile.write(TABLE_ENTRY.pack(*record))
+
+
+class ProbeResult(NamedTuple):
+    move: Move | None
+    score: int | None  # None for book moves
+    source: str  # "book" or "tablebase"
+
+
+class Prober:
+    """Answers positions from an opening book or endgame table before anything is
+    searched, with an LRU cache keyed by `GameState.zobrist` in front of both.
+    """
+
+    def __init__(
+        self,
+        book: OpeningBook | None = None,
+        tablebase: Tablebase | None = None,
+        cachesize: int = 4096,
+    ) -> None:
+        self.book = book
+        self.tablebase = tablebase
+        self.cache = LRUCache(cachesize)
+
+    def probe(self, state: GameState) -> ProbeResult | None:
+        key = state.zobrist
+        result = self.cache.get(key, _MISSING)
+        if result is not _MISSING:
+            return result  # possibly a cached None for a position known to miss
+        result = None
+        if self.tablebase is not None:
+            entry = self.tablebase.probe(state)
+            if entry is not None and (
+                entry.move is None or entry.move in state.legalMoves()
+            ):
+                result = ProbeResult(entry.move, entry.score, "tablebase")
+        if result is None and self.book is not None:
+            move = self.book.choose(state)
+            if move is not None:
+                result = ProbeResult(move, None, "book")
+        self.cache.put(key, result)
+        return result
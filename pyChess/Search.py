@@ -0,0 +1,346 @@
+import time
+from array import array
+from typing import Callable, Iterable, NamedTuple
+
+from pyChess import GameState, Move, packMove, unpackMove
+from pyChess.Board import PAWN, PIECE_CODE, Board
+from pyChess.Logic import PROMOTION_RANKS, generateLegalMovesInto
+from pyChess.Evaluation import PIECE_VALUES, evaluate
+from pyChess.Probe import Prober
+from pyChess.TranspositionTable import EXACT, LOWER, UPPER, TranspositionTable
+
+INFINITY = 1_000_000
+MATE_SCORE = 100_000
+# Scores beyond this are mates, counted in plies from the root.
+MATE_BOUND = MATE_SCORE - 1000
+MAX_PLY = 64
+
+# PIECE_VALUES indexed by piece code.
+_CODE_VALUES = [0] * 16
+for _piece, _code in PIECE_CODE.items():
+    _CODE_VALUES[_code] = PIECE_VALUES[_piece.rank]
+# PIECE_VALUES by the promotion bits of a packed move.
+_PROMOTION_VALUES = [0] * 16
+for _rank in PROMOTION_RANKS:
+    _PROMOTION_VALUES[packMove(Move(8, 0, _rank)) >> 12] = PIECE_VALUES[_rank]
+
+
+def isCapture(state: GameState, move: Move) -> bool:
+    board = state.board
+    if board.codeAt(move.to_sq):
+        return True
+    return move.to_sq == state.enpassant and board.codeAt(move.from_sq) & 7 == PAWN
+
+
+def _isPackedCapture(board: Board, packed: int, enpassant: int) -> bool:
+    """`isCapture` for a move packed by `packMove`."""
+    to_sq = packed >> 6 & 63
+    if board.codeAt(to_sq):
+        return True
+    return to_sq == enpassant and board.codeAt(packed & 63) & 7 == PAWN
+
+
+class SearchResult(NamedTuple):
+    move: Move | None
+    score: int  # centipawns for the side to move, or +/-(MATE_SCORE - plies)
+    depth: int  # last fully searched depth
+    nodes: int
+    seconds: float
+    pv: list[Move]
+
+
+class _Abort(Exception):
+    """Raised inside the tree when the time or node budget runs out."""
+
+
+def _toTable(score: int, ply: int) -> int:
+    # mate scores are stored relative to the node, not the root
+    if score > MATE_BOUND:
+        return score + ply
+    if score < -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def _fromTable(score: int, ply: int) -> int:
+    if score > MATE_BOUND:
+        return score - ply
+    if score < -MATE_BOUND:
+        return score + ply
+    return score
+
+
+class Searcher:
+    """Negamax alpha-beta search with iterative deepening and quiescence search.
+
+    Moves are ordered by the transposition table move, then captures by MVV-LVA
+    (most valuable victim, least valuable attacker), then killer moves. The search
+    checks its time and node budget every `CHECK_EVERY` nodes, a few milliseconds at
+    Python speeds, and unwinds cleanly when it runs out, returning the result of the
+    last completed iteration.
+
+    Inside the tree, moves are 16-bit `packMove` codes generated into one reusable
+    ``array("H")`` per ply; `Move` objects only appear at the root and in results.
+    """
+
+    CHECK_EVERY = 64
+
+    def __init__(
+        self, table: TranspositionTable | None = None, prober: Prober | None = None
+    ) -> None:
+        self.table = table if table is not None else TranspositionTable(16)
+        self.prober = prober
+        self.nodes = 0
+        self.stopped = False
+        self.__killers: list[list[int]] = []  # two packed moves per ply
+        self.__buffers = [array("H") for _ in range(MAX_PLY + 1)]
+        self.__deadline = 0.0
+        self.__maxnodes = 0
+
+    def stop(self) -> None:
+        """Asks a running search to return as soon as possible. Safe to call from
+        another thread.
+        """
+        self.stopped = True
+
+    def search(
+        self,
+        state: GameState,
+        depth: int = MAX_PLY,
+        movetime: float | None = None,
+        nodes: int | None = None,
+        onIteration: Callable[[SearchResult], None] | None = None,
+    ) -> SearchResult:
+        """Searches `state` to at most `depth` plies, for at most `movetime` seconds
+        and `nodes` nodes. `onIteration` is called with the result of every
+        completed iteration. `state` is left as it was found.
+        """
+        start = time.perf_counter()
+        self.nodes = 0
+        self.stopped = False
+        self.__killers = [[0, 0] for _ in range(MAX_PLY + 1)]
+        self.__deadline = start + movetime if movetime is not None else float("inf")
+        self.__maxnodes = nodes if nodes is not None else 0
+        self.table.newSearch()
+
+        moves = list(state.legalMoves())
+        if not moves:
+            score = -MATE_SCORE if state.board.inCheck(state.turn) else 0
+            return SearchResult(None, score, 0, 0, time.perf_counter() - start, [])
+        if self.prober is not None:
+            hit = self.prober.probe(state)
+            if hit is not None and hit.move is not None:
+                score = hit.score if hit.score is not None else evaluate(state)
+                seconds = time.perf_counter() - start
+                return SearchResult(hit.move, score, 0, 0, seconds, [hit.move])
+        packed = [packMove(move) for move in moves]
+        result = SearchResult(
+            unpackMove(self._orderMoves(state, packed, 0, 0)[0]),
+            0,
+            0,
+            0,
+            0.0,
+            [],
+        )
+        for iteration in range(1, min(depth, MAX_PLY) + 1):
+            try:
+                score, best = self._root(
+                    state, packed, iteration, packMove(result.move)
+                )
+            except _Abort:
+                break
+            move = unpackMove(best)
+            result = SearchResult(
+                move,
+                score,
+                iteration,
+                self.nodes,
+                time.perf_counter() - start,
+                self._principalVariation(state, move, iteration),
+            )
+            if onIteration is not None:
+                onIteration(result)
+            if abs(score) > MATE_BOUND and MATE_SCORE - abs(score) <= iteration:
+                break  # a forced mate was found within the full-width horizon
+        return result._replace(nodes=self.nodes, seconds=time.perf_counter() - start)
+
+    def _tick(self) -> None:
+        self.nodes += 1
+        if self.nodes % self.CHECK_EVERY == 0 and (
+            self.stopped
+            or time.perf_counter() >= self.__deadline
+            or self.__maxnodes and self.nodes >= self.__maxnodes
+        ):
+            raise _Abort
+
+    def _root(
+        self, state: GameState, moves: list[int], depth: int, previous: int
+    ) -> tuple[int, int]:
+        alpha = -INFINITY
+        best = moves[0]
+        for move in self._orderMoves(state, moves, previous, 0):
+            state.push(unpackMove(move))
+            try:
+                score = -self._negamax(state, depth - 1, -INFINITY, -alpha, 1)
+            finally:
+                state.pop()
+            if score > alpha:
+                alpha = score
+                best = move
+        self.table.store(
+            state.zobrist, depth, EXACT, _toTable(alpha, 0), unpackMove(best)
+        )
+        return alpha, best
+
+    def _negamax(
+        self, state: GameState, depth: int, alpha: int, beta: int, ply: int
+    ) -> int:
+        self._tick()
+        board = state.board
+        in_check = board.inCheck(state.turn)
+        if in_check:
+            depth += 1
+        if depth <= 0 or ply >= MAX_PLY:
+            return self._quiesce(state, alpha, beta, ply)
+
+        key = state.zobrist
+        entry = self.table.probe(key)
+        table_move = 0
+        if entry is not None:
+            table_move = packMove(entry.move)
+            if entry.depth >= depth:
+                score = _fromTable(entry.score, ply)
+                if (
+                    entry.bound == EXACT
+                    or entry.bound == LOWER and score >= beta
+                    or entry.bound == UPPER and score <= alpha
+                ):
+                    return score
+
+        moves = self.__buffers[ply]
+        if not generateLegalMovesInto(state, moves):
+            return -MATE_SCORE + ply if in_check else 0
+
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_move = 0
+        enpassant = state.enpassant
+        for move in self._orderMoves(state, moves, table_move, ply):
+            quiet = not move >> 12 and not _isPackedCapture(board, move, enpassant)
+            state.push(unpackMove(move))
+            try:
+                score = -self._negamax(state, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                state.pop()
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        if quiet:
+                            killers = self.__killers[ply]
+                            if killers[0] != move:
+                                killers[1] = killers[0]
+                                killers[0] = move
+                        break
+
+        if best_score <= original_alpha:
+            bound = UPPER
+        elif best_score >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.table.store(
+            key, depth, bound, _toTable(best_score, ply), unpackMove(best_move)
+        )
+        return best_score
+
+    def _quiesce(self, state: GameState, alpha: int, beta: int, ply: int) -> int:
+        self._tick()
+        stand_pat = evaluate(state)
+        if stand_pat >= beta or ply >= MAX_PLY:
+            return stand_pat
+        if stand_pat > alpha:
+            alpha = stand_pat
+        board = state.board
+        enpassant = state.enpassant
+        moves = self.__buffers[ply]
+        generateLegalMovesInto(state, moves)
+        captures = [
+            move
+            for move in moves
+            if move >> 12 or _isPackedCapture(board, move, enpassant)
+        ]
+        for move in self._orderMoves(state, captures, 0, ply):
+            state.push(unpackMove(move))
+            try:
+                score = -self._quiesce(state, -beta, -alpha, ply + 1)
+            finally:
+                state.pop()
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+        return alpha
+
+    def _orderMoves(
+        self, state: GameState, moves: Iterable[int], first: int, ply: int
+    ) -> list[int]:
+        """Sorts packed `moves`, best first; `first` is the table move, or 0."""
+        board = state.board
+        enpassant = state.enpassant
+        killers = self.__killers[ply] if self.__killers else (0, 0)
+
+        def priority(move: int) -> int:
+            if move == first:
+                return 1_000_000
+            if _isPackedCapture(board, move, enpassant):
+                victim = board.codeAt(move >> 6 & 63)
+                attacker = board.codeAt(move & 63)
+                victim_value = _CODE_VALUES[victim] if victim else 100
+                return 100_000 + 10 * victim_value - _CODE_VALUES[attacker]
+            if move >> 12:
+                return 90_000 + _PROMOTION_VALUES[move >> 12]
+            if move == killers[0]:
+                return 80_000
+            if move == killers[1]:
+                return 70_000
+            return 0
+
+        return sorted(moves, key=priority, reverse=True)
+
+    def _principalVariation(
+        self, state: GameState, move: Move, depth: int
+    ) -> list[Move]:
+        pv = []
+        seen = set()
+        while move is not None and len(pv) < depth and move in state.legalMoves():
+            pv.append(move)
+            state.push(move)
+            if state.zobrist in seen:
+                break
+            seen.add(state.zobrist)
+            entry = self.table.probe(state.zobrist)
+            move = entry.move if entry is not None else None
+        for _ in pv:
+            state.pop()
+        return pv
+
+
+def search(
+    state: GameState,
+    depth: int = MAX_PLY,
+    movetime: float | None = None,
+    nodes: int | None = None,
+    table: TranspositionTable | None = None,
+    prober: Prober | None = None,
+) -> SearchResult:
+    """Convenience wrapper running a fresh `Searcher` once. Allocating its table
+    counts against `movetime`.
+    """
+    start = time.perf_counter()
+    searcher = Searcher(table, prober)
+    if movetime is not None:
+        movetime = max(0.0, movetime - (time.perf_counter() - start))
+    return searcher.search(state, depth, movetime, nodes)
@@ -0,0 +1,204 @@
+import asyncio
+import json
+from array import array
+from typing import Any, NamedTuple
+
+from pyChess import (
+    GameState,
+    Instrumentation,
+    Move,
+    moveFromUCI,
+    moveToUCI,
+    packMove,
+    setup,
+)
+from pyChess.Cache import LRUCache
+
+DEFAULT_PORT = 8765
+
+
+class PositionInfo(NamedTuple):
+    legal: dict[str, Move]  # legal moves by UCI string
+    check: bool
+
+
+class _Game:
+    """A hosted game: its current position in the 38-byte `GameState.to_bytes`
+    encoding and its Zobrist `key`, the moves played, packed with `packMove`, and
+    the key of the position before each of them for repetition checks.
+    """
+
+    __slots__ = ("position", "key", "moves", "keys")
+
+    def __init__(self, state: GameState) -> None:
+        self.position = state.to_bytes()
+        self.key = state.zobrist
+        self.moves = array("H")
+        self.keys = array("Q")
+
+
+class GameServer:
+    """Hosts many games at once behind a JSON-lines protocol.
+
+    Each request is one JSON object with an ``"op"`` and its arguments, answered by
+    one JSON object with ``"ok"`` and the result (or ``"error"``); an ``"id"`` in the
+    request is echoed back. Operations:
+
+    * ``new`` (optional ``fen``): starts a game, returns its ``game`` id
+    * ``move`` (``game``, ``move`` in UCI): plays a move if it is legal
+    * ``legal`` (``game``): lists the legal moves
+    * ``status`` (``game``): FEN, side to move, check, and the PGN result and
+      termination once the game is over (see `GameState.outcome`)
+    * ``close`` (``game``): forgets a game
+    * ``stats``: number of games and cache counters, and the counters of
+      `pyChess.Instrumentation` when it is enabled
+
+    Games are kept as bytes, and legal moves are computed once per distinct position
+    and shared by every game through an LRU cache keyed by the Zobrist key, so the
+    move counters don't split a position into several entries.
+    """
+
+    def __init__(self, cachesize: int = 65536) -> None:
+        self.games: dict[int, _Game] = {}
+        self.cache = LRUCache(cachesize)
+        self.__next_id = 1
+        self.__handlers = {
+            "new": self._new,
+            "move": self._move,
+            "legal": self._legal,
+            "status": self._status,
+            "close": self._close,
+            "stats": self._stats,
+        }
+
+    def positionInfo(self, game: _Game) -> PositionInfo:
+        info = self.cache.get(game.key)
+        if info is None:
+            state = GameState.from_bytes(game.position)
+            legal = {moveToUCI(move): move for move in state.legalMoves()}
+            info = PositionInfo(legal, state.board.inCheck(state.turn))
+            self.cache.put(game.key, info)
+        return info
+
+    def handle(self, request: Any) -> dict:
+        """Answers one decoded request."""
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "Request must be a JSON object."}
+        try:
+            handler = self.__handlers.get(request.get("op"))
+            if handler is None:
+                raise ValueError(f"Unknown op: {request.get('op')!r}.")
+            response = {"ok": True, **handler(request)}
+        except (KeyError, TypeError, AttributeError) as err:
+            response = {"ok": False, "error": f"Bad request: {err}"}
+        except (SyntaxError, ValueError, LookupError) as err:
+            response = {"ok": False, "error": str(err)}
+        if "id" in request:
+            response["id"] = request["id"]
+        return response
+
+    def _game(self, request: dict) -> _Game:
+        game_id = request["game"]
+        if not isinstance(game_id, int):
+            raise TypeError(f"game must be an int, found {type(game_id).__name__}.")
+        game = self.games.get(game_id)
+        if game is None:
+            raise LookupError(f"No game {request['game']}.")
+        return game
+
+    def _status(self, request: dict) -> dict:
+        game = self._game(request)
+        state = GameState.from_bytes(game.position)
+        outcome = state.outcome(keys=game.keys)
+        return {
+            "fen": state.to_fen(),
+            "turn": state.turn.name,
+            "check": self.positionInfo(game).check,
+            "result": outcome.result if outcome else "*",
+            "termination": outcome.termination.name if outcome else None,
+            "plies": len(game.moves),
+        }
+
+    def _new(self, request: dict) -> dict:
+        fen = request.get("fen")
+        if fen is not None and not isinstance(fen, str):
+            raise TypeError(f"fen must be a string, found {type(fen).__name__}.")
+        state = GameState.fromFEN(fen) if fen else setup()
+        game_id = self.__next_id
+        self.__next_id += 1
+        self.games[game_id] = _Game(state)
+        return {"game": game_id, **self._status({"game": game_id})}
+
+    def _move(self, request: dict) -> dict:
+        game = self._game(request)
+        uci = request["move"]
+        if not isinstance(uci, str):
+            raise TypeError(f"move must be a string, found {type(uci).__name__}.")
+        move = self.positionInfo(game).legal.get(uci)
+        if move is None:
+            moveFromUCI(uci)  # raises for malformed moves
+            raise ValueError(f"Illegal move: '{uci}'.")
+        state = GameState.from_bytes(game.position)
+        game.keys.append(state.zobrist)
+        state.push(move)
+        game.position = state.to_bytes()
+        game.key = state.zobrist
+        game.moves.append(packMove(move))
+        return self._status(request)
+
+    def _legal(self, request: dict) -> dict:
+        return {"moves": sorted(self.positionInfo(self._game(request)).legal)}
+
+    def _close(self, request: dict) -> dict:
+        self._game(request)
+        del self.games[request["game"]]
+        return {}
+
+    def _stats(self, request: dict) -> dict:
+        stats = {
+            "games": len(self.games),
+            "cached": len(self.cache),
+            "hits": self.cache.hits,
+            "misses": self.cache.misses,
+        }
+        if Instrumentation.enabled():
+            stats["profile"] = Instrumentation.snapshot()
+        return stats
+
+    async def serveClient(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answers the JSON-lines requests of one connection until it closes."""
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                try:
+                    response = self.handle(json.loads(line))
+                except json.JSONDecodeError as err:
+                    response = {"ok": False, "error": f"Invalid JSON: {err}"}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(
+        self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, path: str | None = None
+    ) -> asyncio.AbstractServer:
+        """Starts listening on a Unix socket at `path`, or on TCP `host`:`port`."""
+        if path is not None:
+            return await asyncio.start_unix_server(self.serveClient, path)
+        return await asyncio.start_server(self.serveClient, host, port)
+
+
+async def serve(
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    path: str | None = None,
+    cachesize: int = 65536,
+) -> None:
+    server = await GameServer(cachesize).start(host, port, path)
+    async with server:
+        await server.serve_forever()
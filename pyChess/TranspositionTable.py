@@ -0,0 +1,108 @@
+from array import array
+from typing import NamedTuple
+
+from pyChess import Move
+from pyChess.Logic import packMove, unpackMove
+
+# Bound types. An empty slot has bound 0.
+EXACT = 1
+LOWER = 2  # score is a lower bound (fail high)
+UPPER = 3  # score is an upper bound (fail low)
+
+# Each slot is a 64-bit key, a signed 64-bit score and a 32-bit word packing
+# depth (8 bits), bound (2 bits), best move (16 bits) and search generation (6 bits).
+ENTRY_BYTES = 8 + 8 + 4
+SLOTS_PER_BUCKET = 2
+
+
+class TTEntry(NamedTuple):
+    depth: int
+    bound: int
+    score: int
+    move: Move | None
+
+
+class TranspositionTable:
+    """Fixed-size hash table of search results keyed by `GameState.zobrist`.
+
+    The table is preallocated as flat arrays sized from `megabytes`. Each bucket
+    holds two slots: the first keeps the deepest result seen for the bucket (it is
+    only overwritten by an equal or deeper search, or by a result from a newer
+    search), the second is always replaced.
+    """
+
+    def __init__(self, megabytes: float = 16) -> None:
+        bucket_bytes = ENTRY_BYTES * SLOTS_PER_BUCKET
+        self.buckets = max(1, int(megabytes * 2**20) // bucket_bytes)
+        slots = self.buckets * SLOTS_PER_BUCKET
+        self.__keys = array("Q", bytes(8 * slots))
+        self.__scores = array("q", bytes(8 * slots))
+        self.__data = array("I", bytes(4 * slots))
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.__keys) * ENTRY_BYTES
+
+    def clear(self) -> None:
+        slots = self.buckets * SLOTS_PER_BUCKET
+        self.__keys = array("Q", bytes(8 * slots))
+        self.__scores = array("q", bytes(8 * slots))
+        self.__data = array("I", bytes(4 * slots))
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+
+    def newSearch(self) -> None:
+        """Ages every stored entry so deep results from earlier searches can be
+        replaced in the depth-preferred slots.
+        """
+        self.generation = (self.generation + 1) & 63
+
+    def probe(self, key: int) -> TTEntry | None:
+        self.probes += 1
+        slot = key % self.buckets * SLOTS_PER_BUCKET
+        keys = self.__keys
+        if keys[slot] != key or not self.__data[slot] >> 8 & 3:
+            slot += 1
+            if keys[slot] != key or not self.__data[slot] >> 8 & 3:
+                return None
+        self.hits += 1
+        data = self.__data[slot]
+        return TTEntry(
+            data & 255,
+            data >> 8 & 3,
+            self.__scores[slot],
+            unpackMove(data >> 10 & 0xFFFF),
+        )
+
+    def store(
+        self, key: int, depth: int, bound: int, score: int, move: Move | None = None
+    ) -> None:
+        slot = key % self.buckets * SLOTS_PER_BUCKET
+        data = self.__data[slot]
+        if (
+            self.__keys[slot] != key
+            and data >> 8 & 3
+            and depth < data & 255
+            and data >> 26 == self.generation
+        ):
+            slot += 1
+        elif self.__keys[slot] != key and data >> 8 & 3:
+            # the entry being pushed out of the deep slot is still worth keeping
+            self.__keys[slot + 1] = self.__keys[slot]
+            self.__scores[slot + 1] = self.__scores[slot]
+            self.__data[slot + 1] = data
+        self.__keys[slot] = key
+        self.__scores[slot] = score
+        self.__data[slot] = (
+            min(depth, 255) | bound << 8 | packMove(move) << 10 | self.generation << 26
+        )
+
+    def hashfull(self) -> int:
+        """Permille of the first 1000 slots in use, as reported by UCI engines."""
+        sample = min(1000, len(self.__data))
+        used = sum(1 for data in self.__data[:sample] if data >> 8 & 3)
+        return used * 1000 // sample
@@ -0,0 +1,285 @@
+import asyncio
+import io
+import os
+import stat
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, AsyncIterator
+
+from pyChess import STARTING_FEN, GameState, moveToUCI, setup, validate_game
+from pyChess.Probe import OpeningBook, Prober
+from pyChess.Search import MATE_BOUND, MATE_SCORE, MAX_PLY, Searcher, SearchResult
+from pyChess.TranspositionTable import TranspositionTable
+
+ENGINE_NAME = "pyChess"
+DEFAULT_HASH = 16  # megabytes
+MAX_HASH = 1024
+# `go` arguments that take a number
+_GO_VALUES = {
+    "depth",
+    "movetime",
+    "nodes",
+    "movestogo",
+    "wtime",
+    "btime",
+    "winc",
+    "binc",
+}
+
+
+def formatScore(score: int) -> str:
+    """UCI score: centipawns, or moves to mate (negative if being mated)."""
+    if abs(score) > MATE_BOUND:
+        moves = (MATE_SCORE - abs(score) + 1) // 2
+        return f"mate {moves if score > 0 else -moves}"
+    return f"cp {score}"
+
+
+def formatInfo(result: SearchResult) -> str:
+    nps = int(result.nodes / result.seconds) if result.seconds else 0
+    line = (
+        f"info depth {result.depth} score {formatScore(result.score)}"
+        f" nodes {result.nodes} nps {nps} time {int(result.seconds * 1000)}"
+    )
+    if result.pv:
+        line += " pv " + " ".join(moveToUCI(move) for move in result.pv)
+    return line
+
+
+def searchLimits(tokens: list[str], state: GameState) -> dict:
+    """Turns the arguments of a `go` command into `Searcher.search` keywords."""
+    args: dict[str, int] = {}
+    i = 0
+    while i < len(tokens):
+        name = tokens[i]
+        if name in _GO_VALUES:
+            if i + 1 < len(tokens) and tokens[i + 1].lstrip("-").isdigit():
+                args[name] = int(tokens[i + 1])
+                i += 1
+        elif name == "infinite":
+            args[name] = 1
+        i += 1
+
+    limits = {"depth": min(args.get("depth", MAX_PLY), MAX_PLY)}
+    if "nodes" in args:
+        limits["nodes"] = args["nodes"]
+    if "movetime" in args:
+        limits["movetime"] = args["movetime"] / 1000
+    elif "infinite" not in args:
+        white = state.turn < 0
+        remaining = args.get("wtime" if white else "btime")
+        if remaining is not None:
+            increment = args.get("winc" if white else "binc", 0)
+            budget = remaining / args.get("movestogo", 30) + increment * 3 / 4
+            limits["movetime"] = max(0.01, min(budget, remaining / 2) / 1000)
+    return limits
+
+
+def _isPipe(stream: IO[str]) -> bool:
+    """Whether asyncio can watch `stream` directly: a pipe, socket or terminal."""
+    try:
+        mode = os.fstat(stream.fileno()).st_mode
+    except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+        return False
+    return stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode) or stat.S_ISCHR(mode)
+
+
+class UCIEngine:
+    """Universal Chess Interface engine loop.
+
+    Commands are read with asyncio while searches run in a worker thread, so `stop`,
+    `isready` and `quit` are answered while a search is in progress. Commands that
+    change the engine's state, ``ucinewgame`` and ``setoption``, are deferred until
+    the running search ends, and so is everything after them, to keep their order.
+    An infinite search holds its ``bestmove`` until ``stop``, as the protocol asks.
+    """
+
+    def __init__(
+        self, input: IO[str] = sys.stdin, output: IO[str] = sys.stdout
+    ) -> None:
+        self.input = input
+        self.output = output
+        self.state = setup()
+        self.table = TranspositionTable(DEFAULT_HASH)
+        self.prober: Prober | None = None
+        self.searcher = Searcher(self.table)
+        self.__pool = ThreadPoolExecutor(max_workers=1)
+        self.__search: asyncio.Future | None = None
+        self.__infinite = False
+        self.__stopped = asyncio.Event()
+        self.__deferred: list[str] = []
+
+    def send(self, line: str) -> None:
+        self.output.write(line + "\n")
+        self.output.flush()
+
+    async def run(self) -> None:
+        """Handles commands until `quit` or the end of the input."""
+        try:
+            async for line in self._lines():
+                if not await self.handle(line):
+                    return
+            # let the searches of the last lines finish, unless they never would
+            while self.__search is not None:
+                if self.__infinite:
+                    await self._stopSearch()
+                await self._waitForSearch()
+        finally:
+            self.__pool.shutdown(wait=True)
+
+    async def _lines(self) -> AsyncIterator[str]:
+        loop = asyncio.get_running_loop()
+        reader = None
+        if _isPipe(self.input):
+            reader = asyncio.StreamReader()
+            protocol = asyncio.StreamReaderProtocol(reader)
+            await loop.connect_read_pipe(lambda: protocol, self.input)
+        # anything else, such as a regular file or a StringIO, is read in a thread
+        while True:
+            if reader is not None:
+                line = (await reader.readline()).decode()
+            else:
+                line = await loop.run_in_executor(None, self.input.readline)
+            if not line:
+                return
+            yield line
+
+    async def handle(self, line: str) -> bool:
+        """Executes one command line. Returns `False` once the engine should exit."""
+        tokens = line.split()
+        if not tokens:
+            return True
+        command = tokens[0]
+        if command in ("ucinewgame", "setoption", "position", "go") and (
+            self.__deferred or command in ("ucinewgame", "setoption") and self._busy()
+        ):
+            self.__deferred.append(line)
+            return True
+        return await self._execute(command, tokens[1:])
+
+    async def _execute(self, command: str, args: list[str]) -> bool:
+        if command == "uci":
+            self.send(f"id name {ENGINE_NAME}")
+            self.send("id author pyChess authors")
+            self.send(
+                "option name Hash type spin"
+                f" default {DEFAULT_HASH} min 1 max {MAX_HASH}"
+            )
+            self.send("option name BookFile type string default <empty>")
+            self.send("uciok")
+        elif command == "isready":
+            self.send("readyok")
+        elif command == "ucinewgame":
+            self.table.clear()
+            self.state = setup()
+        elif command == "setoption":
+            self._setOption(args)
+        elif command == "position":
+            self._position(args)
+        elif command == "go":
+            if self._busy():
+                self.send("info string already searching")
+            else:
+                self.__infinite = "infinite" in args
+                self.__stopped.clear()
+                self.__search = asyncio.ensure_future(self._go(args))
+        elif command == "stop":
+            await self._stopSearch()
+            await self._waitForSearch()
+        elif command == "quit":
+            self.__deferred.clear()
+            while self.__search is not None:
+                await self._stopSearch()
+                await self._waitForSearch()
+            return False
+        else:
+            self.send(f"info string unknown command: {command}")
+        return True
+
+    def _busy(self) -> bool:
+        return self.__search is not None and not self.__search.done()
+
+    async def _stopSearch(self) -> None:
+        """Stops the running search and releases its ``bestmove``."""
+        self.__stopped.set()
+        search = self.__search
+        # a search that hasn't started yet would clear the request, so repeat it
+        while search is not None and not search.done():
+            self.searcher.stop()
+            await asyncio.wait([search], timeout=0.01)
+
+    async def _waitForSearch(self) -> None:
+        """Waits for the running search, and the deferred commands it ran."""
+        search = self.__search
+        if search is not None:
+            await search
+            if self.__search is search:
+                self.__search = None
+
+    async def _runDeferred(self) -> None:
+        while self.__deferred and not self._busy():
+            tokens = self.__deferred.pop(0).split()
+            await self._execute(tokens[0], tokens[1:])
+
+    def _setOption(self, args: list[str]) -> None:
+        if "name" not in args:
+            return
+        value_at = args.index("value") if "value" in args else len(args)
+        name = " ".join(args[args.index("name") + 1 : value_at]).lower()
+        value = " ".join(args[value_at + 1 :])
+        if name == "hash" and value.isdigit():
+            self.table = TranspositionTable(max(1, min(int(value), MAX_HASH)))
+            self.searcher = Searcher(self.table, self.prober)
+        elif name == "bookfile":
+            if value in ("", "<empty>"):
+                self.prober = None
+            else:
+                try:
+                    self.prober = Prober(OpeningBook(value))
+                except (OSError, ValueError) as err:
+                    self.send(f"info string can't open book: {err}")
+                    self.prober = None
+            self.searcher = Searcher(self.table, self.prober)
+        else:
+            self.send(f"info string unknown option: {name}")
+
+    def _position(self, args: list[str]) -> None:
+        moves_at = args.index("moves") if "moves" in args else len(args)
+        moves = args[moves_at + 1 :]
+        try:
+            if args[:1] == ["startpos"]:
+                replay = validate_game(STARTING_FEN, moves)
+            elif args[:1] == ["fen"]:
+                replay = validate_game(" ".join(args[1:moves_at]), moves)
+            else:
+                raise ValueError("Expected 'startpos' or 'fen'.")
+        except (SyntaxError, ValueError, LookupError) as err:
+            self.send(f"info string invalid position: {err}")
+            return
+        if not replay.valid:
+            self.send(f"info string illegal move: {moves[replay.illegal]}")
+        self.state = replay.state
+
+    async def _go(self, args: list[str]) -> None:
+        loop = asyncio.get_running_loop()
+        # the search gets its own copy, so `position` can't change it mid-search
+        state = GameState.from_bytes(self.state.to_bytes())
+        limits = searchLimits(args, state)
+
+        def onIteration(result: SearchResult) -> None:
+            loop.call_soon_threadsafe(self.send, formatInfo(result))
+
+        def run() -> SearchResult:
+            return self.searcher.search(state, onIteration=onIteration, **limits)
+
+        result = await loop.run_in_executor(self.__pool, run)
+        if self.__infinite:
+            await self.__stopped.wait()
+        self.send(f"bestmove {moveToUCI(result.move) if result.move else '0000'}")
+        self.__search = None  # this search is over, so deferred commands may run
+        await self._runDeferred()
+
+
+def main(input: IO[str] = sys.stdin, output: IO[str] = sys.stdout) -> int:
+    asyncio.run(UCIEngine(input, output).run())
+    return 0
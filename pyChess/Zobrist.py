@@ -0,0 +1,20 @@
+import random
+
+# The keys are drawn from a fixed seed so that hashes are stable between runs and
+# processes, and can be stored alongside positions.
+_rng = random.Random(0x9E3779B97F4A7C15)
+
+# PIECE_KEYS[piece index][square], with the piece index from `Board.PIECE_INDEX`.
+PIECE_KEYS: list[list[int]] = [
+    [_rng.getrandbits(64) for _ in range(64)] for _ in range(12)
+]
+BLACK_TO_MOVE_KEY: int = _rng.getrandbits(64)
+_castle_bits = [_rng.getrandbits(64) for _ in range(4)]
+# CASTLE_KEYS[castleavail] for each of the 16 combinations of castling rights.
+CASTLE_KEYS: list[int] = [0] * 16
+for _rights in range(16):
+    for _bit, _key in enumerate(_castle_bits):
+        if _rights >> _bit & 1:
+            CASTLE_KEYS[_rights] ^= _key
+# ENPASSANT_KEYS[col] for the file of the en passant target.
+ENPASSANT_KEYS: list[int] = [_rng.getrandbits(64) for _ in range(8)]
@@ -1,8 +1,33 @@
 from .Piece import Piece, Color, Rank
 from .Board import Board
 from .Logic import (
+    STARTING_FEN,
+    GameState,
+    GameValidation,
+    Move,
+    Outcome,
+    Termination,
+    LegalityMasks,
+    generateLegalMoves,
+    generatePseudoLegalMoves,
+    moveFromUCI,
+    moveToUCI,
+    packMove,
+    unpackMove,
     isaMove,
+    legalityMasks,
     makeMove,
     getLegalMoves,
     setup,
+    parse_many,
+    dump_many,
+    pack_many,
+    unpack_many,
+    iter_game,
+    validate_game,
 )
+
+import os as _os
+
+if _os.environ.get("PYCHESS_PROFILE", "") not in ("", "0"):
+    from . import Instrumentation  # installs its wrappers when imported
@@ -0,0 +1,5 @@
+import sys
+
+from pyChess.main import main
+
+sys.exit(main())
@@ -1,9 +1,185 @@
-from .Piece import Piece, Rank, Color
+import argparse
+import asyncio
+import sys
+import time
 
+from pyChess import Instrumentation, UCI, Server, STARTING_FEN, GameState, setup
+from pyChess.Analysis import analyzePositions
+from pyChess.PGN import validateGames
+from pyChess.Perft import divide, parallelDivide, perft, runSuite
+from pyChess.TranspositionTable import TranspositionTable
 
-def main():
-    pass
+
+def _depth(text: str) -> int:
+    depth = int(text)
+    if depth < 0:
+        raise argparse.ArgumentTypeError(f"depth must not be negative, found {depth}")
+    return depth
+
+
+def runPerft(args: argparse.Namespace) -> int:
+    state = GameState.fromFEN(args.fen) if args.fen else setup()
+    table = TranspositionTable(args.hash) if args.hash else None
+    start = time.perf_counter()
+    if args.workers != 1 and args.depth > 1:
+        counts = parallelDivide(
+            args.fen or STARTING_FEN, args.depth, args.workers or None, args.hash
+        )
+    elif args.divide and args.depth > 0:
+        counts = divide(state, args.depth, table)
+    else:
+        counts = {"": perft(state, args.depth, table)}
+    if args.divide and args.depth > 0:
+        for uci in sorted(counts):
+            print(f"{uci}: {counts[uci]}")
+    nodes = sum(counts.values())
+    seconds = time.perf_counter() - start
+    print(f"nodes {nodes}")
+    print(f"time {seconds:.3f}s")
+    print(f"nps {nodes / seconds if seconds else 0:.0f}")
+    return 0
+
+
+def runBench(args: argparse.Namespace) -> int:
+    failed = 0
+    total_nodes = 0
+    total_seconds = 0.0
+    print(f"{'position':<12}{'depth':>6}{'nodes':>12}{'nps':>10}  result")
+    for result in runSuite(args.depth):
+        total_nodes += result.nodes
+        total_seconds += result.seconds
+        status = "ok" if result.passed else f"FAIL (expected {result.expected})"
+        failed += not result.passed
+        print(
+            f"{result.name:<12}{result.depth:>6}{result.nodes:>12}"
+            f"{result.nps:>10.0f}  {status}"
+        )
+    print(f"total nodes {total_nodes}, nps {total_nodes / total_seconds:.0f}")
+    return 1 if failed else 0
+
+
+def runAnalyze(args: argparse.Namespace) -> int:
+    infile = sys.stdin if args.file == "-" else open(args.file)
+    invalid = 0
+    with infile:
+        fens = (line.strip() for line in infile if line.strip())
+        for report in analyzePositions(fens, args.workers or None):
+            if report.error:
+                print(f"{report.fen}\terror: {report.error}")
+            elif report.opponent_in_check:
+                print(f"{report.fen}\terror: side not to move is in check")
+            else:
+                print(
+                    f"{report.fen}\tcheck: {int(report.in_check)}"
+                    f"\tmoves: {report.legal_moves}"
+                )
+            invalid += not report.valid
+    return 1 if invalid else 0
+
+
+def runPGN(args: argparse.Namespace) -> int:
+    games = invalid = 0
+    for report in validateGames(args.file):
+        games += 1
+        if not report.valid:
+            invalid += 1
+            print(f"game {report.number}, ply {report.ply}: {report.error}")
+    print(f"{games} games, {invalid} with illegal moves")
+    return 1 if invalid else 0
+
+
+def runUCI(args: argparse.Namespace) -> int:
+    return UCI.main()
+
+
+def runServe(args: argparse.Namespace) -> int:
+    where = args.unix or f"{args.host}:{args.port}"
+    print(f"serving on {where}", flush=True)
+    try:
+        asyncio.run(Server.serve(args.host, args.port, args.unix, args.cache))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="pyChess")
+    parser.add_argument(
+        "--profile",
+        metavar="FILE",
+        help="count calls and time on the hot paths and write them to FILE"
+        " (Prometheus text for .prom, JSON otherwise)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    perft_parser = commands.add_parser("perft", help="count leaf nodes to a depth")
+    perft_parser.add_argument("depth", type=_depth)
+    perft_parser.add_argument(
+        "--fen", default="", help="start position (default: startpos)"
+    )
+    perft_parser.add_argument(
+        "--divide", action="store_true", help="print the count below each root move"
+    )
+    perft_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="split the root moves over this many processes (0: one per CPU)",
+    )
+    perft_parser.add_argument(
+        "--hash",
+        type=float,
+        default=0,
+        help="transposition table size in MB for caching subtree counts (0: off)",
+    )
+    perft_parser.set_defaults(func=runPerft)
+
+    analyze_parser = commands.add_parser(
+        "analyze", help="check a file of FEN positions, one per line"
+    )
+    analyze_parser.add_argument("file", help="FEN file, or - for stdin")
+    analyze_parser.add_argument(
+        "--workers", type=int, default=0, help="processes to use (0: one per CPU)"
+    )
+    analyze_parser.set_defaults(func=runAnalyze)
+
+    bench_parser = commands.add_parser(
+        "bench", help="run perft on the standard positions and check the counts"
+    )
+    bench_parser.add_argument("--depth", type=int, default=3)
+    bench_parser.set_defaults(func=runBench)
+
+    pgn_parser = commands.add_parser(
+        "pgn", help="check every move of a PGN archive (.pgn, .pgn.gz, .pgn.bz2)"
+    )
+    pgn_parser.add_argument("file")
+    pgn_parser.set_defaults(func=runPGN)
+
+    uci_parser = commands.add_parser(
+        "uci", help="run as a UCI engine on standard input and output"
+    )
+    uci_parser.set_defaults(func=runUCI)
+
+    serve_parser = commands.add_parser(
+        "serve", help="host games over a JSON-lines socket protocol"
+    )
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=Server.DEFAULT_PORT)
+    serve_parser.add_argument("--unix", help="listen on this Unix socket instead")
+    serve_parser.add_argument(
+        "--cache", type=int, default=65536, help="positions in the shared cache"
+    )
+    serve_parser.set_defaults(func=runServe)
+
+    args = parser.parse_args(argv)
+    if not args.profile:
+        return args.func(args)
+    Instrumentation.enable()
+    try:
+        return args.func(args)
+    finally:
+        Instrumentation.write(args.profile)
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,59 @@
+import unittest
+
+from pyChess import Color, GameState
+from pyChess.Batch import encodeStates, inCheck, isAttacked, isLegal, np
+from pyChess.Perft import PERFT_SUITE
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestBatch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.states = []
+        for position in PERFT_SUITE:
+            state = GameState.fromFEN(position.fen)
+            self.states.append(state)
+            for move in list(state.legalMoves()):
+                state.push(move)
+                self.states.append(GameState.fromFEN(state.to_fen()))
+                state.pop()
+        self.codes, self.colors, self.enpassant, self.castleavail = encodeStates(
+            self.states
+        )
+
+    def testInCheck(self):
+        expected = [state.board.inCheck(state.turn) for state in self.states]
+        self.assertEqual(inCheck(self.codes, self.colors).tolist(), expected)
+        self.assertTrue(any(expected))
+
+    def testIsAttacked(self):
+        for square in (0, 27, 36, 60):
+            expected = [
+                state.board.is_attacked(square, Color.black) for state in self.states
+            ]
+            result = isAttacked(self.codes, square, Color.black)
+            self.assertEqual(result.tolist(), expected)
+
+    def testIsLegalMatchesMoveGenerator(self):
+        legal = [
+            {(move.from_sq, move.to_sq) for move in state.legalMoves()}
+            for state in self.states
+        ]
+        args = (self.codes, self.colors)
+        for from_sq in range(64):
+            for to_sq in range(64):
+                result = isLegal(
+                    *args, from_sq, to_sq, self.enpassant, self.castleavail
+                ).tolist()
+                expected = [(from_sq, to_sq) in moves for moves in legal]
+                if result != expected:
+                    index = next(i for i, r in enumerate(result) if r != expected[i])
+                    self.fail(
+                        f"{self.states[index].to_fen()}: {from_sq}->{to_sq} gave"
+                        f" {result[index]}"
+                    )
+
+    def testMissingKing(self):
+        codes = self.codes.copy()
+        codes[3] = 0
+        with self.assertRaises(LookupError):
+            inCheck(codes, Color.white)
@@ -0,0 +1,141 @@
+import unittest
+import pyChess
+from pyChess import Rank, Color, Piece
+
+
+class TestBitboards(unittest.TestCase):
+    def setUp(self) -> None:
+        self.board = pyChess.Board(
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+        )
+
+    def testGetItem(self):
+        self.assertEqual(self.board[0, 4], Piece(Rank.king, Color.black))
+        self.assertEqual(self.board[7, 3], Piece(Rank.queen, Color.white))
+        self.assertIsNone(self.board[4, 4])
+
+    def testOccupancy(self):
+        self.assertEqual(self.board.occupancy(Color.black), 0xFFFF)
+        self.assertEqual(self.board.occupancy(Color.white), 0xFFFF << 48)
+        self.assertEqual(self.board.occupancy(), 0xFFFF | 0xFFFF << 48)
+
+    def testPieceBitboards(self):
+        self.assertEqual(self.board.bitboard(Rank.pawn, Color.white), 0xFF << 48)
+        self.assertEqual(self.board.bitboard(Rank.knight, Color.black), 1 << 1 | 1 << 6)
+
+    def testPlaceRemove(self):
+        self.board.place(Piece(Rank.pawn, Color.white), 4, 4)
+        self.board.remove(6, 4)
+        self.assertEqual(self.board[4, 4], Piece(Rank.pawn, Color.white))
+        self.assertIsNone(self.board[6, 4])
+        self.assertEqual(
+            self.board.bitboard(Rank.pawn, Color.white),
+            (0xFF << 48) ^ (1 << 52) | 1 << 36,
+        )
+        # capturing replaces the piece in both the square list and its bitboard
+        self.board.place(Piece(Rank.queen, Color.white), 1, 4)
+        self.assertEqual(self.board.bitboard(Rank.pawn, Color.black), 0xFF00 ^ 1 << 12)
+        self.assertFalse(self.board.occupancy(Color.black) & 1 << 12)
+
+    def testPieceCodes(self):
+        from pyChess.Board import BLACK, CODE_PIECE, EMPTY, KING, PAWN, QUEEN
+
+        self.assertEqual(self.board.codeAt(4), BLACK | KING)
+        self.assertEqual(self.board.codeAt(59), QUEEN)
+        self.assertEqual(self.board.codeAt(36), EMPTY)
+        self.assertIs(self.board.pieceAt(4), CODE_PIECE[BLACK | KING])
+        self.assertEqual(self.board.take(52), PAWN)
+        self.board.put(36, PAWN)
+        self.assertEqual(self.board[4, 4], Piece(Rank.pawn, Color.white))
+        self.assertEqual(self.board.zobrist, pyChess.Board(self.board.toFEN()).zobrist)
+
+    def testFindKing(self):
+        self.assertEqual(self.board.findKing(Color.white), (7, 4))
+        self.assertEqual(self.board.findKing(Color.black), (0, 4))
+        self.board.remove(0, 4)
+        self.assertRaises(LookupError, self.board.findKing, Color.black)
+
+    def testKingSquareFollowsMoves(self):
+        self.assertEqual(self.board.kingSquare(Color.white), 60)
+        king = self.board.take(60)
+        self.assertRaises(LookupError, self.board.kingSquare, Color.white)
+        self.board.put(44, king)
+        self.assertEqual(self.board.kingSquare(Color.white), 44)
+        self.assertEqual(self.board.findKing(Color.white), (5, 4))
+        self.board.clear()
+        self.assertRaises(LookupError, self.board.kingSquare, Color.black)
+
+    def testPieceLists(self):
+        self.assertEqual(self.board.pieceSquares(Rank.knight, Color.white), [57, 62])
+        self.assertEqual(self.board.pieceCount(Rank.pawn, Color.black), 8)
+        self.board.remove(7, 1)
+        self.assertEqual(self.board.pieceSquares(Rank.knight, Color.white), [62])
+        self.assertEqual(self.board.pieceCount(Rank.queen, Color.white), 1)
+
+    def testReinitialize(self):
+        self.board.initializeFromFEN("4k3/8/8/8/8/8/8/4K3 w - - 0 1")
+        self.assertEqual(self.board.occupancy(), 1 << 4 | 1 << 60)
+
+
+class TestBoardInCheck(unittest.TestCase):
+    def testRook(self):
+        board = pyChess.Board("8/8/8/1R1k4/8/8/8/K7")
+        self.assertTrue(board.inCheck(Color.black))
+        self.assertFalse(board.inCheck(Color.white))
+
+    def testBlockedRook(self):
+        board = pyChess.Board("8/8/8/3k1K1R/8/8/8/8")
+        self.assertFalse(board.inCheck(Color.black))
+
+    def testPawn(self):
+        self.assertTrue(pyChess.Board("8/8/8/3k4/4P3/8/8/K7").inCheck(Color.black))
+        self.assertFalse(pyChess.Board("8/8/8/3k4/8/4P3/8/K7").inCheck(Color.black))
+        self.assertTrue(pyChess.Board("k7/8/8/8/8/3p4/4K3/8").inCheck(Color.white))
+        self.assertFalse(pyChess.Board("k7/8/8/8/8/4K3/3p4/8").inCheck(Color.white))
+
+    def testKnight(self):
+        self.assertTrue(pyChess.Board("8/8/8/3k4/8/4N3/8/K7").inCheck(Color.black))
+        self.assertFalse(pyChess.Board("8/8/8/3k4/8/3N4/8/K7").inCheck(Color.black))
+
+
+class TestAttacks(unittest.TestCase):
+    def testAttackersOf(self):
+        board = pyChess.Board("4k3/8/8/3p4/2N1Q3/8/8/1B2K3")
+        e5 = 28
+        self.assertEqual(board.attackers_of(e5, Color.white), 1 << 34 | 1 << 36)
+        self.assertEqual(board.attackers_of(35, Color.white), 1 << 36)
+        self.assertEqual(board.attackers_of(36, Color.black), 1 << 27)
+        self.assertTrue(board.is_attacked(e5, Color.white))
+        self.assertFalse(board.is_attacked(e5, Color.black))
+
+    def testSliderBlocked(self):
+        board = pyChess.Board("4k3/8/8/8/8/8/8/R1n1K3")
+        self.assertTrue(board.is_attacked(57, Color.white))
+        self.assertFalse(board.is_attacked(57, Color.black))
+        self.assertEqual(board.attackers_of(59, Color.white), 1 << 60)
+
+    def testMatchesScan(self):
+        from pyChess.Benchmark import POSITIONS, scanInCheck
+
+        for fen in POSITIONS.values():
+            board = pyChess.Board(fen)
+            for color in Color:
+                self.assertEqual(board.inCheck(color), scanInCheck(board, color))
+
+    def testIsaMoveCastling(self):
+        board = pyChess.Board("r3k2r/8/8/8/8/8/8/R3K2R")
+        self.assertTrue(pyChess.isaMove(board, Color.white, 7, 4, 7, 6, None, "KQkq"))
+        self.assertTrue(pyChess.isaMove(board, Color.black, 0, 4, 0, 2, None, 15))
+        self.assertFalse(pyChess.isaMove(board, Color.black, 0, 4, 0, 2, None, "KQk"))
+        board.place(Piece(Rank.rook, Color.black), 2, 5)
+        self.assertFalse(pyChess.isaMove(board, Color.white, 7, 4, 7, 6, None, 15))
+        self.assertTrue(pyChess.isaMove(board, Color.white, 7, 4, 7, 2, None, 15))
+
+    def testIsaMoveNextToKing(self):
+        board = pyChess.Board("8/8/8/3k4/8/3K4/8/8")
+        self.assertFalse(pyChess.isaMove(board, Color.white, 5, 3, 4, 3, None, 0))
+        self.assertTrue(pyChess.isaMove(board, Color.white, 5, 3, 6, 3, None, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+import pyChess
+from pyChess import GameState, Termination, setup
+from pyChess.Cache import MoveCache, SharedLRUCache
+
+_worker_cache: MoveCache | None = None
+
+
+def _initWorker(shared: SharedLRUCache) -> None:
+    global _worker_cache
+    _worker_cache = MoveCache(shared=shared)
+
+
+def _countMoves(fen: str) -> int:
+    return len(_worker_cache.legalMoves(GameState.fromFEN(fen)))
+
+
+class TestSharedLRUCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache = SharedLRUCache(maxsize=8, valuesize=16)
+        self.addCleanup(self.cache.__exit__, None, None, None)
+
+    def testGetPut(self):
+        self.assertIsNone(self.cache.get(1))
+        self.cache.put(1, b"one")
+        self.cache.put(1, b"uno")
+        self.assertEqual(self.cache.get(1), b"uno")
+        self.assertEqual(len(self.cache), 1)
+        stats = self.cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.maxsize), (1, 1, 8))
+        self.assertEqual(stats.hit_rate, 0.5)
+        self.assertRaises(ValueError, self.cache.put, 2, bytes(17))
+        self.cache.clear()
+        self.assertEqual((len(self.cache), self.cache.hits), (0, 0))
+
+    def testEviction(self):
+        # keys 0, 2, 4, ... share a bucket of 4 slots
+        for key in (0, 2, 4, 6):
+            self.cache.put(key, bytes([key]))
+        self.cache.get(0)
+        self.cache.put(8, b"new")  # 2 is now the least recently used
+        self.assertIsNone(self.cache.get(2))
+        self.assertEqual(self.cache.get(0), b"\x00")
+        self.assertEqual(self.cache.get(8), b"new")
+
+    def testAttach(self):
+        other = SharedLRUCache.attach(self.cache.name, self.cache.lock)
+        other.put(5, b"five")
+        self.assertEqual(self.cache.get(5), b"five")
+        self.assertEqual((other.maxsize, other.valuesize), (8, 16))
+        other.close()
+
+
+class TestMoveCache(unittest.TestCase):
+    def testRepeatQueries(self):
+        cache = MoveCache(maxsize=2)
+        state = setup()
+        self.assertEqual(cache.getLegalMoves(state), pyChess.getLegalMoves(state))
+        self.assertIs(cache.legalMoves(state), cache.legalMoves(setup()))
+        self.assertEqual((cache.stats().hits, cache.stats().misses), (2, 1))
+
+    def testOutcome(self):
+        cache = MoveCache()
+        mated = GameState.fromFEN(
+            "rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3"
+        )
+        for _ in range(2):
+            self.assertEqual(cache.outcome(mated), mated.outcome())
+        self.assertEqual(cache.outcome(mated).termination, Termination.checkmate)
+        bare = GameState.fromFEN("4k3/8/8/8/8/8/8/4K3 w - - 0 1")
+        termination = cache.outcome(bare).termination
+        self.assertEqual(termination, Termination.insufficient_material)
+        self.assertIsNone(cache.outcome(setup()))
+
+    def testShared(self):
+        with SharedLRUCache(64, MoveCache.ENTRY_BYTES) as shared:
+            cache = MoveCache(shared=shared)
+            kiwipete = GameState.fromFEN(
+                "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+            )
+            self.assertEqual(len(cache.legalMoves(kiwipete)), 48)
+            pool = ProcessPoolExecutor(2, initializer=_initWorker, initargs=(shared,))
+            with pool:
+                counts = list(pool.map(_countMoves, [kiwipete.to_fen()] * 4))
+            self.assertEqual(counts, [48] * 4)
+            self.assertEqual(shared.stats().hits, 4)
+            expected = set(kiwipete.legalMoves())
+            self.assertEqual(set(cache.legalMoves(kiwipete)), expected)
+
+    def testSharedValueSize(self):
+        with SharedLRUCache(4, 16) as shared:
+            self.assertRaises(ValueError, MoveCache, shared=shared)
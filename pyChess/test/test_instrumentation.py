@@ -0,0 +1,86 @@
+import json
+import os
+import tempfile
+import unittest
+
+import pyChess
+import pyChess.Perft
+from pyChess import Board, GameState, Instrumentation, Logic, setup
+from pyChess.Cache import LRUCache
+from pyChess.Search import Searcher
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self) -> None:
+        self.was_enabled = Instrumentation.enabled()
+        Instrumentation.enable()
+        Instrumentation.reset()
+
+    def tearDown(self) -> None:
+        if not self.was_enabled:
+            Instrumentation.disable()
+
+    def testCounts(self):
+        state = setup()
+        self.assertEqual(len(list(state.legalMoves())), 20)
+        pyChess.isaMove(state.board, state.turn, 6, 4, 4, 4, None, 15)
+        Searcher().search(state, depth=2)
+        data = Instrumentation.snapshot()
+        functions = data["functions"]
+        self.assertGreaterEqual(functions["Logic.generateLegalMoves"]["items"], 20)
+        self.assertEqual(functions["Logic.isaMove"]["calls"], 1)
+        self.assertGreater(functions["Board.kingSquare"]["calls"], 0)
+        self.assertEqual(functions["Searcher.search"]["calls"], 1)
+        self.assertGreater(data["search"]["nodes"], 0)
+        self.assertGreater(data["search"]["nps"], 0)
+        self.assertGreater(data["caches"]["TranspositionTable"]["lookups"], 0)
+
+    def testPackedGeneration(self):
+        pyChess.Perft.perft(setup(), 2)
+        functions = Instrumentation.snapshot()["functions"]
+        # the root and each of its 20 children
+        self.assertEqual(functions["Logic.generateLegalMovesInto"]["calls"], 21)
+        self.assertEqual(functions["Logic.generateLegalMovesInto"]["items"], 420)
+        castling = GameState.fromFEN("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+        self.assertEqual(pyChess.Perft.perft(castling, 1), 26)
+        functions = Instrumentation.snapshot()["functions"]
+        self.assertGreater(functions["Board.is_attacked"]["calls"], 0)
+
+    def testCacheHitRate(self):
+        cache = LRUCache(4)
+        cache.put("a", 1)
+        cache.get("a")
+        cache.get("b")
+        lru = Instrumentation.snapshot()["caches"]["LRUCache"]
+        self.assertEqual((lru["hits"], lru["lookups"], lru["hit_rate"]), (1, 2, 0.5))
+        Instrumentation.reset()
+        self.assertEqual(Instrumentation.snapshot()["caches"]["LRUCache"]["hits"], 0)
+
+    def testDisableRestores(self):
+        Instrumentation.disable()
+        self.assertFalse(Instrumentation.enabled())
+        self.assertIs(pyChess.generateLegalMoves, Logic.generateLegalMoves)
+        self.assertIs(Board.inCheck, Board.__dict__["inCheck"])
+        self.assertFalse(hasattr(Logic.generateLegalMoves, "__wrapped__"))
+        self.assertFalse(hasattr(Board.inCheck, "__wrapped__"))
+        calls = Instrumentation.stats["Board.inCheck"].calls
+        setup().board.inCheck(pyChess.Color.white)
+        self.assertEqual(Instrumentation.stats["Board.inCheck"].calls, calls)
+        Instrumentation.enable()
+        self.assertTrue(hasattr(pyChess.generateLegalMoves, "__wrapped__"))
+
+    def testFormats(self):
+        setup().board.inCheck(pyChess.Color.white)
+        self.assertEqual(
+            json.loads(Instrumentation.toJSON())["functions"]["Board.inCheck"]["calls"],
+            1,
+        )
+        text = Instrumentation.toPrometheus()
+        self.assertIn("# TYPE pychess_calls_total counter", text)
+        self.assertIn('pychess_calls_total{function="Board.inCheck"} 1', text)
+        self.assertIn('pychess_cache_hit_rate{cache="LRUCache"}', text)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "profile.prom")
+            Instrumentation.write(path)
+            with open(path) as infile:
+                self.assertIn("pychess_search_nps", infile.read())
@@ -0,0 +1,470 @@
+import unittest
+from array import array
+import pyChess
+from pyChess import GameState, Move, Rank
+from pyChess.Binary import POSITION_BYTES, encodePosition
+
+
+class TestLegalMoves(unittest.TestCase):
+    def testMoveCounts(self):
+        positions = [
+            ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", 20),
+            (
+                "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+                48,
+            ),
+            ("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", 14),
+            ("r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", 6),
+            ("rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", 44),
+        ]
+        for fen, count in positions:
+            with self.subTest(fen=fen):
+                self.assertEqual(len(pyChess.getLegalMoves(GameState.fromFEN(fen))), count)
+
+    def testPackedIntoBuffer(self):
+        buffer = array("H", range(300))
+        for fen in (
+            "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+            "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+            "8/8/8/KPp4r/8/8/8/4k3 w - c6 0 2",
+        ):
+            with self.subTest(fen=fen):
+                state = GameState.fromFEN(fen)
+                count = pyChess.Logic.generateLegalMovesInto(state, buffer)
+                self.assertEqual(count, len(buffer))
+                expected = sorted(map(pyChess.packMove, state.legalMoves()))
+                self.assertEqual(sorted(buffer), expected)
+
+    def testEnPassant(self):
+        state = GameState.fromFEN("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 2")
+        self.assertIn("e5d6", pyChess.getLegalMoves(state))
+        state.enpassant = -1
+        self.assertNotIn("e5d6", pyChess.getLegalMoves(state))
+
+    def testEnPassantDiscoveredCheck(self):
+        state = GameState.fromFEN("8/8/8/KPp4r/8/8/8/4k3 w - c6 0 2")
+        self.assertNotIn("b5c6", pyChess.getLegalMoves(state))
+
+    def testCastling(self):
+        state = GameState.fromFEN("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+        moves = pyChess.getLegalMoves(state)
+        self.assertIn("e1g1", moves)
+        self.assertIn("e1c1", moves)
+        state.castleavail = pyChess.Logic.CASTLE_BLACK_KING
+        self.assertNotIn("e1g1", pyChess.getLegalMoves(state))
+
+    def testCastlingThroughCheck(self):
+        state = GameState.fromFEN("4kr2/8/8/8/8/8/8/R3K2R w KQ - 0 1")
+        moves = pyChess.getLegalMoves(state)
+        self.assertNotIn("e1g1", moves)
+        self.assertIn("e1c1", moves)
+
+    def testPromotion(self):
+        state = GameState.fromFEN("4k3/P7/8/8/8/8/8/4K3 w - - 0 1")
+        promotions = {m.promotion for m in state.legalMoves() if m.from_sq == 8}
+        self.assertEqual(promotions, {Rank.queen, Rank.rook, Rank.bishop, Rank.knight})
+
+    def testPinnedPiece(self):
+        state = GameState.fromFEN("4k3/4r3/8/8/8/8/4B3/4K3 w - - 0 1")
+        self.assertFalse(any(m.from_sq == 52 for m in state.legalMoves()))
+
+    def testLegalityMasks(self):
+        # the e2 rook is pinned along the e-file and the d3 knight gives check
+        state = GameState.fromFEN("4r1k1/8/8/8/8/3n4/4R3/4K3 w - - 0 1")
+        masks = pyChess.legalityMasks(state.board, state.turn)
+        self.assertEqual(masks.king_sq, 60)
+        self.assertEqual(masks.checkers, 1 << 43)
+        self.assertEqual(masks.evasions, 1 << 43)
+        self.assertEqual(masks.pinned, 1 << 52)
+        self.assertEqual(pyChess.getLegalMoves(state), {"e1d1", "e1d2", "e1f1"})
+        # a pinned piece may still move along the pin
+        state = GameState.fromFEN("4r1k1/8/8/8/8/8/4R3/4K3 w - - 0 1")
+        rook_moves = {m.to_sq for m in state.legalMoves() if m.from_sq == 52}
+        self.assertEqual(rook_moves, {4, 12, 20, 28, 36, 44})
+        # in double check only the king moves
+        state = GameState.fromFEN("4k3/8/8/8/1b6/8/2N5/r3K3 w - - 0 1")
+        self.assertEqual(pyChess.legalityMasks(state.board, state.turn).evasions, 0)
+        self.assertEqual({m.from_sq for m in state.legalMoves()}, {60})
+
+    def testKingCannotStepAlongCheck(self):
+        state = GameState.fromFEN("4k3/8/8/8/8/8/8/r3K3 w - - 0 1")
+        self.assertNotIn("e1f1", pyChess.getLegalMoves(state))
+        self.assertFalse(pyChess.isaMove(state.board, state.turn, 7, 4, 7, 5, None, 0))
+
+    def testFarPawnIsNotAnEnPassantCapture(self):
+        # a7 can't reach e3, and must not be treated as capturing on the e-file
+        state = GameState.fromFEN("8/p3k3/8/8/4P3/8/8/4K3 b - e3 0 1")
+        fen = state.to_fen()
+        self.assertFalse(
+            pyChess.isaMove(state.board, state.turn, 1, 0, 5, 4, (5, 4), 0)
+        )
+        self.assertEqual(state.to_fen(), fen)
+
+    def testCheckmateHasNoMoves(self):
+        state = GameState.fromFEN(
+            "rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3"
+        )
+        self.assertIsNone(next(state.legalMoves(), None))
+
+    def testUCIRoundTrip(self):
+        move = Move(12, 4, Rank.queen)
+        self.assertEqual(pyChess.moveToUCI(move), "e7e8q")
+        self.assertEqual(pyChess.moveFromUCI("e7e8q"), move)
+
+
+def snapshot(state: GameState):
+    return (
+        [state.board.pieceAt(square) for square in range(64)],
+        state.turn,
+        state.castleavail,
+        state.enpassant,
+        state.halfturn,
+        state.fullturn,
+    )
+
+
+def countLeaves(state: GameState, depth: int) -> int:
+    if depth == 0:
+        return 1
+    nodes = 0
+    for move in list(state.legalMoves()):
+        state.push(move)
+        nodes += countLeaves(state, depth - 1)
+        state.pop()
+    return nodes
+
+
+class TestPushPop(unittest.TestCase):
+    def testRestoresState(self):
+        state = GameState.fromFEN(
+            "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+        )
+        before = snapshot(state)
+        for move in list(state.legalMoves()):
+            state.push(move)
+            state.pop()
+            self.assertEqual(snapshot(state), before, pyChess.moveToUCI(move))
+
+    def testLeafCounts(self):
+        self.assertEqual(countLeaves(pyChess.setup(), 3), 8902)
+        kiwipete = GameState.fromFEN(
+            "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+        )
+        self.assertEqual(countLeaves(kiwipete, 2), 2039)
+
+    def testStateUpdates(self):
+        state = pyChess.setup()
+        self.assertTrue(pyChess.makeMove(state, 6, 4, 4, 4))
+        self.assertEqual(state.enpassant, pyChess.Logic.squareIndex("e3"))
+        self.assertEqual((state.turn, state.fullturn, state.halfturn), (1, 1, 0))
+        self.assertTrue(pyChess.makeMove(state, 0, 6, 2, 5))
+        self.assertEqual((state.enpassant, state.fullturn, state.halfturn), (-1, 2, 1))
+        self.assertFalse(pyChess.makeMove(state, 7, 4, 5, 4))
+        state.push(pyChess.moveFromUCI("e1e2"))
+        self.assertEqual(state.castleavail, 12)
+        state.pop()
+        self.assertEqual(state.castleavail, 15)
+
+    def testCastlingMovesRook(self):
+        state = GameState.fromFEN("r3k2r/8/8/8/8/8/8/R3K2R b KQkq - 0 1")
+        state.push(pyChess.moveFromUCI("e8c8"))
+        self.assertEqual(state.board[0, 3], pyChess.Piece(Rank.rook, pyChess.Color.black))
+        self.assertIsNone(state.board[0, 0])
+        self.assertEqual(state.castleavail, 3)
+
+
+class TestZobrist(unittest.TestCase):
+    def play(self, state: GameState, *moves: str) -> GameState:
+        for uci in moves:
+            state.push(pyChess.moveFromUCI(uci))
+        return state
+
+    def testTranspositionsMatch(self):
+        first = self.play(pyChess.setup(), "g1f3", "g8f6", "b1c3", "b8c6")
+        second = self.play(pyChess.setup(), "b1c3", "b8c6", "g1f3", "g8f6")
+        self.assertEqual(first.zobrist, second.zobrist)
+        self.assertEqual(first.board.zobrist, second.board.zobrist)
+
+    def testMatchesFreshPosition(self):
+        state = self.play(pyChess.setup(), "e2e4", "d7d5", "e4d5", "e7e5", "d5e6")
+        fresh = GameState.fromFEN(
+            "rnbqkbnr/ppp2ppp/4P3/8/8/8/PPPP1PPP/RNBQKBNR b KQkq - 0 3"
+        )
+        self.assertEqual(state.zobrist, fresh.zobrist)
+
+    def testPopRestoresKey(self):
+        state = pyChess.setup()
+        key = state.zobrist
+        self.play(state, "e2e4", "e7e5", "g1f3")
+        for _ in range(3):
+            state.pop()
+        self.assertEqual(state.zobrist, key)
+
+    def testSideCastlingAndEnPassant(self):
+        state = GameState.fromFEN("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 2")
+        with_target = state.zobrist
+        state.enpassant = -1
+        self.assertNotEqual(state.zobrist, with_target)
+        without_target = state.zobrist
+        state.turn = pyChess.Color.black
+        self.assertNotEqual(state.zobrist, without_target)
+        state.castleavail = 1
+        self.assertNotIn(state.zobrist, (with_target, without_target))
+        # a double push with no pawn able to capture doesn't change the key
+        self.assertEqual(
+            self.play(pyChess.setup(), "e2e4").zobrist,
+            GameState.fromFEN(
+                "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1"
+            ).zobrist,
+        )
+
+
+class TestFEN(unittest.TestCase):
+    def testRoundTrip(self):
+        state = pyChess.setup()
+        for uci in ("e2e4", "c7c5", "g1f3", "d7d6", "e1e2"):
+            state.push(pyChess.moveFromUCI(uci))
+        fen = "rnbqkbnr/pp2pppp/3p4/2p5/4P3/5N2/PPPPKPPP/RNBQ1B1R b kq - 1 3"
+        self.assertEqual(state.to_fen(), fen)
+        self.assertEqual(GameState.fromFEN(fen).to_fen(), fen)
+        self.assertEqual(GameState.fromFEN(fen).zobrist, state.zobrist)
+
+    def testFieldsAreKept(self):
+        state = GameState.fromFEN("4k3/8/8/3pP3/8/8/8/4K2R w Kq d6 7 42")
+        self.assertEqual(state.turn, pyChess.Color.white)
+        self.assertEqual(state.castleavail, 1 | 8)
+        self.assertEqual(state.enpassant, 19)
+        self.assertEqual((state.halfturn, state.fullturn), (7, 42))
+
+    def testInvalidFields(self):
+        fens = [
+            "4k3/8/8/8/8/8/8/4K3 x - - 0 1",
+            "4k3/8/8/8/8/8/8/4K3 w QK - 0 1",
+            "4k3/8/8/8/8/8/8/4K3 w - e4 0 1",
+            "4k3/8/8/8/8/8/8/4K3 w - - a 1",
+            "4k3/8/8/8/8/8/8/4K3 w - - 0 0",
+            "4k3/8/8/8/8/8/8/4K3 w - 0 1",
+            "4k3/8/8/8/8/8/4K3 w - - 0 1",
+            "4k3/8/8/8/8/8/8/4K2 w - - 0 1",
+            "4k3/8/8/8/8/8/8/4X3 w - - 0 1",
+        ]
+        for fen in fens:
+            with self.subTest(fen=fen), self.assertRaises(SyntaxError):
+                GameState.fromFEN(fen)
+        with self.assertRaises(ValueError):
+            GameState.fromFEN("4k3/8/8/8/8/8/8/8 w - - 0 1")
+
+    def testPawnsOffTheBackRanks(self):
+        for fen in (
+            "P3k3/8/8/8/8/8/8/4K3 w - - 0 1",
+            "4k3/8/8/8/8/8/8/p3K3 b - - 0 1",
+            "4k3/8/8/8/8/8/8/4K2P",
+        ):
+            with self.subTest(fen=fen), self.assertRaises(ValueError):
+                GameState.fromFEN(fen)
+
+    def testEnPassantTarget(self):
+        fens = [
+            "4k3/8/8/8/8/8/3PP3/4K3 w - e3 0 1",  # white's own target
+            "4k3/8/8/8/4P3/8/8/4K3 b - e6 0 1",
+            "4k3/8/8/8/8/8/8/4K3 w - e6 0 1",  # no pawn moved there
+            "4k3/8/8/4P3/8/8/8/4K3 w - e6 0 1",  # a pawn of the wrong color
+        ]
+        for fen in fens:
+            with self.subTest(fen=fen), self.assertRaises(ValueError):
+                GameState.fromFEN(fen)
+        state = GameState.fromFEN("4k3/8/8/8/3pP3/8/8/4K3 b - e3 0 1")
+        self.assertEqual(state.enpassant, 44)
+        self.assertIn("d4e3", pyChess.getLegalMoves(state))
+
+    def testBatch(self):
+        fens = [
+            pyChess.STARTING_FEN,
+            "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        ]
+        states = list(pyChess.parse_many([fens[0] + "\n", "\n", fens[1]]))
+        self.assertEqual(len(states), 2)
+        self.assertEqual(pyChess.dump_many(states), "\n".join(fens) + "\n")
+
+
+class TestBinary(unittest.TestCase):
+    FENS = [
+        pyChess.STARTING_FEN,
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        "4k3/8/8/3pP3/8/8/8/4K2R w Kq d6 7 42",
+        "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R b KQ - 1 8",
+    ]
+
+    def testRoundTrip(self):
+        for fen in self.FENS:
+            with self.subTest(fen=fen):
+                state = GameState.fromFEN(fen)
+                data = state.to_bytes()
+                self.assertEqual(len(data), POSITION_BYTES)
+                decoded = GameState.from_bytes(data)
+                self.assertEqual(decoded.to_fen(), fen)
+                self.assertEqual(decoded.zobrist, state.zobrist)
+
+    def testBuffers(self):
+        states = [GameState.fromFEN(fen) for fen in self.FENS]
+        data = bytearray(pyChess.pack_many(states))
+        self.assertEqual(len(data), POSITION_BYTES * len(self.FENS))
+        view = memoryview(data)
+        fens = [state.to_fen() for state in pyChess.unpack_many(view)]
+        self.assertEqual(fens, self.FENS)
+        third = GameState.from_bytes(view, 2 * POSITION_BYTES)
+        self.assertEqual(third.to_fen(), self.FENS[2])
+        with self.assertRaises(ValueError):
+            list(pyChess.unpack_many(data[:-1]))
+
+    def testInvalidRecord(self):
+        data = bytearray(pyChess.setup().to_bytes())
+        data[0] = 0xFF
+        with self.assertRaises(ValueError):
+            GameState.from_bytes(data)
+
+    def testUnplayableRecord(self):
+        white, black = pyChess.Color.white, pyChess.Color.black
+        pieces = [None] * 64
+        pieces[4] = pyChess.Piece(Rank.king, black)
+        pieces[60] = pyChess.Piece(Rank.king, white)
+        record = encodePosition(pieces, white, 0, -1, 0, 1)
+        fen = GameState.from_bytes(record).to_fen()
+        self.assertEqual(fen, "4k3/8/8/8/8/8/8/4K3 w - - 0 1")
+        records = {
+            "pawn on a8": ({0: Rank.pawn}, -1),
+            "second king": ({59: Rank.king}, -1),
+            "e6 without a pawn on e5": ({}, 20),
+        }
+        for name, (extra, enpassant) in records.items():
+            board = list(pieces)
+            for square, rank in extra.items():
+                board[square] = pyChess.Piece(rank, white)
+            record = encodePosition(board, white, 0, enpassant, 0, 1)
+            with self.subTest(name), self.assertRaises(ValueError):
+                GameState.from_bytes(record)
+
+
+class TestOutcome(unittest.TestCase):
+    def play(self, state: GameState, *moves: str) -> GameState:
+        for uci in moves:
+            state.push(pyChess.moveFromUCI(uci))
+        return state
+
+    def testMates(self):
+        state = self.play(pyChess.setup(), "f2f3", "e7e5", "g2g4", "d8h4")
+        outcome = state.outcome()
+        self.assertEqual(outcome.termination, pyChess.Termination.checkmate)
+        self.assertEqual(outcome.winner, pyChess.Color.black)
+        self.assertEqual(outcome.result, "0-1")
+        stalemate = GameState.fromFEN("7k/5Q2/6K1/8/8/8/8/8 b - - 0 1")
+        self.assertEqual(stalemate.outcome().termination, pyChess.Termination.stalemate)
+        self.assertIsNone(pyChess.setup().outcome())
+
+    def testRepetition(self):
+        state = pyChess.setup()
+        shuffle = ("g1f3", "g8f6", "f3g1", "f6g8")
+        self.play(state, *shuffle)
+        self.assertEqual(state.repetitions(), 2)
+        self.assertIsNone(state.outcome(claim_draw=True))
+        self.play(state, *shuffle)
+        self.assertEqual(state.repetitions(), 3)
+        self.assertIsNone(state.outcome())
+        termination = state.outcome(claim_draw=True).termination
+        self.assertEqual(termination, pyChess.Termination.threefold_repetition)
+        self.play(state, *shuffle, *shuffle)
+        outcome = state.outcome()
+        self.assertEqual(outcome.termination, pyChess.Termination.fivefold_repetition)
+        self.assertEqual(outcome.result, "1/2-1/2")
+        # a pawn move makes every earlier position unreachable
+        self.play(state, "e2e4")
+        self.assertEqual(state.repetitions(), 1)
+        # keys can come from elsewhere, e.g. a stored game
+        keys = [undo.key for undo in state.history]
+        state.pop()
+        bare = GameState.fromFEN(state.to_fen())
+        self.assertEqual(bare.repetitions(), 1)
+        self.assertEqual(bare.repetitions(keys[:-1]), 5)
+
+    def testMoveRules(self):
+        fen = "4k3/8/8/8/8/8/4P3/R3K3 w - - {} 80"
+        self.assertIsNone(GameState.fromFEN(fen.format(99)).outcome(claim_draw=True))
+        termination = GameState.fromFEN(fen.format(100)).outcome(True).termination
+        self.assertEqual(termination, pyChess.Termination.fifty_moves)
+        self.assertIsNone(GameState.fromFEN(fen.format(100)).outcome())
+        termination = GameState.fromFEN(fen.format(150)).outcome().termination
+        self.assertEqual(termination, pyChess.Termination.seventyfive_moves)
+
+    def testInsufficientMaterial(self):
+        insufficient = [
+            "4k3/8/8/8/8/8/8/4K3 w - - 0 1",
+            "4k3/8/8/8/8/8/8/4KN2 w - - 0 1",
+            "4kb2/8/8/8/8/8/8/4K3 w - - 0 1",
+            "2b1k3/8/8/8/8/8/8/4KB2 w - - 0 1",  # c8 and f1 are both light
+        ]
+        sufficient = [
+            "4k3/8/8/8/8/8/8/4KNN1 w - - 0 1",
+            "4k3/8/8/8/8/8/8/4KBB1 w - - 0 1",
+            "4kn2/8/8/8/8/8/8/4KB2 w - - 0 1",
+            "4k3/8/8/8/8/8/7p/4K3 w - - 0 1",
+        ]
+        for fen in insufficient:
+            with self.subTest(fen=fen):
+                termination = GameState.fromFEN(fen).outcome().termination
+                self.assertEqual(termination, pyChess.Termination.insufficient_material)
+        for fen in sufficient:
+            with self.subTest(fen=fen):
+                self.assertIsNone(GameState.fromFEN(fen).outcome())
+
+
+class TestValidateGame(unittest.TestCase):
+    OPENING = ["e2e4", "e7e5", "g1f3", "b8c6", "f1c4", "g8f6", "e1g1"]
+
+    def testLegalGame(self):
+        result = pyChess.validate_game(pyChess.STARTING_FEN, self.OPENING)
+        self.assertTrue(result.valid)
+        self.assertEqual(result.illegal, -1)
+        self.assertEqual(
+            result.state.to_fen(),
+            "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQ1RK1 b kq - 5 4",
+        )
+
+    def testFirstIllegalMove(self):
+        moves = self.OPENING[:4] + ["e1g1", "f1c4"]  # castling through the bishop
+        result = pyChess.validate_game(pyChess.STARTING_FEN, moves)
+        self.assertFalse(result.valid)
+        self.assertEqual(result.illegal, 4)
+        self.assertEqual(result.state.fullturn, 3)
+        for bad in ("e2e5", "e2e4", "e7e4", "e2", "a7a8q", "e1e2"):
+            with self.subTest(move=bad):
+                self.assertEqual(pyChess.validate_game(moves=["e2e4", bad]).illegal, 1)
+
+    def testPackedMoves(self):
+        moves = map(pyChess.moveFromUCI, self.OPENING)
+        packed = array("H", map(pyChess.packMove, moves))
+        result = pyChess.validate_game(pyChess.STARTING_FEN, packed)
+        self.assertTrue(result.valid)
+        self.assertEqual(
+            result.state, pyChess.validate_game(moves=self.OPENING).state
+        )
+        packed.append(0)
+        self.assertEqual(pyChess.validate_game(moves=packed).illegal, 7)
+
+    def testPromotionAndEnPassant(self):
+        fen = "4k3/1P6/8/3pP3/8/8/8/4K3 w - d6 0 2"
+        self.assertTrue(pyChess.validate_game(fen, ["e5d6", "e8d7", "b7b8n"]).valid)
+        self.assertEqual(pyChess.validate_game(fen, ["b7b8"]).illegal, 0)
+        result = pyChess.validate_game(fen, ["e5e6", "e8e7", "e6d7"])
+        self.assertEqual(result.illegal, 2)
+
+    def testPositions(self):
+        replay = pyChess.iter_game(moves=self.OPENING[:3] + ["e8e6"])
+        fens = [state.to_fen() for state in replay]
+        self.assertEqual(len(fens), 3)
+        self.assertEqual(
+            fens[0], "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import contextlib
+import io
+import unittest
+from pyChess import GameState
+from pyChess.Analysis import analyzePositions
+from pyChess.Perft import (
+    PERFT_SUITE,
+    divide,
+    parallelDivide,
+    parallelPerft,
+    perft,
+    runSuite,
+)
+from pyChess.main import main
+
+
+class TestPerft(unittest.TestCase):
+    def testSuite(self):
+        for result in runSuite(2):
+            with self.subTest(position=result.name):
+                self.assertTrue(result.passed, f"{result.nodes} != {result.expected}")
+
+    def testDivide(self):
+        position = PERFT_SUITE[1]
+        counts = divide(GameState.fromFEN(position.fen), 2)
+        self.assertEqual(len(counts), position.counts[0])
+        self.assertEqual(sum(counts.values()), position.counts[1])
+        self.assertEqual(counts["e1g1"], 43)
+
+    def testDepthZero(self):
+        state = GameState.fromFEN(PERFT_SUITE[0].fen)
+        self.assertEqual(perft(state, 0), 1)
+        self.assertEqual(divide(state, 0), {})
+        self.assertEqual(parallelDivide(PERFT_SUITE[0].fen, 0), {})
+        self.assertRaises(ValueError, perft, state, -1)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(main(["perft", "0", "--divide"]), 0)
+        self.assertIn("nodes 1\n", output.getvalue())
+
+    def testCommandLine(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            status = main(["perft", "2", "--fen", PERFT_SUITE[2].fen, "--divide"])
+        self.assertEqual(status, 0)
+        self.assertIn("nodes 191", output.getvalue())
+        self.assertIn("b4b1: 16", output.getvalue())
+
+
+class TestParallel(unittest.TestCase):
+    def testParallelMatchesSerial(self):
+        position = PERFT_SUITE[3]
+        counts = parallelDivide(position.fen, 2, workers=2)
+        self.assertEqual(counts, divide(GameState.fromFEN(position.fen), 2))
+        self.assertEqual(list(counts), sorted(counts))
+        self.assertEqual(parallelPerft(position.fen, 3, workers=2), position.counts[2])
+
+    def testAnalyzeKeepsOrder(self):
+        fens = [position.fen for position in PERFT_SUITE] + ["8/8/8 w - - 0 1"]
+        reports = list(analyzePositions(fens, workers=2, chunksize=2))
+        self.assertEqual([report.fen for report in reports], fens)
+        self.assertEqual(
+            [report.legal_moves for report in reports[:-1]],
+            [position.counts[0] for position in PERFT_SUITE],
+        )
+        self.assertFalse(reports[-1].valid)
+        self.assertEqual(reports, list(analyzePositions(fens, workers=1)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import bz2
+import contextlib
+import gzip
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from pyChess import GameState, moveToUCI
+from pyChess.PGN import parseSAN, readGames, validateGames
+from pyChess.main import main
+
+GAMES = os.path.join(os.path.dirname(__file__), "data", "games.pgn")
+
+
+class TestReadGames(unittest.TestCase):
+    def testMainlineOnly(self):
+        games = list(readGames(GAMES))
+        self.assertEqual([game.number for game in games], [1, 2, 3, 4])
+        self.assertEqual(games[0].headers["White"], "Morphy, Paul")
+        self.assertEqual(games[0].result, "1-0")
+        self.assertEqual(len(games[0].moves), 33)
+        self.assertEqual(games[1].moves, ["d4", "d5", "c4", "dxc4", "e3"])
+        self.assertEqual(games[1].result, "*")
+
+    def testCompressedArchives(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for suffix, opener in ((".gz", gzip.open), (".bz2", bz2.open)):
+                path = os.path.join(tmp, "games.pgn" + suffix)
+                with open(GAMES, "rb") as infile, opener(path, "wb") as outfile:
+                    shutil.copyfileobj(infile, outfile)
+                self.assertEqual(list(readGames(path)), list(readGames(GAMES)))
+
+    def testEmptyFile(self):
+        with tempfile.NamedTemporaryFile(suffix=".pgn", delete=False) as outfile:
+            path = outfile.name
+        try:
+            self.assertEqual(list(readGames(path)), [])
+        finally:
+            os.remove(path)
+
+    def testGameWithoutResult(self):
+        text = '[Event "?"]\n\n1. e4 e5\n[Event "?"]\n1. d4'
+        games = list(readGames(io.StringIO(text)))
+        self.assertEqual([game.moves for game in games], [["e4", "e5"], ["d4"]])
+
+
+class TestSAN(unittest.TestCase):
+    def parse(self, fen, san):
+        return moveToUCI(parseSAN(GameState.fromFEN(fen), san))
+
+    def testDisambiguation(self):
+        fen = "4k3/8/8/8/8/8/4K3/R6R w - - 0 1"
+        self.assertEqual(self.parse(fen, "Rad1"), "a1d1")
+        self.assertEqual(self.parse(fen, "Rhd1"), "h1d1")
+        with self.assertRaisesRegex(ValueError, "Ambiguous"):
+            self.parse(fen, "Rd1")
+        fen = "4k3/8/8/8/N7/8/N7/4K3 w - - 0 1"
+        self.assertEqual(self.parse(fen, "N4b2"), "a4b2")
+        self.assertEqual(self.parse(fen, "N2xc3"), "a2c3")
+
+    def testCastlingAndPromotion(self):
+        fen = "4k3/1P6/8/8/8/8/8/4K2R w K - 0 1"
+        self.assertEqual(self.parse(fen, "O-O"), "e1g1")
+        self.assertEqual(self.parse(fen, "0-0"), "e1g1")
+        self.assertEqual(self.parse(fen, "b8=N+"), "b7b8n")
+        self.assertEqual(self.parse(fen, "b8Q"), "b7b8q")
+        with self.assertRaisesRegex(ValueError, "Illegal"):
+            self.parse(fen, "Kg1")
+        with self.assertRaisesRegex(ValueError, "Illegal"):
+            self.parse(fen, "O-O-O")
+
+
+class TestValidateGames(unittest.TestCase):
+    def testReportsFirstIllegalMove(self):
+        reports = list(validateGames(GAMES))
+        valid = [report.valid for report in reports]
+        self.assertEqual(valid, [True, True, True, False])
+        self.assertEqual(reports[2].plies, 5)
+        self.assertEqual((reports[3].number, reports[3].ply), (4, 6))
+        self.assertEqual(reports[3].san, "Kxe5")
+
+    def testInvalidFEN(self):
+        reports = list(validateGames(io.StringIO('[FEN "8/8/8 w - - 0 1"]\n1. e4 *')))
+        self.assertFalse(reports[0].valid)
+        self.assertEqual(reports[0].ply, 1)
+
+    def testCommandLine(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            status = main(["pgn", GAMES])
+        self.assertEqual(status, 1)
+        self.assertIn("game 4, ply 6: Illegal move: 'Kxe5'.", output.getvalue())
+        self.assertIn("4 games, 1 with illegal moves", output.getvalue())
@@ -0,0 +1,101 @@
+import os
+import random
+import tempfile
+import unittest
+
+import pyChess
+from pyChess import GameState, moveFromUCI, moveToUCI
+from pyChess.Cache import LRUCache
+from pyChess.Probe import (
+    RANDOM_COUNT,
+    OpeningBook,
+    Prober,
+    Tablebase,
+    decodeBookMove,
+    encodeBookMove,
+    polyglotKey,
+    writeBook,
+    writeTablebase,
+)
+from pyChess.Search import MATE_SCORE, Searcher
+
+BARE_KINGS = "4k3/8/8/8/8/8/8/4K3 w - - 0 1"
+
+
+class TestLRUCache(unittest.TestCase):
+    def testEviction(self):
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)  # "b" is now the least recently used
+        self.assertNotIn("b", cache)
+        self.assertEqual((cache.get("a"), cache.get("c")), (1, 3))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+        self.assertEqual(len(cache), 2)
+
+
+class TestProbe(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.dir.name, name)
+
+    def testBookMoves(self):
+        start = pyChess.setup()
+        after_e4 = pyChess.setup()
+        after_e4.push(moveFromUCI("e2e4"))
+        lines = [
+            (start, moveFromUCI("e2e4"), 60),
+            (start, moveFromUCI("d2d4"), 40),
+            (after_e4, moveFromUCI("c7c5"), 10),
+        ]
+        writeBook(self.path("book.bin"), lines)
+        with OpeningBook(self.path("book.bin")) as book:
+            self.assertEqual(len(book), 3)
+            entries = book.entries(start)
+            self.assertEqual([moveToUCI(e.move) for e in entries], ["e2e4", "d2d4"])
+            self.assertEqual(moveToUCI(book.choose(after_e4)), "c7c5")
+            picks = {book.choose(start, random.Random(n)) for n in range(20)}
+            self.assertEqual({moveToUCI(move) for move in picks}, {"e2e4", "d2d4"})
+            self.assertIsNone(book.choose(GameState.fromFEN(BARE_KINGS)))
+
+    def testPolyglotKeysAndCastling(self):
+        rng = random.Random(7)
+        randoms = [rng.getrandbits(64) for _ in range(RANDOM_COUNT)]
+        state = GameState.fromFEN("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+        castle = moveFromUCI("e1g1")
+        # Polyglot writes castling as the king taking its rook
+        self.assertEqual(encodeBookMove(state, castle), 7 | 4 << 6)
+        self.assertEqual(decodeBookMove(state, 7 | 4 << 6), castle)
+        # a lone white king on a1 with black to move and no rights
+        bare = GameState.fromFEN("8/8/8/8/8/8/8/K6k b - - 0 1")
+        expected = randoms[64 * 11] ^ randoms[64 * 10 + 7]
+        self.assertEqual(polyglotKey(bare, randoms), expected)
+        writeBook(self.path("book.bin"), [(state, castle, 1)], randoms)
+        with OpeningBook(self.path("book.bin"), randoms) as book:
+            self.assertEqual(book.choose(state), castle)
+        with OpeningBook(self.path("book.bin")) as book:
+            self.assertIsNone(book.choose(state))
+
+    def testProberAndSearch(self):
+        mate = GameState.fromFEN("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+        writeTablebase(
+            self.path("table.bin"), [(mate, MATE_SCORE - 1, moveFromUCI("a1a8"))]
+        )
+        writeBook(self.path("book.bin"), [(pyChess.setup(), moveFromUCI("g1f3"), 1)])
+        book = OpeningBook(self.path("book.bin"))
+        table = Tablebase(self.path("table.bin"))
+        with book, table:
+            prober = Prober(book, table, cachesize=8)
+            result = Searcher(prober=prober).search(mate, depth=1)
+            self.assertEqual(moveToUCI(result.move), "a1a8")
+            self.assertEqual(result.score, MATE_SCORE - 1)
+            self.assertEqual((result.depth, result.nodes), (0, 0))
+            self.assertEqual(prober.probe(pyChess.setup()).source, "book")
+            self.assertEqual(prober.probe(mate).source, "tablebase")
+            self.assertIsNone(prober.probe(GameState.fromFEN(BARE_KINGS)))
+            self.assertEqual(prober.cache.hits, 1)
@@ -0,0 +1,99 @@
+import time
+import unittest
+from pyChess import GameState, moveFromUCI, moveToUCI, setup
+from pyChess.Evaluation import evaluate
+from pyChess.Search import MATE_SCORE, Searcher, search
+from pyChess.TranspositionTable import TranspositionTable
+
+
+class TestSearch(unittest.TestCase):
+    def testMateInOne(self):
+        state = GameState.fromFEN("6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1")
+        result = search(state, depth=4)
+        self.assertEqual(moveToUCI(result.move), "d1d8")
+        self.assertEqual(result.score, MATE_SCORE - 1)
+
+    def testCheckmated(self):
+        state = GameState.fromFEN("3R2k1/5ppp/8/8/8/8/5PPP/6K1 b - - 0 1")
+        result = search(state, depth=3)
+        self.assertIsNone(result.move)
+        self.assertEqual(result.score, -MATE_SCORE)
+
+    def testWinsMaterial(self):
+        state = GameState.fromFEN("4k3/8/8/3q4/8/2N5/8/4K3 w - - 0 1")
+        self.assertEqual(moveToUCI(search(state, depth=3).move), "c3d5")
+
+    def testAvoidsLosingCapture(self):
+        # the pawn on d5 is defended, so taking it with the queen loses the queen
+        state = GameState.fromFEN("4k3/8/4p3/3p4/8/8/8/3QK3 w - - 0 1")
+        self.assertNotEqual(moveToUCI(search(state, depth=2).move), "d1d5")
+
+    def testTimeBudget(self):
+        state = setup()
+        start = time.perf_counter()
+        result = search(state, movetime=0.3)
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertGreaterEqual(result.depth, 1)
+        self.assertIn(result.move, list(state.legalMoves()))
+
+    def testDeadlineIsKept(self):
+        state = GameState.fromFEN(
+            "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+        )
+        searcher = Searcher(TranspositionTable(1))
+        # an expired deadline is noticed within a few dozen nodes, not thousands
+        self.assertLessEqual(searcher.search(state, movetime=0).nodes, 128)
+        for movetime in (0.05, 0.2):
+            with self.subTest(movetime=movetime):
+                result = searcher.search(state, movetime=movetime)
+                self.assertLess(result.seconds, movetime + 0.05)
+
+    def testNodeBudgetAndStateRestored(self):
+        state = setup()
+        key = state.zobrist
+        result = search(state, nodes=3000)
+        self.assertLess(result.nodes, 3000 + Searcher.CHECK_EVERY)
+        self.assertEqual(state.zobrist, key)
+        self.assertEqual(state.history, [])
+
+    def testNoMoves(self):
+        state = GameState.fromFEN("k7/8/1Q6/8/8/8/8/K7 b - - 0 1")
+        result = search(state, depth=3)
+        self.assertIsNone(result.move)
+        self.assertEqual(result.score, 0)
+
+    def testIterationCallback(self):
+        depths = []
+        Searcher().search(setup(), depth=3, onIteration=lambda r: depths.append(r.depth))
+        self.assertEqual(depths, [1, 2, 3])
+
+
+class TestEvaluation(unittest.TestCase):
+    def testStartIsBalanced(self):
+        self.assertEqual(setup().board.evaluation, 0)
+
+    def testMirroredPositionsNegate(self):
+        white = GameState.fromFEN("4k3/8/8/8/3N4/8/PP6/4K3 w - - 0 1")
+        black = GameState.fromFEN("4k3/pp6/8/3n4/8/8/8/4K3 b - - 0 1")
+        self.assertGreater(white.board.evaluation, 0)
+        self.assertEqual(white.board.evaluation, -black.board.evaluation)
+        self.assertEqual(evaluate(white), evaluate(black))
+
+    def testIncrementalMatchesFresh(self):
+        state = GameState.fromFEN(
+            "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+        )
+        start = state.board.evaluation
+        for uci in ("e1g1", "e8c8", "d5e6", "b4c3", "e6f7", "c3b2", "f7f8q"):
+            state.push(moveFromUCI(uci))
+        fresh = GameState.fromFEN(
+            "2kr1Q1r/p1ppq1b1/bn3np1/4N3/4P3/5Q1p/PpPBBPPP/R4RK1 b - - 0 5"
+        )
+        self.assertEqual(state.board.evaluation, fresh.board.evaluation)
+        while state.history:
+            state.pop()
+        self.assertEqual(state.board.evaluation, start)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from pyChess.Server import GameServer
+
+
+class TestGameServer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = GameServer(cachesize=64)
+
+    def move(self, game: int, uci: str) -> dict:
+        return self.server.handle({"op": "move", "game": game, "move": uci})
+
+    def testGame(self):
+        game = self.server.handle({"op": "new"})
+        self.assertTrue(game["ok"])
+        self.assertEqual(game["result"], "*")
+        for uci in ("f2f3", "e7e5", "g2g4"):
+            response = self.move(game["game"], uci)
+            self.assertTrue(response["ok"], response)
+        legal = self.server.handle({"op": "legal", "game": game["game"]})
+        self.assertIn("d8h4", legal["moves"])
+        response = self.move(game["game"], "d8h4")
+        self.assertEqual(response["result"], "0-1")
+        self.assertEqual(response["termination"], "checkmate")
+        self.assertTrue(response["check"])
+        self.assertEqual(response["plies"], 4)
+
+    def testErrors(self):
+        game = self.server.handle({"op": "new", "id": 7})["game"]
+        response = self.server.handle(
+            {"op": "move", "game": game, "move": "e2e5", "id": 8}
+        )
+        error = "Illegal move: 'e2e5'."
+        self.assertEqual(response, {"ok": False, "error": error, "id": 8})
+        self.assertFalse(self.move(game, "zz")["ok"])
+        self.assertFalse(self.server.handle({"op": "status", "game": 99})["ok"])
+        self.assertFalse(self.server.handle({"op": "move", "game": game})["ok"])
+        self.assertFalse(self.server.handle({"op": "fly"})["ok"])
+        bad_fen = {"op": "new", "fen": "8/8 w - - 0 1"}
+        self.assertFalse(self.server.handle(bad_fen)["ok"])
+        self.assertFalse(self.server.handle([1, 2])["ok"])
+        for request in (
+            {"op": "new", "fen": 5},
+            {"op": "move", "game": game, "move": 5},
+            {"op": "status", "game": [game]},
+            {"op": ["new"]},
+        ):
+            with self.subTest(request=request):
+                self.assertFalse(self.server.handle(request)["ok"])
+        self.assertTrue(self.server.handle({"op": "close", "game": game})["ok"])
+        self.assertFalse(self.server.handle({"op": "close", "game": game})["ok"])
+
+    def testPrivateMethodsAreNotOps(self):
+        self.server.handle({"op": "new"})
+        for op in ("_init__", "__init__", "_game", "handle", "positionInfo"):
+            with self.subTest(op=op):
+                self.assertFalse(self.server.handle({"op": op, "game": 1})["ok"])
+        self.assertEqual(len(self.server.games), 1)
+
+    def testManyGamesShareTheCache(self):
+        games = [self.server.handle({"op": "new"})["game"] for _ in range(2000)]
+        for game in games:
+            self.move(game, "e2e4")
+        stats = self.server.handle({"op": "stats"})
+        self.assertEqual(stats["games"], 2000)
+        self.assertEqual(stats["cached"], 2)  # start position and after 1. e4
+        # only the first game generated moves; every later lookup hit
+        self.assertEqual((stats["hits"], stats["misses"]), (3 * 2000 - 2, 2))
+
+    def testCacheIgnoresMoveCounters(self):
+        game = self.server.handle({"op": "new"})["game"]
+        for uci in ("g1f3", "g8f6", "f3g1", "f6g8") * 2:
+            self.assertTrue(self.move(game, uci)["ok"])
+        stats = self.server.handle({"op": "stats"})
+        self.assertEqual((stats["cached"], stats["misses"]), (4, 4))
+
+    def testSockets(self):
+        async def talk(listener, connect) -> list[dict]:
+            async with listener:
+                reader, writer = await connect()
+                responses = []
+                for request in (
+                    {"op": "new", "id": 1},
+                    {"op": "move", "game": 1, "move": "e2e4"},
+                ):
+                    writer.write(json.dumps(request).encode() + b"\n")
+                    responses.append(json.loads(await reader.readline()))
+                writer.write(b"not json\n")
+                responses.append(json.loads(await reader.readline()))
+                writer.close()
+                await writer.wait_closed()
+            return responses
+
+        async def tcp():
+            listener = await self.server.start(port=0)
+            port = listener.sockets[0].getsockname()[1]
+
+            def connect():
+                return asyncio.open_connection("127.0.0.1", port)
+
+            return await talk(listener, connect)
+
+        async def unix(path):
+            listener = await GameServer().start(path=path)
+            return await talk(listener, lambda: asyncio.open_unix_connection(path))
+
+        responses = asyncio.run(tcp())
+        self.assertEqual(responses[0]["id"], 1)
+        self.assertIn("4P3", responses[1]["fen"])
+        self.assertFalse(responses[2]["ok"])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            responses = asyncio.run(unix(os.path.join(tmp, "games.sock")))
+        self.assertTrue(responses[1]["ok"])
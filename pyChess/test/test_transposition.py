@@ -0,0 +1,71 @@
+import unittest
+from pyChess import GameState, Move, Rank
+from pyChess.Perft import PERFT_SUITE, perft
+from pyChess.TranspositionTable import (
+    EXACT,
+    LOWER,
+    UPPER,
+    TranspositionTable,
+    packMove,
+    unpackMove,
+)
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def testSize(self):
+        table = TranspositionTable(1)
+        self.assertLessEqual(table.nbytes, 2**20)
+        self.assertGreater(table.nbytes, 2**20 - 40)
+
+    def testStoreProbe(self):
+        table = TranspositionTable(1)
+        key = 0x123456789ABCDEF0
+        self.assertIsNone(table.probe(key))
+        table.store(key, 5, LOWER, -250, Move(52, 36))
+        entry = table.probe(key)
+        self.assertEqual(tuple(entry), (5, LOWER, -250, Move(52, 36)))
+        self.assertEqual((table.probes, table.hits), (2, 1))
+
+    def testMovePacking(self):
+        for move in (Move(0, 63), Move(12, 4, Rank.queen), Move(49, 57, Rank.knight)):
+            self.assertLess(packMove(move), 1 << 16)
+            self.assertEqual(unpackMove(packMove(move)), move)
+
+    def testReplacement(self):
+        table = TranspositionTable(0)  # a single bucket
+        self.assertEqual(table.buckets, 1)
+        table.store(1, 8, EXACT, 10)
+        table.store(2, 3, UPPER, 20)
+        self.assertEqual(table.probe(1).depth, 8)
+        self.assertEqual(table.probe(2).depth, 3)
+        # shallower results only go to the always-replace slot
+        table.store(3, 2, EXACT, 30)
+        self.assertIsNotNone(table.probe(1))
+        self.assertIsNone(table.probe(2))
+        # deeper results take the depth-preferred slot and demote its entry
+        table.store(4, 9, EXACT, 40)
+        self.assertEqual(table.probe(4).score, 40)
+        self.assertEqual(table.probe(1).score, 10)
+        self.assertIsNone(table.probe(3))
+        # entries from an older search can be replaced by shallower ones
+        table.newSearch()
+        table.store(5, 1, EXACT, 50)
+        self.assertIsNotNone(table.probe(5))
+        self.assertIsNone(table.probe(1))
+        table.clear()
+        self.assertIsNone(table.probe(4))
+
+    def testPerftWithTable(self):
+        table = TranspositionTable(1)
+        for position in PERFT_SUITE[:3]:
+            state = GameState.fromFEN(position.fen)
+            self.assertEqual(perft(state, 3, table), position.counts[2])
+        # the second count of a position is answered from the table at the root
+        hits = table.hits
+        state = GameState.fromFEN(PERFT_SUITE[1].fen)
+        self.assertEqual(perft(state, 3, table), PERFT_SUITE[1].counts[2])
+        self.assertEqual(table.hits, hits + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
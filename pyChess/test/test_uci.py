@@ -0,0 +1,113 @@
+import io
+import os
+import tempfile
+import time
+import unittest
+
+from pyChess import moveFromUCI, setup
+from pyChess.Probe import writeBook
+from pyChess.Search import MATE_SCORE
+from pyChess.UCI import formatScore, main, searchLimits
+
+
+def runEngine(*commands: str) -> list[str]:
+    output = io.StringIO()
+    main(io.StringIO("".join(line + "\n" for line in commands)), output)
+    return output.getvalue().splitlines()
+
+
+class TestUCI(unittest.TestCase):
+    def testHandshake(self):
+        lines = runEngine("uci", "isready", "quit")
+        self.assertEqual(lines[0], "id name pyChess")
+        self.assertIn("uciok", lines)
+        self.assertEqual(lines[-1], "readyok")
+
+    def testSearch(self):
+        lines = runEngine("position startpos moves e2e4 e7e5", "go depth 2")
+        self.assertTrue(lines[0].startswith("info depth 1 score cp "))
+        self.assertTrue(lines[-1].startswith("bestmove "))
+        state = setup()
+        for uci in ("e2e4", "e7e5"):
+            state.push(moveFromUCI(uci))
+        self.assertIn(moveFromUCI(lines[-1].split()[1]), list(state.legalMoves()))
+
+    def testStopAnswersWhileSearching(self):
+        lines = runEngine(
+            "position fen 6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1",
+            "go infinite",
+            "isready",
+            "stop",
+        )
+        self.assertIn("readyok", lines)
+        self.assertEqual(lines[-1], "bestmove a1a8")
+        self.assertLess(lines.index("readyok"), lines.index("bestmove a1a8"))
+
+    def testCommandsDuringInfiniteSearch(self):
+        lines = runEngine(
+            "go infinite",
+            "ucinewgame",
+            "setoption name Hash value 1",
+            "position startpos moves e2e4",
+            "isready",
+            "stop",
+            "go depth 1",
+        )
+        self.assertEqual(lines.count("readyok"), 1)
+        bestmoves = [i for i, line in enumerate(lines) if line.startswith("bestmove")]
+        self.assertEqual(len(bestmoves), 2)
+        self.assertLess(lines.index("readyok"), bestmoves[0])
+        # the second search ran on the position sent after ucinewgame
+        state = setup()
+        state.push(moveFromUCI("e2e4"))
+        best = moveFromUCI(lines[bestmoves[1]].split()[1])
+        self.assertIn(best, list(state.legalMoves()))
+
+    def testInfiniteMateWaitsForStop(self):
+        output = io.StringIO()
+
+        class Input(io.StringIO):
+            def readline(self, *args) -> str:
+                line = super().readline(*args)
+                if line == "stop\n":
+                    # the search ends on its own once it sees the mate
+                    time.sleep(0.5)
+                    self.before_stop = output.getvalue()
+                return line
+
+        engine_input = Input(
+            "position fen 6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1\ngo infinite\nstop\n"
+        )
+        main(engine_input, output)
+        self.assertIn("score mate 1", engine_input.before_stop)
+        self.assertNotIn("bestmove", engine_input.before_stop)
+        self.assertEqual(output.getvalue().splitlines()[-1], "bestmove a1a8")
+
+    def testBadInput(self):
+        lines = runEngine(
+            "position startpos moves e2e5",
+            "position fen 8/8/8 w - - 0 1",
+            "frobnicate",
+        )
+        self.assertEqual(lines[0], "info string illegal move: e2e5")
+        self.assertTrue(lines[1].startswith("info string invalid position"))
+        self.assertEqual(lines[2], "info string unknown command: frobnicate")
+
+    def testBookOption(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "book.bin")
+            writeBook(path, [(setup(), moveFromUCI("b2b3"), 1)])
+            lines = runEngine(
+                f"setoption name BookFile value {path}", "position startpos", "go"
+            )
+        self.assertEqual(lines, ["bestmove b2b3"])
+
+    def testLimits(self):
+        state = setup()
+        self.assertEqual(searchLimits(["depth", "3"], state), {"depth": 3})
+        limits = searchLimits(["wtime", "60000", "btime", "1000", "winc", "400"], state)
+        self.assertAlmostEqual(limits["movetime"], 2.3)
+        self.assertEqual(searchLimits(["movetime", "500"], state)["movetime"], 0.5)
+        self.assertEqual(formatScore(MATE_SCORE - 3), "mate 2")
+        self.assertEqual(formatScore(-(MATE_SCORE - 2)), "mate -1")
+        self.assertEqual(formatScore(-35), "cp -35")